@@ -1,7 +1,6 @@
 import streamlit as st
 import streamlit_authenticator as stauth
-import yaml
-from yaml.loader import SafeLoader
+from app_config import load_config
 
 # Streamlit page setup
 st.set_page_config(
@@ -10,9 +9,8 @@ st.set_page_config(
     layout='wide'
 )
 
-# Load config.yaml file
-with open('./config.yaml') as file:
-    config = yaml.load(file, Loader=SafeLoader)
+# Load config.yaml file (parsed once per process)
+config = load_config()
 
 # Initialize authenticator (positional args!)
 authenticator = stauth.Authenticate(
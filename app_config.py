@@ -0,0 +1,10 @@
+import streamlit as st
+import yaml
+from yaml.loader import SafeLoader
+
+
+@st.cache_resource
+def load_config(path='./config.yaml'):
+    """Parse config.yaml once per process and share it across pages"""
+    with open(path) as file:
+        return yaml.load(file, Loader=SafeLoader)
@@ -0,0 +1,214 @@
+"""
+Scoring API of the bank-marketing (term deposit subscription) pipelines.
+
+Records have the columns of Notebook/test_df.csv without the target.
+Every pipeline in Notebook/ and Encoder/label_encoder.pkl is loaded once
+per process, on first use, and kept for the life of the server.
+
+- POST /predict scores a JSON array of records in one vectorised pass.
+- POST /predict/stream reads newline-delimited JSON (one record per
+  line) and answers with one NDJSON result line per non-empty input
+  line. Lines are scored in chunks as the body arrives and the results
+  are spooled to a temporary file, so files of any length go through in
+  bounded memory. A line that fails validation gets an
+  {"line": n, "error": ...} result and the rest of its chunk is still
+  scored; n counts every physical line, blank ones included.
+
+Each result gives the decoded label ('yes'/'no'), the outcome as written
+to Data/bank_prediction_history.csv ('Subscribed'/'Not Subscribed') and
+the probability of that outcome. The probability is null for models
+without predict_proba, such as the hinge-loss SGD.
+
+Usage:
+    uvicorn bank_api:app --host 0.0.0.0 --port 8078
+    curl -X POST "localhost:8078/predict?model=SVM" -H "Content-Type: application/json" -d @records.json
+    curl -X POST "localhost:8078/predict/stream?model=KNN" -H "Content-Type: application/x-ndjson" --data-binary @records.ndjson
+"""
+import json
+import tempfile
+from functools import lru_cache
+from typing import List
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+from starlette.background import BackgroundTask
+
+import bank_marketing
+from bank_marketing import ENCODER_PATH, FEATURES, available_models, predict_pipeline
+
+DEFAULT_MODEL = "Gradient Boosting"
+OUTCOMES = {"yes": "Subscribed", "no": "Not Subscribed"}
+
+# Stream lines scored per pipeline call
+STREAM_CHUNK = 2000
+# Stream results kept in memory before spilling to disk, and the read size when sending them
+SPOOL_BYTES = 16 * 1024 * 1024
+SPOOL_READ = 256 * 1024
+
+
+class BankCustomer(BaseModel):
+    """One customer record, with the column names of Notebook/test_df.csv as aliases"""
+    model_config = ConfigDict(populate_by_name=True)
+
+    age: int
+    job: str
+    marital: str
+    education: str
+    default: str
+    housing: str
+    loan: str
+    contact: str
+    month: str
+    day_of_week: str
+    duration: int
+    campaign: int
+    pdays: int
+    previous: int
+    poutcome: str
+    emp_var_rate: float = Field(alias="emp.var.rate")
+    cons_price_idx: float = Field(alias="cons.price.idx")
+    cons_conf_idx: float = Field(alias="cons.conf.idx")
+    euribor3m: float
+    nr_employed: float = Field(alias="nr.employed")
+
+
+_customer = TypeAdapter(BankCustomer)
+_customers = TypeAdapter(List[BankCustomer])
+
+app = FastAPI(title="Bank Marketing Scoring API")
+
+
+@lru_cache(maxsize=None)
+def load_pipeline(model_name):
+    """Trained pipeline of a model family, deserialised once"""
+    return bank_marketing.load_pipeline(model_name)
+
+
+@lru_cache(maxsize=1)
+def load_encoder():
+    """Label encoder mapping the pipelines' 0/1 output back to 'no'/'yes'"""
+    return joblib.load(ENCODER_PATH)
+
+
+def get_pipeline(model_name):
+    """Loaded pipeline of a model family, or a 404 listing the available ones"""
+    if model_name not in available_models():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown model '{model_name}', available: {', '.join(available_models())}"
+        )
+    return load_pipeline(model_name)
+
+
+def to_frame(records):
+    """Validated records as a DataFrame with the training column names and order"""
+    return pd.DataFrame([record.model_dump(by_alias=True) for record in records], columns=FEATURES)
+
+
+def score(model_name, frame):
+    """
+    Decoded labels, outcomes and outcome probabilities of a batch, from one
+    pass through the preprocessing.
+    """
+    pipeline = load_pipeline(model_name)
+    codes, probabilities = predict_pipeline(pipeline, frame)
+    labels = load_encoder().inverse_transform(codes)
+    if probabilities is not None:
+        columns = np.searchsorted(pipeline.classes_, codes)
+        probability = probabilities[np.arange(len(codes)), columns].round(4).tolist()
+    else:
+        probability = [None] * len(codes)
+    return [
+        {"prediction": label, "outcome": OUTCOMES.get(label, label), "probability": p}
+        for label, p in zip(labels.tolist(), probability)
+    ]
+
+
+def score_lines(model_name, lines, line_numbers):
+    """NDJSON result lines of a chunk of non-empty input lines, with their physical line numbers"""
+    try:
+        records = _customers.validate_json(b"[" + b",".join(lines) + b"]")
+    except ValidationError:
+        records = None
+    if records is not None and len(records) == len(lines):
+        valid = list(range(len(lines)))
+        results = [None] * len(lines)
+    else:
+        # Fall back to line by line to report the bad lines and keep the rest; this
+        # also catches a line holding several comma-separated records, which the
+        # joined array would have split into extra records
+        records, valid, results = [], [], []
+        for position, line in enumerate(lines):
+            try:
+                records.append(_customer.validate_json(line))
+                valid.append(position)
+                results.append(None)
+            except ValidationError as e:
+                errors = "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}" if error["loc"] else error["msg"]
+                    for error in e.errors()
+                )
+                results.append({"line": line_numbers[position], "error": errors})
+    if records:
+        for position, result in zip(valid, score(model_name, to_frame(records))):
+            results[position] = result
+    return "".join(json.dumps(result) + "\n" for result in results)
+
+
+@app.get("/models")
+def list_models():
+    return {"models": available_models(), "default": DEFAULT_MODEL}
+
+
+@app.post("/predict")
+def predict(records: List[BankCustomer], model: str = Query(DEFAULT_MODEL)):
+    get_pipeline(model)
+    predictions = score(model, to_frame(records)) if records else []
+    # Plain dicts need no response-model validation or encoding
+    return JSONResponse({"model": model, "predictions": predictions})
+
+
+@app.post("/predict/stream")
+async def predict_stream(
+    request: Request,
+    model: str = Query(DEFAULT_MODEL),
+    chunk_size: int = Query(STREAM_CHUNK, ge=1, le=100000)
+):
+    await run_in_threadpool(get_pipeline, model)
+    # Chunks are scored while the body is still arriving; the results are
+    # spooled (to disk past SPOOL_BYTES) since the request body cannot be
+    # read once the response has started
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode="w+")
+    # Blank lines are skipped but still counted, so errors point at the physical line
+    buffer, lines, numbers, line_number = b"", [], [], 0
+    async for part in request.stream():
+        buffer += part
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            line_number += 1
+            if line.strip():
+                lines.append(line)
+                numbers.append(line_number)
+        while len(lines) >= chunk_size:
+            output.write(await run_in_threadpool(score_lines, model, lines[:chunk_size], numbers[:chunk_size]))
+            lines, numbers = lines[chunk_size:], numbers[chunk_size:]
+    if buffer.strip():
+        lines.append(buffer)
+        numbers.append(line_number + 1)
+    if lines:
+        output.write(await run_in_threadpool(score_lines, model, lines, numbers))
+    output.seek(0)
+    return StreamingResponse(
+        iter(lambda: output.read(SPOOL_READ), ""),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(output.close)
+    )
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8078)
@@ -0,0 +1,106 @@
+"""
+Column layout of the bank-marketing (term deposit subscription) data and
+the locations of its trained pipelines.
+
+The pipelines in Notebook/ are imblearn Pipelines (ColumnTransformer ->
+SMOTE -> SelectKBest -> classifier) trained on DB/bank-additional-full.csv
+and predicting the label-encoded target; Encoder/label_encoder.pkl maps
+0/1 back to 'no'/'yes'. A pipeline packaged by model_packaging.py is
+loaded from its package instead of the pickle, as long as the package
+was made from the pickle now in place.
+"""
+import os
+
+NUMERIC_FEATURES = [
+    "age", "duration", "campaign", "pdays", "previous",
+    "emp.var.rate", "cons.price.idx", "cons.conf.idx", "euribor3m", "nr.employed",
+]
+CATEGORICAL_FEATURES = [
+    "job", "marital", "education", "default", "housing",
+    "loan", "contact", "month", "day_of_week", "poutcome",
+]
+# Column order of DB/bank-additional*.csv and Notebook/test_df.csv
+FEATURES = [
+    "age", "job", "marital", "education", "default", "housing", "loan", "contact", "month", "day_of_week",
+    "duration", "campaign", "pdays", "previous", "poutcome",
+    "emp.var.rate", "cons.price.idx", "cons.conf.idx", "euribor3m", "nr.employed",
+]
+TARGET = "y"
+
+TRAINING_DATA = "./DB/bank-additional-full.csv"
+MODEL_DIR = "./Notebook"
+ENCODER_PATH = "./Encoder/label_encoder.pkl"
+
+MODEL_NAMES = (
+    "Decision Tree", "Logistic Regression", "KNN", "SVM", "SGD", "Random Forest", "Gradient Boosting",
+)
+
+
+def pipeline_path(model_name, folder=MODEL_DIR):
+    """File of a trained pipeline, named as the notebook saved it"""
+    return os.path.join(folder, f"{model_name}_pipeline.pkl")
+
+
+def package_path(model_name, folder=MODEL_DIR):
+    """Folder of a pipeline packaged by model_packaging, next to its pickle"""
+    return os.path.join(folder, f"{model_name}_pipeline.pack")
+
+
+def fresh_package(model_name, folder=MODEL_DIR):
+    """Package folder of a pipeline when it was made from the current pickle, else None"""
+    package = package_path(model_name, folder)
+    if not os.path.exists(package):
+        return None
+    from model_packaging import package_matches
+
+    return package if package_matches(package, pipeline_path(model_name, folder)) else None
+
+
+def load_pipeline(model_name, folder=MODEL_DIR):
+    """
+    Trained pipeline of a model family: from its package, with memory-mapped
+    arrays, when the package was made from the current pickle, else from the pickle
+    """
+    package = fresh_package(model_name, folder)
+    if package is not None:
+        from model_packaging import load_package
+
+        return load_package(package)
+    import joblib
+
+    return joblib.load(pipeline_path(model_name, folder))
+
+
+def encoder_path(folder=MODEL_DIR):
+    """Label encoder of a model folder: its own label_encoder.pkl (training runs write one), else ENCODER_PATH"""
+    path = os.path.join(folder, "label_encoder.pkl")
+    return path if os.path.exists(path) else ENCODER_PATH
+
+
+def available_models(folder=MODEL_DIR):
+    """Model families that have a pipeline in a folder"""
+    return [name for name in MODEL_NAMES if os.path.exists(pipeline_path(name, folder))]
+
+
+def csv_separator(path):
+    """';' for the semicolon-separated UCI files, ',' for the notebook's exports"""
+    with open(path, encoding="utf-8") as file:
+        header = file.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def predict_pipeline(pipeline, frame):
+    """
+    Label codes and class probabilities (None for models without
+    predict_proba, such as the hinge-loss SGD) of a trained pipeline. The
+    preprocessing runs once and feeds both; samplers such as SMOTE only act
+    during fit and are skipped.
+    """
+    features = frame
+    for _, step in pipeline.steps[:-1]:
+        if step is not None and step != "passthrough" and not hasattr(step, "fit_resample"):
+            features = step.transform(features)
+    classifier = pipeline.steps[-1][1]
+    codes = classifier.predict(features)
+    probabilities = classifier.predict_proba(features) if hasattr(classifier, "predict_proba") else None
+    return codes, probabilities
@@ -0,0 +1,62 @@
+"""
+Benchmark of the bank-marketing scoring API: one record per request, as
+the prediction history was built, against one batched request and one
+NDJSON stream of the same records.
+
+Runs the app in process through the FastAPI test client, so the numbers
+include validation, preprocessing, inference and JSON encoding but no
+network.
+
+Usage (from the repository root):
+    python benchmarks/bench_bank_api.py [--data ./Notebook/test_df.csv] [--model "Gradient Boosting"] [--single 500]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from bank_api import app
+from bank_marketing import FEATURES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default="./Notebook/test_df.csv")
+    parser.add_argument("--model", default="Gradient Boosting")
+    parser.add_argument("--single", type=int, default=500, help="records sent one per request")
+    args = parser.parse_args(argv)
+
+    records = json.loads(pd.read_csv(args.data)[FEATURES].to_json(orient="records"))
+    client = TestClient(app)
+    params = {"model": args.model}
+    client.post("/predict", params=params, json=records[:1])  # load the pipeline
+
+    start = time.perf_counter()
+    single = [client.post("/predict", params=params, json=[record]).json()["predictions"][0]
+              for record in records[:args.single]]
+    single_rate = len(single) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batch = client.post("/predict", params=params, json=records).json()["predictions"]
+    batch_rate = len(records) / (time.perf_counter() - start)
+
+    body = "\n".join(json.dumps(record) for record in records)
+    start = time.perf_counter()
+    stream = [json.loads(line) for line in client.post("/predict/stream", params=params, content=body).text.splitlines()]
+    stream_rate = len(records) / (time.perf_counter() - start)
+
+    assert single == batch[:len(single)] and stream == batch
+    print(f"{len(records):,} records, {args.model}")
+    print(f"one record per request {single_rate:>10,.0f} rows/s")
+    print(f"batched request        {batch_rate:>10,.0f} rows/s ({batch_rate / single_rate:.0f}x)")
+    print(f"NDJSON stream          {stream_rate:>10,.0f} rows/s ({stream_rate / single_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
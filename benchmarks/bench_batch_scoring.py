@@ -0,0 +1,72 @@
+"""
+Benchmark of score_bank_customers against scoring the whole file in one
+go, the way the notebook does: read everything, then per pipeline call
+predict and predict_proba (each running the preprocessing) and write one
+CSV.
+
+The input is Notebook/test_df.csv repeated --copies times.
+
+Usage (from the repository root):
+    python benchmarks/bench_batch_scoring.py [--copies 25] [--workers N] [--models "Decision Tree" SVM ...]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import pandas as pd
+
+from bank_marketing import ENCODER_PATH, FEATURES, available_models, pipeline_path
+from score_bank_customers import score_file
+
+
+def whole_file(input_path, output_path, model_names):
+    data = pd.read_csv(input_path)
+    encoder = joblib.load(ENCODER_PATH)
+    output = pd.DataFrame({"row": data.index})
+    for name in model_names:
+        pipeline = joblib.load(pipeline_path(name))
+        output[f"{name} prediction"] = encoder.inverse_transform(pipeline.predict(data[FEATURES]))
+        if hasattr(pipeline, "predict_proba"):
+            output[f"{name} probability"] = pipeline.predict_proba(data[FEATURES])[:, 1]
+    output.to_csv(output_path, index=False)
+
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--models", nargs="*", default=None)
+    args = parser.parse_args(argv)
+    models = args.models or available_models()
+
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, "customers.csv")
+        pd.concat([pd.read_csv("./Notebook/test_df.csv")] * args.copies).to_csv(input_path, index=False)
+        rows = sum(1 for _ in open(input_path)) - 1
+        print(f"{rows:,} rows, {len(models)} model(s), {args.workers or os.cpu_count()} worker(s)")
+
+        start = time.perf_counter()
+        score_file(input_path, os.path.join(folder, "chunked.parquet"), models, workers=args.workers, progress=False)
+        chunked = time.perf_counter() - start
+        chunked_mb = peak_mb()
+
+        start = time.perf_counter()
+        whole_file(input_path, os.path.join(folder, "whole.csv"), models)
+        whole = time.perf_counter() - start
+
+    print(f"whole file   {whole:>7.1f} s {rows / whole:>10,.0f} rows/s   peak RSS {peak_mb():>6.0f} MB")
+    print(f"chunked pool {chunked:>7.1f} s {rows / chunked:>10,.0f} rows/s   peak RSS {chunked_mb:>6.0f} MB (parent)")
+
+
+if __name__ == "__main__":
+    main()
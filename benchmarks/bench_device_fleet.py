@@ -0,0 +1,107 @@
+"""
+Benchmark of the device fleet analytics on a synthetic check-in log.
+
+Writes a LIPW-style device log with the given number of check-ins, then
+times the notebook approach (untyped read_csv, locations split row by row)
+against device_fleet's typed parse, the Parquet reload and the rollups.
+
+Usage (from the repository root):
+    python benchmarks/bench_device_fleet.py [--check-ins 1000000] [--devices 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from device_fleet import build_fleet_summary, parse_device_log
+from file_utils import write_atomic
+
+OS_VERSIONS = np.array(['4.19.127', '3.18.79', '4.9.117+', '4.0.9+', '4.19.191-g67adfa000f96-dirty'])
+MODELS = np.array(['FP08', 'M8', 'FP-08', 'SM-N976N', 'TECNO BE8'])
+
+
+def make_log(path, check_ins, devices, seed=0):
+    rng = np.random.default_rng(seed)
+    device = rng.integers(0, devices, check_ins)
+    uuids = np.array([f"{i:08X}-0000-4000-8000-{i:012X}" for i in range(devices)])
+    groups = np.array([f"Rehabilitation of degraded communal land at site {i}" for i in range(devices // 4 + 1)])
+    seconds = rng.integers(0, 5 * 365 * 86400, check_ins)
+    connected = pd.Timestamp('2021-01-01') + pd.to_timedelta(seconds, unit='s')
+    lat = rng.uniform(4.7, 11.2, check_ins)
+    lon = rng.uniform(-3.3, 1.2, check_ins)
+    pd.DataFrame({
+        'uuid': uuids[device],
+        'deviceId': 'RP1A.200720.011',
+        'subProject': groups[device // 4],
+        'androidId': device,
+        'serial': device,
+        'osVersion': OS_VERSIONS[device % len(OS_VERSIONS) * (device % 7 == 0)],
+        'osName': 'Linux',
+        'device': MODELS[device % len(MODELS)],
+        'model': MODELS[device % len(MODELS)],
+        'user': '',
+        'host': 'hby',
+        'lastConnected': connected.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3],
+        'location': [f"{a},{b}" for a, b in zip(lat, lon)],
+        'deviceAccess': 2,
+        'createUserId': 0,
+        'createDate': '2025-02-11 15:20:00',
+        'updateUserId': 1184,
+        'lastUpdated': '2025-06-06 21:47:00',
+    }).to_csv(path, index=False)
+
+
+def notebook_rollup(path):
+    """Untyped load and the same rollups with per-row parsing, as explored in the notebooks"""
+    log = pd.read_csv(path)
+    log['lat'] = log['location'].apply(lambda value: float(str(value).split(',')[0]))
+    log['lon'] = log['location'].apply(lambda value: float(str(value).split(',')[1]))
+    log['lastConnected'] = pd.to_datetime(log['lastConnected'])
+    latest = log.sort_values('lastConnected').groupby(['subProject', 'uuid']).tail(1)
+    days = (latest['lastConnected'].max() - latest['lastConnected']).dt.days
+    latest['stale'] = pd.cut(days, [-1, 1, 7, 30, 90, np.inf])
+    return log, latest.groupby(['subProject', 'stale']).size()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--check-ins', type=int, default=1_000_000)
+    parser.add_argument('--devices', type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'devices.csv')
+        parquet_path = os.path.join(folder, 'devices.parquet')
+        make_log(csv_path, args.check_ins, args.devices)
+        print(f"{args.check_ins:,} check-ins of {args.devices:,} devices, "
+              f"{os.path.getsize(csv_path) / 1e6:.0f} MB of CSV")
+
+        (untyped, _), notebook_s = timed(notebook_rollup, csv_path)
+        typed, parse_s = timed(parse_device_log, csv_path, 'subProject')
+        write_atomic(parquet_path, lambda tmp: typed.to_parquet(tmp, index=False))
+        _, reload_s = timed(pd.read_parquet, parquet_path)
+        summary, rollup_s = timed(build_fleet_summary, typed)
+
+        print(f"{'notebook (untyped)':<22} {notebook_s:>7.2f} s  "
+              f"{untyped.memory_usage(deep=True).sum() / 1e6:>6.0f} MB in memory")
+        print(f"{'typed parse':<22} {parse_s:>7.2f} s  {typed.memory_usage(deep=True).sum() / 1e6:>6.0f} MB in memory")
+        print(f"{'Parquet reload':<22} {reload_s:>7.2f} s")
+        print(f"{'rollups':<22} {rollup_s:>7.2f} s  {len(summary['groups']):,} groups, "
+              f"{len(summary['os_versions'])} OS versions")
+        print(f"cached page load (reload + rollups) {notebook_s / (reload_s + rollup_s):.0f}x faster than the notebook")
+
+
+if __name__ == '__main__':
+    main()
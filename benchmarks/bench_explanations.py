@@ -0,0 +1,68 @@
+"""
+Benchmark of explaining predictions one record at a time against one
+vectorised pass over the batch (explanations.contributions), for a
+logistic regression and a random forest fitted on Notebook/test_df.csv
+behind a ColumnTransformer. Also checks that the contributions add up to
+the model output.
+
+Usage (from the repository root):
+    python benchmarks/bench_explanations.py [--single 200] [--trees 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from bank_marketing import CATEGORICAL_FEATURES, FEATURES, NUMERIC_FEATURES, TARGET
+from explanations import contributions, top_features
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--single", type=int, default=200, help="records explained one at a time")
+    parser.add_argument("--trees", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    data = pd.read_csv("./Notebook/test_df.csv")
+    X, y = data[FEATURES], (data[TARGET] == "yes").astype(int)
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), NUMERIC_FEATURES),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+    ])
+    models = {
+        "Logistic Regression": LogisticRegression(max_iter=1000),
+        "Random Forest": RandomForestClassifier(n_estimators=args.trees, random_state=42),
+    }
+    print(f"{len(X):,} records")
+    for name, classifier in models.items():
+        pipeline = Pipeline([("preprocessor", preprocessor), ("classifier", classifier)]).fit(X, y)
+
+        start = time.perf_counter()
+        for position in range(args.single):
+            unit, base, values, names = contributions(pipeline, X.iloc[[position]])
+            top_features(values, names, 5)
+        single_rate = args.single / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        unit, base, values, names = contributions(pipeline, X)
+        top_features(values, names, 5)
+        batch_rate = len(X) / (time.perf_counter() - start)
+
+        output = pipeline.decision_function(X) if unit == "log-odds" else pipeline.predict_proba(X)[:, 1]
+        error = np.abs(base + values.sum(axis=1) - output).max()
+        print(f"{name:<20} one at a time {single_rate:>8,.0f} rows/s   batched {batch_rate:>9,.0f} rows/s "
+              f"({batch_rate / single_rate:,.0f}x)   max |base + sum - {unit}| {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
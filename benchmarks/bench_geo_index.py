@@ -0,0 +1,94 @@
+"""
+Benchmark of the grid spatial index on synthetic device locations.
+
+Scatters points over Ghana, clustered around communities like the device
+check-ins, then compares radius and bounding-box queries answered by
+geo_index.GridIndex with a full scan of every point (haversine over all
+coordinates, which is what parsing the location strings row by row
+amounts to). Results are checked to be identical.
+
+Usage (from the repository root):
+    python benchmarks/bench_geo_index.py [--points 1000000] [--queries 500] [--radius 25]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from geo_index import GridIndex, haversine_km
+
+# Rough bounding box of Ghana
+LAT_RANGE = (4.7, 11.2)
+LON_RANGE = (-3.3, 1.2)
+
+
+def make_points(size, seed=0):
+    rng = np.random.default_rng(seed)
+    communities = np.column_stack([rng.uniform(*LAT_RANGE, 2000), rng.uniform(*LON_RANGE, 2000)])
+    home = communities[rng.integers(0, len(communities), size)]
+    points = home + rng.normal(0, 0.05, (size, 2))
+    lat, lon = points[:, 0].astype('float32'), points[:, 1].astype('float32')
+    lat[rng.random(size) < 0.05] = np.nan
+    return lat, lon
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--radius', type=float, default=25, help="Radius of the radius queries in km")
+    args = parser.parse_args(argv)
+
+    lat, lon = make_points(args.points)
+    rng = np.random.default_rng(1)
+    centres = np.column_stack([rng.uniform(*LAT_RANGE, args.queries), rng.uniform(*LON_RANGE, args.queries)])
+
+    start = time.perf_counter()
+    index = GridIndex(lat, lon)
+    build_s = time.perf_counter() - start
+    print(f"{args.points:,} points, {len(index):,} with a location; index built in {build_s:.2f} s")
+
+    def radius_scan(centre_lat, centre_lon):
+        distances = haversine_km(centre_lat, centre_lon, lat, lon)
+        return np.flatnonzero(distances <= args.radius)
+
+    def bbox_scan(centre_lat, centre_lon):
+        return np.flatnonzero(
+            (lat >= centre_lat - 0.2) & (lat <= centre_lat + 0.2) & (lon >= centre_lon - 0.2) & (lon <= centre_lon + 0.2)
+        )
+
+    queries = {
+        f"radius {args.radius:g} km": (
+            radius_scan,
+            lambda centre_lat, centre_lon: np.sort(index.radius(centre_lat, centre_lon, args.radius)[0]),
+        ),
+        "bbox 0.4 x 0.4 deg": (
+            bbox_scan,
+            lambda centre_lat, centre_lon: index.bbox(centre_lat - 0.2, centre_lat + 0.2, centre_lon - 0.2, centre_lon + 0.2),
+        ),
+    }
+    for name, (scan, indexed) in queries.items():
+        # The full scan is slow; time it on a sample of the queries
+        sample = centres[:max(1, args.queries // 20)]
+        start = time.perf_counter()
+        expected = [scan(*centre) for centre in sample]
+        scan_ms = (time.perf_counter() - start) * 1000 / len(sample)
+        start = time.perf_counter()
+        found = [indexed(*centre) for centre in centres]
+        indexed_ms = (time.perf_counter() - start) * 1000 / len(centres)
+        same = all(np.array_equal(a, b) for a, b in zip(expected, found))
+        mean_hits = np.mean([len(rows) for rows in found])
+        print(f"{name:<20} full scan {scan_ms:>8.2f} ms/query  indexed {indexed_ms:>6.3f} ms/query  "
+              f"{scan_ms / indexed_ms:>5.0f}x faster  ~{mean_hits:.0f} hits  identical: {same}")
+
+    start = time.perf_counter()
+    cells = index.cell_counts()
+    print(f"{'cell counts':<20} {(time.perf_counter() - start) * 1000:.1f} ms for {len(cells):,} occupied cells")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark of comparing the bank-marketing pipelines at a new threshold:
+re-running every pipeline and sklearn's metrics (the notebook's way)
+against model_evaluation's cached scores and threshold curves.
+
+Re-inference needs pipelines loadable by the installed scikit-learn; the
+cached path only needs the scores in ./.cache/evaluation (see
+model_evaluation.py).
+
+Usage (from the repository root):
+    python benchmarks/bench_model_evaluation.py [--thresholds 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+from bank_marketing import FEATURES, TARGET, available_models, pipeline_path
+from model_evaluation import EVALUATION_DATA, build_evaluation, compare_at, load_scores
+
+
+def reinference(data, pipelines, threshold):
+    """Weighted metrics of every pipeline at a threshold, scoring the data again"""
+    y_true = (data[TARGET] == "yes").astype(int)
+    rows = []
+    for name, pipeline in pipelines.items():
+        if hasattr(pipeline, "predict_proba"):
+            scores = pipeline.predict_proba(data[FEATURES])[:, 1]
+        else:
+            scores = 1 / (1 + np.exp(-pipeline.decision_function(data[FEATURES])))
+        predicted = (scores >= threshold).astype(int)
+        precision, recall, f1, _ = precision_recall_fscore_support(y_true, predicted, average="weighted", zero_division=0)
+        rows.append((name, precision, recall, accuracy_score(y_true, predicted), f1))
+    return pd.DataFrame(rows, columns=["Model Name", "Precision", "Recall", "Accuracy", "F1_Score"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--thresholds", type=int, default=20)
+    args = parser.parse_args(argv)
+    thresholds = np.linspace(0.05, 0.95, args.thresholds)
+
+    data = pd.read_csv(EVALUATION_DATA)
+    pipelines = {name: joblib.load(pipeline_path(name)) for name in available_models()}
+    start = time.perf_counter()
+    expected = [reinference(data, pipelines, threshold) for threshold in thresholds]
+    reinference_ms = (time.perf_counter() - start) / len(thresholds) * 1000
+
+    start = time.perf_counter()
+    y_true, scores, _ = load_scores()
+    evaluation = build_evaluation(y_true, scores)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    cached = [compare_at(evaluation, threshold) for threshold in thresholds]
+    cached_ms = (time.perf_counter() - start) / len(thresholds) * 1000
+
+    columns = ["Precision", "Recall", "Accuracy", "F1_Score"]
+    for old, new in zip(expected, cached):
+        assert np.allclose(old[columns].to_numpy(), new[columns].to_numpy())
+    print(f"{len(data):,} rows, {len(pipelines)} pipelines, {len(thresholds)} thresholds")
+    print(f"re-inference  {reinference_ms:>9.1f} ms per threshold")
+    print(f"cached curves {cached_ms:>9.2f} ms per threshold ({reinference_ms / cached_ms:,.0f}x), "
+          f"after a one-off {build_ms:.0f} ms load of the cached scores and curves")
+
+
+if __name__ == "__main__":
+    main()
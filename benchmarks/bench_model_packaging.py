@@ -0,0 +1,76 @@
+"""
+Benchmark of loading the bank-marketing pipelines from their pickles
+against their model_packaging packages: load time, resident memory added
+by the load, and the time of a first prediction on Notebook/test_df.csv.
+
+Every measurement runs in a fresh interpreter, with scikit-learn and
+imblearn already imported, so module imports and earlier loads do not
+blur the numbers. Run model_packaging.py first.
+
+Usage (from the repository root):
+    python benchmarks/bench_model_packaging.py [--repeat 3] [--models KNN SVM ...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bank_marketing import available_models, package_path
+
+MEASURE = r"""
+import json, sys, time
+import joblib, numpy as np, pandas as pd
+from bank_marketing import FEATURES, pipeline_path, package_path
+from model_packaging import load_package
+
+def rss_kb():
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmRSS"))
+
+# Import what the pickles refer to up front so only deserialisation is timed
+import imblearn.over_sampling, imblearn.pipeline, sklearn.compose, sklearn.ensemble, sklearn.feature_selection
+import sklearn.linear_model, sklearn.neighbors, sklearn.preprocessing, sklearn.svm, sklearn.tree
+
+name, form = sys.argv[1], sys.argv[2]
+data = pd.read_csv("./Notebook/test_df.csv")[FEATURES]
+before = rss_kb()
+start = time.perf_counter()
+model = joblib.load(pipeline_path(name)) if form == "pickle" else load_package(package_path(name))
+loaded = time.perf_counter() - start
+after = rss_kb()
+start = time.perf_counter()
+model.predict(data)
+predicted = time.perf_counter() - start
+print(json.dumps({"load_ms": loaded * 1000, "rss_kb": after - before, "predict_ms": predicted * 1000}))
+"""
+
+
+def measure(name, form):
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", MEASURE, name, form], cwd=ROOT, capture_output=True, text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--models", nargs="*", default=None)
+    args = parser.parse_args(argv)
+    models = [name for name in (args.models or available_models()) if os.path.exists(package_path(name))]
+
+    print(f"{'model':<20} {'format':<8} {'load ms':>8} {'RSS KB':>8} {'1st predict ms':>15}")
+    for name in models:
+        for form in ("pickle", "package"):
+            runs = [measure(name, form) for _ in range(args.repeat)]
+            best = {key: min(run[key] for run in runs) for key in runs[0]}
+            print(f"{name:<20} {form:<8} {best['load_ms']:>8.1f} {best['rss_kb']:>8,} {best['predict_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark of PDF text extraction on a synthetic 300-page exam paper.
+
+Compares the old page-by-page string concatenation with the shared
+pdf_text module, serial and page-parallel.
+
+Usage (from the repository root):
+    python benchmarks/bench_pdf_text.py [--pages 300] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyPDF2 import PdfReader
+
+from benchmarks.synthetic_pdf import make_exam_pdf
+from pdf_text import extract_pdf_text, iter_page_texts
+
+
+def concatenate_pages(pdf_bytes):
+    """The previous implementation: one string concatenation per page"""
+    full_text = ""
+    for page in PdfReader(BytesIO(pdf_bytes)).pages:
+        full_text += page.extract_text() + "\n"
+    return full_text
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pdf_bytes = make_exam_pdf(args.pages)
+    print(f"Synthetic PDF: {args.pages} pages, {len(pdf_bytes) / 1024:.0f} KB, {os.cpu_count()} CPUs")
+
+    # Warm the process pool so its start-up is not billed to the first run
+    extract_pdf_text(pdf_bytes, parallel=True)
+
+    baseline_s, baseline = best_of(args.repeat, lambda: concatenate_pages(pdf_bytes))
+    cases = [
+        ("page-by-page +=", baseline_s, baseline),
+        ("pdf_text serial", *best_of(args.repeat, lambda: extract_pdf_text(pdf_bytes, parallel=False))),
+        ("pdf_text parallel", *best_of(args.repeat, lambda: extract_pdf_text(pdf_bytes, parallel=True))),
+        ("first page only (streamed)", *best_of(args.repeat, lambda: next(iter_page_texts(pdf_bytes)) + "\n")),
+    ]
+
+    print(f"{'Method':<28} {'Seconds':>8} {'Speed-up':>9}  Same text")
+    for name, seconds, text in cases:
+        same = text == baseline if not name.startswith('first') else baseline.startswith(text)
+        print(f"{name:<28} {seconds:>8.3f} {baseline_s / seconds:>8.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
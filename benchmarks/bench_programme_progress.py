@@ -0,0 +1,90 @@
+"""
+Benchmark of the programme progress rollups on a synthetic sub-project listing.
+
+Times a dashboard rerun (filter on two dimensions, totals by one dimension
+split by another) answered from the raw listing, as a page without
+precomputed aggregates would, against the same answer from the cube of
+programme_progress. Results are checked to match.
+
+Usage (from the repository root):
+    python benchmarks/bench_programme_progress.py [--rows 1000000] [--reruns 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from programme_progress import PROGRAMME_TABLES, build_cube, filter_cube, rollup
+
+SPEC = PROGRAMME_TABLES["subprojects"]
+TYPES = ['Dam', 'Feeder Road', 'Climate Change', 'Flood Mitigation Measures']
+STATUSES = ['OnGoing', 'Completed', 'Closed', 'Dropped', 'Terminated', 'Paused']
+
+
+def make_listing(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    completion = rng.choice([0, 25, 50, 75, 100], rows).astype(float)
+    beneficiaries = rng.integers(10, 300, rows)
+    return pd.DataFrame({
+        'subProject': [f"Rehabilitation of feeder road {i}" for i in range(rows)],
+        'District': pd.Categorical(rng.choice([f"District {i}" for i in range(260)], rows)),
+        'Type': pd.Categorical(rng.choice(TYPES, rows)),
+        'Status': pd.Categorical(rng.choice(STATUSES, rows)),
+        'Community Type': pd.Categorical(rng.choice(['Rural', 'Urban'], rows, p=[0.95, 0.05])),
+        '% Completion': completion,
+        'Beneficiaries': beneficiaries,
+        'Beneficiaries reached': beneficiaries * completion / 100,
+    })
+
+
+def raw_rerun(listing, filters, by, split):
+    mask = np.ones(len(listing), dtype=bool)
+    for column, values in filters.items():
+        mask &= listing[column].isin(values).to_numpy()
+    return listing[mask].groupby([by, split], observed=True)[SPEC["sums"]].sum()
+
+
+def cube_rerun(cube, filters, by, split):
+    return rollup(cube, SPEC, by=[by, split], mask=filter_cube(cube, filters))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    listing = make_listing(args.rows)
+    start = time.perf_counter()
+    cube, _ = build_cube(listing, SPEC)
+    build_s = time.perf_counter() - start
+    print(f"{args.rows:,} sub-projects -> cube of {len(cube):,} cells, built once in {build_s:.2f} s")
+
+    rng = np.random.default_rng(1)
+    districts = list(listing['District'].cat.categories)
+    reruns = [
+        ({'District': list(rng.choice(districts, 20, replace=False)), 'Status': ['OnGoing', 'Completed']}, 'District', 'Type')
+        for _ in range(args.reruns)
+    ]
+
+    start = time.perf_counter()
+    expected = [raw_rerun(listing, *rerun) for rerun in reruns]
+    raw_ms = (time.perf_counter() - start) * 1000 / len(reruns)
+    start = time.perf_counter()
+    found = [cube_rerun(cube, *rerun) for rerun in reruns]
+    cube_ms = (time.perf_counter() - start) * 1000 / len(reruns)
+
+    same = all(
+        np.allclose(a.to_numpy(dtype=float), b[SPEC["sums"]].to_numpy(dtype=float)) for a, b in zip(expected, found)
+    )
+    print(f"{'raw listing':<14} {raw_ms:>8.1f} ms per rerun")
+    print(f"{'cube':<14} {cube_ms:>8.1f} ms per rerun  {raw_ms / cube_ms:.0f}x faster  same totals: {same}")
+
+
+if __name__ == '__main__':
+    main()
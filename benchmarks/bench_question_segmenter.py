@@ -0,0 +1,77 @@
+"""
+Benchmark of exam paper segmentation on synthetic paper text.
+
+Compares the previous re.split / re.search / re.sub passes with the
+single-pass question segmenter, both producing the table rows of
+parse_pdf_content (question and solution previews and marks).
+
+Usage (from the repository root):
+    python benchmarks/bench_question_segmenter.py [--pages 600] [--repeat 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from question_segmenter import iter_question_spans, span_text
+from synthetic_pdf import exam_lines
+
+
+def split_rows(full_text):
+    """The previous question loop of parse_pdf_content"""
+    rows = []
+    questions = re.split(r'QUESTION\s+(ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN)', full_text)
+    for i in range(1, len(questions), 2):
+        question_content = questions[i+1] if i+1 < len(questions) else ""
+        parts = re.split(r'(SOLUTION|ANSWER|WORKINGS)', question_content, maxsplit=1, flags=re.IGNORECASE)
+        question_text = parts[0] if len(parts) > 0 else ""
+        solution_text = parts[2] if len(parts) > 2 else ""
+        marks_match = re.search(r'\(Total:\s*(\d+)\s*marks\)', question_text)
+        marks = marks_match.group(1) if marks_match else ""
+        question_text = re.sub(r'\s+', ' ', question_text).strip()
+        solution_text = re.sub(r'\s+', ' ', solution_text).strip()
+        rows.append((f"QUESTION {questions[i]}: {question_text[:500]}...",
+                     solution_text[:500] + "..." if solution_text else "Not available", marks))
+    return rows
+
+
+def segmenter_rows(full_text):
+    rows = []
+    for span in iter_question_spans(full_text):
+        solution_preview = span_text(full_text, span.solution, 500)
+        rows.append((f"QUESTION {span.number}: {span_text(full_text, span.question, 500)}...",
+                     solution_preview + "..." if solution_preview else "Not available", span.marks))
+    return rows
+
+
+def best_time(function, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    text = "\n".join("\n".join(lines) for lines in exam_lines(args.pages)) + "\n"
+    print(f"{args.pages} pages, {len(text) / 1e6:.1f} MB of text")
+
+    old_s, old = best_time(split_rows, text, args.repeat)
+    new_s, new = best_time(segmenter_rows, text, args.repeat)
+    print(f"{'re.split passes':<22} {old_s * 1000:>8.1f} ms  {len(old)} questions")
+    print(f"{'question segmenter':<22} {new_s * 1000:>8.1f} ms  {len(new)} questions  {old_s / new_s:.1f}x faster")
+    print(f"Identical rows: {old == new}")
+
+
+if __name__ == '__main__':
+    main()
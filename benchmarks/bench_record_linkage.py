@@ -0,0 +1,110 @@
+"""
+Benchmark of beneficiary record linkage on synthetic tables.
+
+Builds a "system" list and a "cross-sector" list sharing most people,
+with missing and mistyped identifiers and name variations, then times
+record_linkage.link_records at growing sizes. For reference it also times
+the naive approach (every pair of names compared) on a small sample and
+extrapolates it.
+
+Usage (from the repository root):
+    python benchmarks/bench_record_linkage.py [--sizes 10000 50000 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from record_linkage import link_records
+
+FIRST = ('Abena Adwoa Akosua Ama Amina Aminatu Asana Ayisha Fati Fuseina Gifty Hawa Jamila Mariama '
+         'Memunatu Nafisa Rahinatu Salamatu Sherifa Zainab Esther Grace Mercy Veronica Theresa').split()
+LAST = ('Abdulai Adam Alhassan Amadu Atinga Awudu Azure Fuseini Ibrahim Iddrisu Issah Mahama Mohammed '
+        'Musah Osman Salifu Seidu Sulemana Tahiru Wumbei Yakubu Yussif Zakaria Akanvaa Ayamga').split()
+
+SPEC_SYSTEM = {"name": "name", "birth": "birth", "keys": {"phone": ["phone"], "ezwich": ["ezwich"]}}
+SPEC_CROSS = {"name": "name", "birth": "birth", "keys": {"phone": ["phone"], "ezwich": ["ezwich"], "nhis": ["nhis"]}}
+
+
+SYLLABLES = 'a ba bu da di fu ga gi ka ko la li ma mu na ni ra ri sa se ta tu wa ya yi za'.split()
+
+
+def surname(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def misspell(rng, name):
+    """Drop or double one letter of one token"""
+    tokens = name.split()
+    i = rng.randrange(len(tokens))
+    j = rng.randrange(1, len(tokens[i]))
+    tokens[i] = tokens[i][:j] + (tokens[i][j] * 2 if rng.random() < 0.5 else '') + tokens[i][j + 1:]
+    return ' '.join(tokens)
+
+
+def make_tables(size, seed=0):
+    rng = random.Random(seed)
+    people = []
+    for person in range(size):
+        people.append({
+            'name': f"{rng.choice(FIRST)} {rng.choice(LAST)} {surname(rng)}",
+            'birth': rng.randint(36000, 40000),
+            'phone': f"0{rng.choice('25')}{rng.randint(10_000_000, 99_999_999)}",
+            'ezwich': str(rng.randint(1_000_000_000, 9_999_999_999)),
+            'nhis': str(rng.randint(10_000_000, 99_999_999)),
+        })
+    system, cross = [], []
+    for person in people:
+        if rng.random() < 0.9:
+            system.append({
+                'name': person['name'],
+                'birth': person['birth'],
+                'phone': person['phone'] if rng.random() < 0.6 else None,
+                'ezwich': person['ezwich'] if rng.random() < 0.3 else None,
+            })
+        if rng.random() < 0.9:
+            first, *rest = person['name'].split()
+            name = misspell(rng, person['name']) if rng.random() < 0.2 else person['name']
+            cross.append({
+                # Names are often recorded surname first and in capitals
+                'name': ' '.join(rest + [first]).upper() if rng.random() < 0.5 else name,
+                'birth': person['birth'] + rng.choice([0, 0, 0, 365]),
+                'phone': ('+233 ' + person['phone'][1:]) if rng.random() < 0.5 else None,
+                'ezwich': person['ezwich'] if rng.random() < 0.3 else None,
+                'nhis': person['nhis'],
+            })
+    return pd.DataFrame(system), pd.DataFrame(cross)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 200000])
+    args = parser.parse_args(argv)
+
+    sample_system, sample_cross = make_tables(400)
+    start = time.perf_counter()
+    for left in sample_system['name']:
+        for right in sample_cross['name']:
+            SequenceMatcher(None, left.lower(), right.lower()).ratio()
+    pair_s = (time.perf_counter() - start) / (len(sample_system) * len(sample_cross))
+
+    for size in args.sizes:
+        system, cross = make_tables(size)
+        start = time.perf_counter()
+        links = link_records(system, cross, SPEC_SYSTEM, SPEC_CROSS)
+        seconds = time.perf_counter() - start
+        naive_hours = pair_s * len(system) * len(cross) / 3600
+        methods = links['method'].map(lambda method: 'name' if method == 'name' else 'identifier').value_counts()
+        print(f"{len(system):>7} x {len(cross):>7}: {seconds:>7.1f} s, {len(links)} links "
+              f"({methods.get('identifier', 0)} on identifiers, {methods.get('name', 0)} on names); "
+              f"all-pairs names would take ~{naive_hours:,.1f} h")
+
+
+if __name__ == '__main__':
+    main()
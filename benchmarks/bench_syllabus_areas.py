@@ -0,0 +1,91 @@
+"""
+Benchmark of syllabus area extraction on a synthetic numbered syllabus.
+
+Compares the previous extract_syllabus_areas (a fresh regex compiled and
+run from the start of the text for every area) with the single-pass
+header scan.
+
+Usage (from the repository root):
+    python benchmarks/bench_syllabus_areas.py [--areas 400] [--lines 12]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from exam_extraction import extract_syllabus_areas
+from synthetic_pdf import VOCABULARY
+
+
+def previous_area_content(full_text, area_code, area_name):
+    pattern = rf"{re.escape(area_code)}\s*{re.escape(area_name)}(.*?)(?=(?:[A-Z]\)|\d+\.|\n\n|[A-Z][A-Z\s]{{10,}}|\Z))"
+    match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
+    pattern = rf"{re.escape(area_name)}(.*?)(?=\n\n|\Z)"
+    match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
+    if match:
+        return match.group(1).strip()[:500]
+    return area_name
+
+
+def previous_syllabus_areas(syllabus_text):
+    """The structured-pattern path of the previous extract_syllabus_areas"""
+    syllabus_areas = {}
+    patterns = [
+        r'([A-Z]\))\s*([^\.\n]+?)\s*(?=[A-Z]\)|\n\n|$)',
+        r'(\d+\.)\s*([^\.\n]+?)\s*(?=\d+\.|\n\n|$)',
+        r'\n\s*([A-Z][A-Za-z\s]{10,50}?)\s*\n',
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, syllabus_text, re.MULTILINE | re.DOTALL)
+        if matches:
+            for match in matches:
+                if len(match) >= 2:
+                    syllabus_areas[match[1].strip()] = previous_area_content(syllabus_text, match[0].strip(), match[1].strip())
+            break
+    return syllabus_areas
+
+
+def make_syllabus(areas, lines, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    for number in range(1, areas + 1):
+        parts.append(f"{number}. {' '.join(rng.choices(VOCABULARY, k=3)).title()} {number}")
+        for _ in range(lines):
+            parts.append('- ' + ' '.join(rng.choices(VOCABULARY, k=12)))
+        parts.append('')
+    return '\n'.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--areas', type=int, default=400)
+    parser.add_argument('--lines', type=int, default=12)
+    args = parser.parse_args(argv)
+
+    text = make_syllabus(args.areas, args.lines)
+    print(f"{args.areas} areas, {len(text) / 1e3:.0f} kB of syllabus text")
+
+    start = time.perf_counter()
+    old = previous_syllabus_areas(text)
+    old_s = time.perf_counter() - start
+    start = time.perf_counter()
+    new = extract_syllabus_areas(text)
+    new_s = time.perf_counter() - start
+
+    def mean_words(areas):
+        return sum(len(content.split()) for content in areas.values()) / max(len(areas), 1)
+
+    print(f"{'per-area regex':<18} {old_s * 1000:>9.1f} ms  {len(old)} areas, {mean_words(old):.0f} words of content each")
+    print(f"{'single pass':<18} {new_s * 1000:>9.1f} ms  {len(new)} areas, {mean_words(new):.0f} words of content each"
+          f"  {old_s / new_s:.0f}x faster")
+
+
+if __name__ == '__main__':
+    main()
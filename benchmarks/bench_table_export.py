@@ -0,0 +1,98 @@
+"""
+Benchmark of the extraction exports on synthetic question rows.
+
+Compares the previous pandas ExcelWriter export (with column widths from
+df[col].astype(str).str.len()) against the streaming exports of
+table_export, reporting time and peak traced Python memory.
+
+Usage (from the repository root):
+    python benchmarks/bench_table_export.py [--rows 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from table_export import ColumnWidths, build_csv, build_parquet, build_xlsx, parquet_available, record_rows
+
+WORDS = 'consolidated goodwill impairment lease revenue hedge deferred tax provision ratio liquidity'.split()
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    widths = ColumnWidths()
+    for i in range(count):
+        row = {
+            'PDF Name': f'paper_{i // 8}.pdf',
+            'Exam Type': 'NOVEMBER 2024 FINANCIAL REPORTING',
+            'Question Number': f'Q{i % 8 + 1}',
+            'Question': 'QUESTION ONE: ' + ' '.join(rng.choices(WORDS, k=70)) + '...',
+            'Suggested Solution': ' '.join(rng.choices(WORDS, k=70)) + '...',
+            'Mark Allocation': str(rng.choice([10, 15, 20, 25])),
+            'Syllabus Area': rng.choice(['Group accounts', 'Leases', 'Taxation', 'Ethics']),
+            'Mapping Confidence': round(rng.random(), 3),
+        }
+        rows.append(row)
+        widths.update(row)
+    return rows, widths
+
+
+def pandas_export(rows, widths):
+    """The previous build_excel_export"""
+    df = pd.DataFrame(rows)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Extracted_Questions', index=False)
+        worksheet = writer.sheets['Extracted_Questions']
+        for idx, col in enumerate(df.columns):
+            max_len = max(df[col].astype(str).str.len().max(), len(col)) + 2
+            worksheet.set_column(idx, idx, min(max_len, 50))
+    return output.getvalue()
+
+
+def streaming_export(rows, widths):
+    columns = list(rows[0])
+    return build_xlsx([('Extracted_Questions', columns, record_rows(rows, columns), widths)])
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = function(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    rows, widths = make_rows(args.rows)
+    columns = list(rows[0])
+    print(f"{args.rows} rows x {len(columns)} columns")
+
+    exports = [
+        ('pandas xlsx + astype', pandas_export, (rows, widths)),
+        ('streaming xlsx', streaming_export, (rows, widths)),
+        ('csv', build_csv, (rows, columns)),
+    ]
+    if parquet_available():
+        exports.append(('parquet', build_parquet, (rows, columns)))
+    for name, function, function_args in exports:
+        seconds, peak, size = measure(function, *function_args)
+        print(f"{name:<22} {seconds:>7.2f} s  peak {peak / 2**20:>7.1f} MB  file {size / 2**20:>6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
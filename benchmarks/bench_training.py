@@ -0,0 +1,97 @@
+"""
+Benchmark of the bank-marketing training pipeline against the notebook's tuning loop.
+
+The notebook tunes one model family after another with RandomizedSearchCV
+over the full imblearn pipeline, so the ColumnTransformer, SMOTE and the
+mutual-information feature selection are refitted for every candidate and
+fold. train_bank_models fits them once per fold (cached), runs successive
+halving over the cached matrices and tunes all families in one process
+pool. Both search the same number of candidates per family.
+
+Usage (from the repository root):
+    python benchmarks/bench_training.py [--data ./DB/bank-additional-full.csv] [--candidates 9]
+        [--models "Decision Tree" "Logistic Regression" KNN SGD]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_marketing import TARGET
+from train_bank_models import (
+    evaluate, make_classifier, make_preprocessing, prepare, read_training_data, search_space, tune_models
+)
+
+
+def notebook_search(data, model_names, candidates, folds):
+    """Serial RandomizedSearchCV per family over the full pipeline; returns {name: (seconds, test F1)}"""
+    from imblearn.pipeline import Pipeline
+    from sklearn.model_selection import RandomizedSearchCV, train_test_split
+    from sklearn.preprocessing import LabelEncoder
+
+    X, y = data.drop(columns=[TARGET]), data[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    encoder = LabelEncoder()
+    y_train, y_test = encoder.fit_transform(y_train), encoder.transform(y_test)
+    results = {}
+    for name in model_names:
+        start = time.perf_counter()
+        pipeline = Pipeline(steps=[*make_preprocessing(), ("classifier", make_classifier(name))])
+        space = {f"classifier__{key}": value for key, value in search_space(name).items()}
+        search = RandomizedSearchCV(pipeline, space, n_iter=candidates, scoring="f1_weighted", cv=folds,
+                                    random_state=42, n_jobs=1)
+        search.fit(X_train, y_train)
+        results[name] = (time.perf_counter() - start, evaluate(search.best_estimator_, X_test, y_test)["F1_Score"])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data", default="./Notebook/test_df.csv")
+    parser.add_argument("--candidates", type=int, default=9)
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--models", nargs="+", default=["Decision Tree", "Logistic Regression", "KNN", "SGD"])
+    args = parser.parse_args(argv)
+    warnings.filterwarnings("ignore")
+
+    data = read_training_data(args.data)
+    print(f"{len(data):,} rows, {args.candidates} candidates x {args.folds} folds per family")
+    start = time.perf_counter()
+    notebook = notebook_search(data, args.models, args.candidates, args.folds)
+    notebook_s = time.perf_counter() - start
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        prepared, cache_path = prepare(args.data, args.folds, cache_dir)
+        prepare_s = time.perf_counter() - start
+        tuned = tune_models(args.models, cache_path, prepared, args.candidates, progress=lambda message: None)
+        pipeline_s = time.perf_counter() - start
+        start = time.perf_counter()
+        prepare(args.data, args.folds, cache_dir)
+        cached_s = time.perf_counter() - start
+        tune_models(args.models, cache_path, prepared, args.candidates, progress=lambda message: None)
+        rerun_s = cached_s + time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir)
+
+    from imblearn.pipeline import Pipeline
+    X_test, y_test = prepared["test"]
+    for name in args.models:
+        seconds, f1 = notebook[name]
+        classifier, _, _, _, finished_after = tuned[name]
+        tuned_f1 = evaluate(Pipeline(steps=[*prepared["steps"], ("classifier", classifier)]), X_test, y_test)["F1_Score"]
+        print(f"{name:<20} notebook {seconds:>7.1f} s (test F1 {f1:.4f})   pipeline done after {finished_after:>6.1f} s "
+              f"(test F1 {tuned_f1:.4f})")
+    print(f"{'total':<20} notebook {notebook_s:>7.1f} s   pipeline {pipeline_s:.1f} s "
+          f"(of which {prepare_s:.1f} s preprocessing), {rerun_s:.1f} s with cached matrices; "
+          f"{os.cpu_count()} core(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Import-time profile of the Streamlit entry points.
+
+For Home.py and every page in pages/, runs the script's top-level imports in
+a fresh interpreter with ``python -X importtime`` and reports the total
+import time, the slowest top-level modules and which of the heavy optional
+modules (Kaleido/plotly.io, PIL, PyPDF2, openpyxl, xlsxwriter) were loaded.
+
+Usage (from the repository root):
+    python benchmarks/profile_imports.py [--top 5]
+"""
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['plotly.io', 'plotly.express', 'kaleido', 'PIL', 'PyPDF2', 'openpyxl', 'xlsxwriter']
+
+
+def top_level_imports(path):
+    """Source of the import statements at module level of a script"""
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), filename=path)
+    return '\n'.join(
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def run_importtime(code):
+    """Run code under -X importtime: ({top-level module: cumulative ms}, stdout)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': ROOT},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name_field = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level
+        if name_field[1:2] != ' ':
+            top_modules[name_field.strip()] = int(cumulative) / 1000
+    return top_modules, result.stdout
+
+
+def profile(code, startup_modules):
+    """Import timings of some import code: (total ms, [(ms, module)], heavy modules loaded)"""
+    code += '\nimport sys\nprint(",".join(m for m in %r if m in sys.modules))' % (HEAVY_MODULES,)
+    top_modules, stdout = run_importtime(code)
+    modules = [(ms, name) for name, ms in top_modules.items() if name not in startup_modules]
+    heavy = [m for m in stdout.strip().split(',') if m]
+    return sum(ms for ms, _ in modules), sorted(modules, reverse=True), heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=5, help="Slowest modules to list per entry point")
+    args = parser.parse_args(argv)
+
+    # Modules imported by interpreter startup are not attributed to any page
+    startup_modules, _ = run_importtime('pass')
+
+    # Streamlit itself pulls in some heavy modules, so it is shown as the baseline
+    entries = [('streamlit (baseline)', 'import streamlit')]
+    scripts = [os.path.join(ROOT, 'Home.py')] + sorted(glob.glob(os.path.join(ROOT, 'pages', '*.py')))
+    entries += [(os.path.relpath(path, ROOT), top_level_imports(path)) for path in scripts]
+
+    print(f"{'Entry point':<50} {'Import ms':>10}  Heavy modules loaded")
+    print('-' * 100)
+    for label, code in entries:
+        total_ms, modules, heavy = profile(code, startup_modules)
+        print(f"{label:<50} {total_ms:>10.1f}  {', '.join(heavy) or '-'}")
+        for ms, name in modules[:args.top]:
+            print(f"    {name:<46} {ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Synthetic exam-paper PDFs for the benchmarks.
+
+Writes a minimal PDF by hand (Helvetica text pages) so the benchmarks need
+nothing beyond PyPDF2 to read it back.
+"""
+import random
+
+NUMBER_WORDS = ['ONE', 'TWO', 'THREE', 'FOUR', 'FIVE', 'SIX', 'SEVEN', 'EIGHT', 'NINE', 'TEN']
+
+VOCABULARY = (
+    'consolidated group subsidiary associate goodwill impairment lease revenue recognition '
+    'financial instruments hedge derivative deferred tax provision ratio analysis liquidity '
+    'gearing profitability governance ethics sustainability disclosure fair value pension '
+    'share-based payment foreign currency acquisition disposal non-controlling interest'
+).split()
+
+
+def exam_lines(pages, lines_per_page=45, seed=0):
+    """Lines of text for each page of a synthetic exam paper with solutions"""
+    rng = random.Random(seed)
+    question = 0
+    result = []
+    for page in range(pages):
+        lines = []
+        if page == 0:
+            lines.append('NOVEMBER 2024 FINANCIAL REPORTING')
+        for line in range(lines_per_page):
+            if line == 0 and page % 3 == 0:
+                question += 1
+                word = NUMBER_WORDS[(question - 1) % len(NUMBER_WORDS)]
+                lines.append(f'QUESTION {word}')
+            elif line == 20 and page % 3 == 1:
+                lines.append('SOLUTION')
+            elif line == lines_per_page - 1 and page % 3 == 0:
+                lines.append(f'(Total: {rng.choice([10, 15, 20, 25])} marks)')
+            else:
+                lines.append(' '.join(rng.choice(VOCABULARY) for _ in range(10)))
+        result.append(lines)
+    return result
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(page_lines):
+    """Bytes of a PDF with one page per list of text lines"""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    page_ids = []
+    for lines in page_lines:
+        stream = ['BT /F1 9 Tf 11 TL 40 800 Td']
+        stream += [f'({_escape(line)}) Tj T*' for line in lines]
+        stream.append('ET')
+        content = '\n'.join(stream).encode('latin-1')
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        page_ids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (pages_obj, font, content_id)
+        ))
+    objects[catalog - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages_obj
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[pages_obj - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def make_exam_pdf(pages=300, lines_per_page=45, seed=0):
+    """Bytes of a synthetic exam paper PDF"""
+    return build_pdf(exam_lines(pages, lines_per_page, seed))
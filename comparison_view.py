@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def build_indicator_cube(data):
+    """
+    Pivot indicator rows into a dense (series x country x year) cube.
+
+    Duplicate observations for the same series, country and year (for
+    example sex or age breakdowns) are averaged. Missing cells are NaN.
+    """
+    series_codes, series_names = pd.factorize(data["Series Name"], sort=True)
+    country_codes, countries = pd.factorize(data["Country Name"], sort=True)
+    year_codes, years = pd.factorize(data["Year"], sort=True)
+    values = pd.to_numeric(data["OBS_VALUE"], errors="coerce").to_numpy(dtype="float64")
+
+    valid = (series_codes >= 0) & (country_codes >= 0) & (year_codes >= 0) & ~np.isnan(values)
+    cells = (series_codes[valid], country_codes[valid], year_codes[valid])
+
+    shape = (len(series_names), len(countries), len(years))
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    np.add.at(sums, cells, values[valid])
+    np.add.at(counts, cells, 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cube = np.where(counts > 0, sums / counts, np.nan)
+
+    return {
+        "series": list(series_names),
+        "countries": list(countries),
+        "years": np.asarray(years),
+        "values": cube,
+    }
+
+
+def downsample_years(values, years, max_points):
+    """
+    Average consecutive years into at most max_points buckets.
+
+    values is a (..., year) array; the result keeps the leading axes and
+    labels each bucket with its first and last year.
+    """
+    if len(years) <= max_points:
+        return values, [str(year) for year in years]
+
+    starts = np.linspace(0, len(years), max_points, endpoint=False).astype(int)
+    ends = np.append(starts[1:], len(years)) - 1
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=-1)
+    counts = np.add.reduceat(present, starts, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bucketed = np.where(counts > 0, sums / counts, np.nan)
+    labels = [
+        str(years[start]) if start == end else f"{years[start]}–{years[end]}"
+        for start, end in zip(starts, ends)
+    ]
+    return bucketed, labels
+
+
+def select_block(cube, series, countries, year_range, max_points):
+    """
+    Slice the cube for the chosen series, countries and year range and
+    downsample the year axis. Returns (values, country labels, year labels).
+    """
+    series_idx = [cube["series"].index(name) for name in series]
+    country_idx = [cube["countries"].index(name) for name in countries]
+    years = cube["years"]
+    year_mask = (years >= year_range[0]) & (years <= year_range[1])
+    block = cube["values"][np.ix_(series_idx, country_idx, np.flatnonzero(year_mask))]
+    block, year_labels = downsample_years(block, years[year_mask], max_points)
+    return block, countries, year_labels
+
+
+def build_heatmap(matrix, countries, year_labels, title):
+    """Country x year heatmap for one series"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix,
+        x=year_labels,
+        y=countries,
+        colorscale="Viridis",
+        hoverongaps=False,
+    ))
+    fig.update_layout(title=title, template="plotly", height=max(300, 40 * len(countries) + 120))
+    return fig
+
+
+def build_small_multiples(block, series, countries, year_labels):
+    """One panel per series with a line per country"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    cols = 2 if len(series) > 1 else 1
+    rows = -(-len(series) // cols)
+    fig = make_subplots(rows=rows, cols=cols, subplot_titles=series)
+    for s, _ in enumerate(series):
+        row, col = divmod(s, cols)
+        for c, country in enumerate(countries):
+            fig.add_trace(
+                go.Scatter(
+                    x=year_labels,
+                    y=block[s, c],
+                    mode="lines+markers",
+                    name=country,
+                    legendgroup=country,
+                    showlegend=s == 0,
+                ),
+                row=row + 1,
+                col=col + 1,
+            )
+    fig.update_layout(template="plotly", height=320 * rows)
+    return fig
+
+
+def render_comparison(cube, figure_cache, cache_prefix, max_points=30):
+    """
+    Comparison mode: several series across all countries and years,
+    rendered from the pre-aggregated cube rather than raw rows.
+    """
+    if not cube["series"] or not len(cube["years"]):
+        st.warning("No data available for comparison.")
+        return
+
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        selected_series = st.multiselect(
+            "Select Series",
+            options=cube["series"],
+            default=cube["series"][:3],
+            key="compare_series"
+        )
+    with col2:
+        selected_countries = st.multiselect(
+            "Select Countries",
+            options=cube["countries"],
+            default=cube["countries"],
+            key="compare_countries"
+        )
+
+    first_year, last_year = int(cube["years"].min()), int(cube["years"].max())
+    if first_year < last_year:
+        year_range = st.slider(
+            "Year Range",
+            min_value=first_year,
+            max_value=last_year,
+            value=(first_year, last_year),
+            key="compare_years"
+        )
+    else:
+        year_range = (first_year, last_year)
+
+    if not selected_series or not selected_countries:
+        st.info("Select at least one series and one country to compare.")
+        return
+
+    block, countries, year_labels = select_block(
+        cube, selected_series, selected_countries, year_range, max_points
+    )
+    selection = (tuple(selected_series), tuple(selected_countries), year_range, max_points)
+
+    st.subheader("Small Multiples")
+    st.plotly_chart(
+        figure_cache.get_or_build(
+            cache_prefix + ("small_multiples",) + selection,
+            lambda: build_small_multiples(block, selected_series, countries, year_labels),
+        ),
+        use_container_width=True,
+    )
+
+    st.subheader("Country × Year Heatmaps")
+    for s, series_name in enumerate(selected_series):
+        st.plotly_chart(
+            figure_cache.get_or_build(
+                cache_prefix + ("heatmap", series_name) + selection[1:],
+                lambda s=s, series_name=series_name: build_heatmap(
+                    block[s], countries, year_labels, series_name
+                ),
+            ),
+            use_container_width=True,
+        )
@@ -0,0 +1,283 @@
+import os
+from functools import partial
+import streamlit as st
+import pandas as pd
+from figure_cache import FigureCache
+from dataset_registry import DATASETS
+from comparison_view import build_indicator_cube, render_comparison
+
+
+def dataset_version(dataset_key):
+    """Version tag of a dataset file, changes whenever the file is rewritten"""
+    stat = os.stat(DATASETS[dataset_key]["path"])
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+@st.cache_resource(max_entries=32)
+def _read_dataset(path, version, cache_path=None):
+    # Prefer the columnar copy published alongside the CSV by refresh_datasets.py
+    if cache_path and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        try:
+            data = pd.read_parquet(cache_path)
+            data = data.drop(columns=[col for col in data.columns if col.startswith("_")])
+        except ImportError:
+            data = pd.read_csv(path)
+    else:
+        data = pd.read_csv(path)
+    if "Year" in data.columns:
+        data["Year_str"] = data["Year"].astype(str)
+    return data
+
+
+def load_dataset(dataset_key):
+    """
+    Load an indicator dataset from the registry once per process and version.
+    The plotting column Year_str is derived here instead of on every rerun.
+    """
+    spec = DATASETS[dataset_key]
+    return _read_dataset(spec["path"], dataset_version(dataset_key), spec.get("cache_path"))
+
+
+def build_index(dataset_key):
+    """
+    Index a dataset by country and by (country, series) so selections
+    are answered with positional lookups instead of boolean masks.
+    """
+    return _build_index(dataset_key, dataset_version(dataset_key))
+
+
+@st.cache_resource(max_entries=32)
+def _build_index(dataset_key, version):
+    data = load_dataset(dataset_key)
+    groups = data.groupby(["Country Name", "Series Name"], sort=False).indices
+    countries = list(data["Country Name"].dropna().unique())
+    series_by_country = {country: [] for country in countries}
+    for country, series in groups:
+        series_by_country.setdefault(country, []).append(series)
+    return {
+        "countries": countries,
+        "series_by_country": series_by_country,
+        "rows": groups,
+    }
+
+
+def build_cube(dataset_key):
+    """(series x country x year) cube of a dataset for the comparison view"""
+    return _build_cube(dataset_key, dataset_version(dataset_key))
+
+
+@st.cache_resource(max_entries=32)
+def _build_cube(dataset_key, version):
+    return build_indicator_cube(load_dataset(dataset_key))
+
+
+def get_series_data(dataset_key, country, series):
+    """Return the rows of one country/series pair using the cached index"""
+    rows = build_index(dataset_key)["rows"].get((country, series))
+    data = load_dataset(dataset_key)
+    if rows is None:
+        return data.iloc[0:0]
+    return data.iloc[rows]
+
+
+@st.cache_resource
+def get_figure_cache():
+    """The figure cache shared by every session of this process"""
+    return FigureCache(max_entries=512)
+
+
+def _build_bar(series_data):
+    import plotly.express as px
+
+    return px.bar(
+        series_data,
+        x="Year_str",
+        y="OBS_VALUE",
+        title="Yearly OBS_VALUE",
+        template="plotly"  # keep color
+    )
+
+
+def _build_pie(series_data):
+    import plotly.express as px
+
+    return px.pie(
+        series_data,
+        names="Year_str",
+        values="OBS_VALUE",
+        title="OBS_VALUE Share by Year",
+        template="plotly"  # keep color
+    )
+
+
+def _build_line(series_data):
+    import plotly.express as px
+
+    return px.line(
+        series_data,
+        x="Year_str",
+        y="OBS_VALUE",
+        markers=True,
+        title="OBS_VALUE Trend Over Years",
+        template="plotly"  # keep color
+    )
+
+
+CHART_BUILDERS = {
+    "bar": _build_bar,
+    "pie": _build_pie,
+    "line": _build_line,
+}
+
+
+def build_figures(dataset_key, country, series):
+    """
+    Return the bar, pie and line figure specs for one country/series pair.
+    Figures come from the shared figure cache and are only built on a miss.
+    """
+    cache = get_figure_cache()
+    version = dataset_version(dataset_key)
+    figures = []
+    for chart_type, builder in CHART_BUILDERS.items():
+        key = (dataset_key, version, country, series, chart_type)
+        figures.append(cache.get_or_build(
+            key, lambda builder=builder: builder(get_series_data(dataset_key, country, series))
+        ))
+    return figures
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_charts_png(dataset_key, version, country, series):
+    """Render the three charts side by side into a single PNG"""
+    # Kaleido and PIL are only needed once a download is requested
+    from io import BytesIO
+    from PIL import Image
+    import plotly.io as pio
+
+    images = [
+        Image.open(BytesIO(pio.to_image(fig, format="png"))).convert("RGB")
+        for fig in build_figures(dataset_key, country, series)
+    ]
+
+    # Arrange horizontally
+    total_width = sum(img.width for img in images)
+    max_height = max(img.height for img in images)
+
+    combined_img = Image.new("RGB", (total_width, max_height), (255, 255, 255))
+    offset = 0
+    for img in images:
+        combined_img.paste(img, (offset, 0))
+        offset += img.width
+
+    # Save to buffer
+    buf = BytesIO()
+    combined_img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def render_cache_debug_panel():
+    """Sidebar panel with figure cache counters, shown with ?debug=1"""
+    if st.query_params.get("debug") != "1":
+        return
+    stats = get_figure_cache().stats()
+    with st.sidebar.expander("🛠️ Figure cache", expanded=True):
+        st.metric("Hit rate", f"{stats['hit_rate']:.1%}")
+        st.write(f"**Hits / misses:** {stats['hits']} / {stats['misses']}")
+        st.write(f"**Entries:** {stats['entries']} of {stats['max_entries']} ({stats['stored_kb']:.0f} KB)")
+        st.write(f"**Evictions:** {stats['evictions']}")
+        st.write(f"**Average build time:** {stats['avg_build_ms']:.1f} ms")
+        if st.button("Clear figure cache"):
+            get_figure_cache().clear()
+
+
+def render_dashboard(dataset_key):
+    """Render the country/series dashboard for a registered dataset"""
+    spec = DATASETS[dataset_key]
+
+    st.set_page_config(
+        page_title='Dashboard',
+        page_icon='📈',
+        layout='wide'
+    )
+
+    # Check if the user is authenticated
+    if not st.session_state.get("authentication_status"):
+        st.info('Please log in to access the application from the MainPage.')
+        return
+
+    try:
+        index = build_index(dataset_key)
+    except FileNotFoundError as e:
+        st.error(f"Error loading dataset: {e}")
+        return
+
+    st.title(spec["title"])
+    render_cache_debug_panel()
+
+    mode = st.radio(
+        "View",
+        options=["Single country", "Compare countries"],
+        horizontal=True,
+        key="dashboard_mode"
+    )
+    if mode == "Compare countries":
+        render_comparison(
+            build_cube(dataset_key),
+            get_figure_cache(),
+            (dataset_key, dataset_version(dataset_key))
+        )
+    else:
+        render_single_view(dataset_key, index)
+
+
+def render_single_view(dataset_key, index):
+    """One country and one series as bar, pie and line charts"""
+    # ============================
+    # Country + Series Filter
+    # ============================
+    col1, col2 = st.columns([2, 2])
+    with col1:
+        selected_country = st.selectbox(
+            "Select Country",
+            options=index["countries"],
+            key="country_perf"
+        )
+    with col2:
+        country_series = index["series_by_country"].get(selected_country, [])
+        if country_series:
+            selected_series = st.selectbox(
+                "Select Series",
+                options=country_series,
+                key="series_filter"
+            )
+        else:
+            selected_series = None
+
+    if not selected_series:
+        return
+
+    if get_series_data(dataset_key, selected_country, selected_series).empty:
+        st.warning(f"No data available for {selected_country} in {selected_series}")
+        return
+
+    st.subheader(f"Performance of {selected_country} ({selected_series})")
+    fig_bar, fig_pie, fig_line = build_figures(dataset_key, selected_country, selected_series)
+
+    # Create three side-by-side columns
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.plotly_chart(fig_bar, use_container_width=True)
+    with col_b:
+        st.plotly_chart(fig_pie, use_container_width=True)
+    with col_c:
+        st.plotly_chart(fig_line, use_container_width=True)
+
+    # =========================
+    # Download All Charts Button
+    # =========================
+    st.download_button(
+        label="📥 Download All Charts",
+        data=partial(build_charts_png, dataset_key, dataset_version(dataset_key), selected_country, selected_series),
+        file_name=f"{selected_country}_{selected_series}_charts.png",
+        mime="image/png"
+    )
@@ -0,0 +1,39 @@
+# Registry of the Data360 indicator datasets.
+# raw_path is the export in DB/, path is the processed CSV served by the
+# dashboards and cache_path its columnar (Parquet) copy written by
+# refresh_datasets.py. Adding a dataset only needs a new entry here and a
+# two-line page in pages/.
+DATASETS = {
+    "world_development": {
+        "title": "Country World Development Indicators Over Time",
+        "label": "World Development Indicators",
+        "raw_path": "./DB/Data_on_Economic_Growth_indicator.csv",
+        "path": "./dataset/Data_on_Economic_Growth_indicatorProcessed.csv",
+        "cache_path": "./dataset/cache/Data_on_Economic_Growth_indicatorProcessed.parquet",
+        "session_key": "data_key1",
+    },
+    "non_communicable_diseases": {
+        "title": "Non Communicable Diseases Indicators Over Time",
+        "label": "Statistic on Non Communicable Disease",
+        "raw_path": "./DB/Data_on_Non_Communicable_disease.csv",
+        "path": "./dataset/Data_on_Non_Communicable_diseaseProcessed.csv",
+        "cache_path": "./dataset/cache/Data_on_Non_Communicable_diseaseProcessed.parquet",
+        "session_key": "data_key2",
+    },
+    "population": {
+        "title": "Populations Growth Over Time",
+        "label": "Population Segregation",
+        "raw_path": "./DB/Data_on_Population.csv",
+        "path": "./dataset/Data_on_PopulationProcessed.csv",
+        "cache_path": "./dataset/cache/Data_on_PopulationProcessed.parquet",
+        "session_key": "data_key3",
+    },
+    "technology": {
+        "title": "Technology Development Indicators Over Time",
+        "label": "Technology Performance Indicators",
+        "raw_path": "./DB/Data_on_Technology.csv",
+        "path": "./dataset/Data_on_TechnologyProcessed.csv",
+        "cache_path": "./dataset/cache/Data_on_TechnologyProcessed.parquet",
+        "session_key": "data_key4",
+    },
+}
@@ -0,0 +1,216 @@
+"""
+Device fleet analytics over the field tablet logs.
+
+DB/LIPW_DEVICES.csv (tablets of the LIPW sub-projects) and
+DB/PICLASS_DEVICES.csv (tablets of the PI classes) hold one row per device
+check-in with the device uuid, model, OS version, last connection time and
+a "lat,lon" location string. Logs are parsed once into typed columns
+(datetimes, float32 coordinates, categorical model/OS/group) and kept as a
+Parquet copy next to the other dataset caches, so later loads skip the CSV
+parsing entirely. Rollups work on the latest check-in of every device.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from file_utils import write_atomic
+
+# 'group' is the column a device is assigned to in each log
+DEVICE_LOGS = {
+    "lipw": {
+        "label": "LIPW sub-projects",
+        "path": "./DB/LIPW_DEVICES.csv",
+        "cache_path": "./dataset/cache/LIPW_DEVICES.parquet",
+        "group": "subProject",
+        "group_label": "Sub-project",
+        # Listing that places each group in a district
+        "districts": {"path": "./DB/SubProjectsListing.csv", "key": "subProject", "district": "District"},
+    },
+    "piclass": {
+        "label": "PI classes",
+        "path": "./DB/PICLASS_DEVICES.csv",
+        "cache_path": "./dataset/cache/PICLASS_DEVICES.parquet",
+        "group": "className",
+        "group_label": "Class",
+        "districts": {"path": "./DB/Bzcoclasscommunity.csv", "key": "Class Name", "district": "District"},
+    },
+}
+
+# Low-cardinality text columns stored as categoricals
+CATEGORY_COLUMNS = ["uuid", "deviceId", "osVersion", "osName", "device", "model", "host"]
+
+DATE_COLUMNS = ["lastConnected", "createDate", "lastUpdated"]
+
+# Days since the last connection: upper edges of the staleness buckets
+STALENESS_EDGES = (1, 7, 30, 90)
+STALENESS_LABELS = ["Today", "This week", "This month", "Last 3 months", "Older", "Never"]
+
+
+def log_version(log_key):
+    """Version tag of a device log, changes whenever the file is rewritten"""
+    stat = os.stat(DEVICE_LOGS[log_key]["path"])
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def parse_locations(locations):
+    """float32 latitude and longitude arrays from "lat,lon" strings; NaN where missing or malformed"""
+    parts = locations.astype(str).str.partition(",")
+    lat = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype="float32", na_value=np.nan)
+    lon = pd.to_numeric(parts[2], errors="coerce").to_numpy(dtype="float32", na_value=np.nan)
+    # (0, 0) is what tablets report before their first GPS fix
+    unknown = (lat == 0) & (lon == 0)
+    lat[unknown] = np.nan
+    lon[unknown] = np.nan
+    return lat, lon
+
+
+def strip_categories(values):
+    """Categorical with surrounding spaces removed from its labels, merging labels that become equal"""
+    labels, inverse = np.unique(values.cat.categories.str.strip(), return_inverse=True)
+    codes = values.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, inverse[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
+def read_log_csv(path, columns, dtype):
+    """read_csv of the wanted columns, with the multi-threaded pyarrow parser when it is installed"""
+    present = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    usecols = [column for column in present if column in columns]
+    try:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype, encoding="utf-8-sig", engine="pyarrow")
+    except ImportError:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype, encoding="utf-8-sig")
+
+
+def parse_device_log(path, group_column):
+    """Read a raw device log into typed columns, with the group column renamed to 'group'"""
+    categories = [group_column, *CATEGORY_COLUMNS]
+    raw = read_log_csv(
+        path,
+        [*categories, *DATE_COLUMNS, "location"],
+        {column: "category" for column in categories} | {"location": str},
+    )
+    log = raw.drop(columns="location").rename(columns={group_column: "group"})
+    log["group"] = strip_categories(log["group"])
+    for column in DATE_COLUMNS:
+        if column in log.columns:
+            log[column] = pd.to_datetime(log[column], format="ISO8601", errors="coerce")
+    log["lat"], log["lon"] = parse_locations(raw["location"])
+    return log
+
+
+def load_device_log(log_key):
+    """
+    Typed device log, read from its Parquet copy when that is newer than
+    the CSV. The copy is (re)written after parsing the CSV.
+    """
+    spec = DEVICE_LOGS[log_key]
+    cache_path = spec["cache_path"]
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(spec["path"]):
+        try:
+            return pd.read_parquet(cache_path)
+        except (ImportError, ValueError, OSError):
+            pass
+    log = parse_device_log(spec["path"], spec["group"])
+    try:
+        write_atomic(cache_path, lambda tmp: log.to_parquet(tmp, index=False))
+    except ImportError:
+        pass
+    return log
+
+
+def group_key(names):
+    """Join key of group names: case, spacing and punctuation are ignored"""
+    return names.astype(str).str.casefold().str.replace(r"[\W_]+", "", regex=True)
+
+
+def load_group_districts(log_key):
+    """District of every group of a device log, indexed by group_key"""
+    spec = DEVICE_LOGS[log_key]["districts"]
+    listing = pd.read_csv(spec["path"], usecols=[spec["key"], spec["district"]], encoding="latin1")
+    listing = listing.dropna()
+    districts = pd.Series(listing[spec["district"]].str.strip().str.title().to_numpy(), index=group_key(listing[spec["key"]]))
+    return districts[~districts.index.duplicated()]
+
+
+def assign_districts(groups, districts):
+    """District of each group name, 'Unassigned' where the listing has no match"""
+    keys = group_key(pd.Series(groups))
+    return pd.Series(keys.map(districts).fillna("Unassigned").to_numpy(), index=getattr(groups, "index", None))
+
+
+def unmatched_groups(groups, assigned):
+    """Device count of every group name the district listing does not match, most devices first"""
+    unmatched = pd.Series(np.asarray(groups, dtype=object)[np.asarray(assigned) == "Unassigned"], dtype=object)
+    return unmatched.value_counts()
+
+
+def latest_check_ins(log):
+    """The most recent check-in of every device in every group"""
+    order = np.argsort(log["lastConnected"].to_numpy(), kind="stable")
+    latest = log.iloc[order].drop_duplicates(["group", "uuid"], keep="last")
+    return latest.reset_index(drop=True)
+
+
+def staleness(last_connected, as_of):
+    """Days since each last connection and its staleness bucket"""
+    days = (as_of - last_connected).dt.total_seconds().to_numpy() / 86400
+    codes = np.searchsorted(np.asarray(STALENESS_EDGES, dtype=float), days, side="right")
+    codes[np.isnan(days)] = len(STALENESS_LABELS) - 1
+    return days, pd.Categorical.from_codes(codes, categories=STALENESS_LABELS, ordered=True)
+
+
+def build_fleet_summary(log, as_of=None):
+    """
+    Precomputed rollups of a typed device log.
+
+    as_of is the time staleness is measured from, the latest check-in in
+    the log by default. Returns a dict with:
+    - devices: latest check-in per device and group, with days_since and stale
+    - groups: per group device count, last check-in, median days since, the
+      number of devices in each staleness bucket and the share on the most
+      common OS version of the fleet
+    - os_versions: devices per OS version, with the share not seen this month
+    - os_by_group: devices per group and OS version (long format)
+    """
+    devices = latest_check_ins(log)
+    if as_of is None:
+        as_of = devices["lastConnected"].max()
+    devices["days_since"], devices["stale"] = staleness(devices["lastConnected"], as_of)
+
+    by_group = devices.groupby("group", observed=True)
+    groups = by_group.agg(
+        devices=("uuid", "size"),
+        last_check_in=("lastConnected", "max"),
+        median_days_since=("days_since", "median"),
+    )
+    buckets = pd.crosstab(devices["group"], devices["stale"], dropna=False)
+    groups = groups.join(buckets.reindex(columns=STALENESS_LABELS, fill_value=0), how="left")
+
+    fleet_os = devices.drop_duplicates("uuid", keep="last")
+    recent = fleet_os["days_since"].to_numpy() <= STALENESS_EDGES[2]
+    os_versions = (
+        pd.DataFrame({"osVersion": fleet_os["osVersion"].to_numpy(), "recent": recent})
+        .groupby("osVersion", observed=True)["recent"]
+        .agg(devices="size", recent="sum")
+        .sort_values("devices", ascending=False)
+    )
+    os_versions["share"] = os_versions["devices"] / os_versions["devices"].sum()
+    os_versions["stale_share"] = 1 - os_versions["recent"] / os_versions["devices"]
+    os_versions = os_versions.drop(columns="recent")
+
+    common = os_versions.index[0] if len(os_versions) else None
+    groups["on_common_os"] = (devices["osVersion"] == common).groupby(devices["group"], observed=True).mean()
+
+    os_by_group = (
+        devices.groupby(["group", "osVersion"], observed=True).size()
+        .rename("devices").reset_index()
+    )
+    return {
+        "as_of": as_of,
+        "devices": devices,
+        "groups": groups.sort_values("median_days_since", ascending=False),
+        "os_versions": os_versions,
+        "os_by_group": os_by_group,
+    }
@@ -0,0 +1,235 @@
+"""
+Question extraction and syllabus mapping for exam paper PDFs.
+
+Shared by pages/07_PastQuestionExtract.py and the background workers of
+exam_jobs.py, so nothing here depends on Streamlit.
+"""
+import re
+
+from keyword_matcher import KeywordMatcher
+from pdf_cache import cached_pdf_text, content_hash, get_cache
+from question_segmenter import iter_question_spans, span_text
+
+# Common patterns for syllabus area headers, tried in order; group 2 is the
+# area name
+AREA_HEADER_PATTERNS = [
+    # Pattern for "A) Area Name" format
+    re.compile(r'([A-Z]\))\s*([^\.\n]+?)\s*(?=[A-Z]\)|\n\n|$)', re.MULTILINE),
+    # Pattern for numbered sections "1. Area Name"
+    re.compile(r'(\d+\.)\s*([^\.\n]+?)\s*(?=\d+\.|\n\n|$)', re.MULTILINE),
+    # Pattern for bold or heading-like text (no area code)
+    re.compile(r'\n\s*()([A-Z][A-Za-z\s]{10,50}?)\s*\n'),
+]
+
+# Fallback: a line that looks like a section header
+SECTION_HEADER_LINE = re.compile(r'^[A-Z][A-Za-z\s]{10,}')
+
+
+def extract_syllabus_keywords(syllabus_pdf):
+    """
+    Extract syllabus areas and keywords from a PDF syllabus document.
+    Returns (syllabus_keywords, syllabus_text).
+    """
+    # Read PDF content (cached by the SHA-256 of the file)
+    syllabus_text, digest = cached_pdf_text(syllabus_pdf)
+    
+    def build_syllabus_keywords():
+        # Extract syllabus areas and their content
+        syllabus_areas = load_syllabus_areas(syllabus_text)
+        
+        # Generate keywords for each area
+        syllabus_keywords = {}
+        for area_name, area_content in syllabus_areas.items():
+            keywords = generate_keywords_from_content(area_content, area_name)
+            syllabus_keywords[area_name] = keywords
+        return syllabus_keywords
+    
+    syllabus_keywords = get_cache().get_or_compute('syllabus', digest, compute=build_syllabus_keywords)
+    
+    return syllabus_keywords, syllabus_text
+
+def load_syllabus_index(syllabus_pdf):
+    """
+    TF-IDF index over the areas of a syllabus PDF, built once per syllabus
+    and persisted in the content cache next to its keyword map
+    """
+    from tfidf_mapper import SyllabusIndex
+
+    syllabus_text, digest = cached_pdf_text(syllabus_pdf)
+    return get_cache().get_or_compute(
+        'tfidf', digest,
+        compute=lambda: SyllabusIndex(load_syllabus_areas(syllabus_text)),
+        pickled=True
+    )
+
+def load_syllabus_areas(syllabus_text):
+    """
+    extract_syllabus_areas, memoized in the content cache by the hash of
+    the syllabus text
+    """
+    return get_cache().get_or_compute(
+        'areas', content_hash(syllabus_text),
+        compute=lambda: extract_syllabus_areas(syllabus_text)
+    )
+
+def extract_syllabus_areas(syllabus_text):
+    """
+    Extract syllabus areas from the syllabus text.
+
+    The first header pattern found in the text defines the areas: every
+    header is located in one scan and an area's content is the text between
+    its header and the next one. An area listed twice (say in a contents
+    page and in the body) collects the content of both.
+    """
+    syllabus_areas = {}
+    
+    for pattern in AREA_HEADER_PATTERNS:
+        headers = list(pattern.finditer(syllabus_text))
+        if not headers:
+            continue
+        ends = [header.start() for header in headers[1:]] + [len(syllabus_text)]
+        for header, end in zip(headers, ends):
+            area_name = header.group(2).strip()
+            area_content = syllabus_text[header.end():end].strip()
+            previous = syllabus_areas.get(area_name)
+            syllabus_areas[area_name] = f"{previous} {area_content}" if previous else area_content
+        break
+    
+    # If no structured patterns found, try to extract major sections
+    if not syllabus_areas:
+        # Look for lines that seem like section headers
+        current_area = None
+        current_content = []
+        
+        for line in syllabus_text.split('\n'):
+            line = line.strip()
+            if len(line) > 5 and (line.isupper() or SECTION_HEADER_LINE.match(line)):
+                if current_area and current_content:
+                    syllabus_areas[current_area] = ' '.join(current_content)
+                current_area = line
+                current_content = []
+            elif current_area and line:
+                current_content.append(line)
+        
+        if current_area and current_content:
+            syllabus_areas[current_area] = ' '.join(current_content)
+    
+    return syllabus_areas
+
+def generate_keywords_from_content(content, area_name):
+    """
+    Generate relevant keywords from syllabus area content
+    """
+    # Combine area name and content for keyword extraction
+    full_text = f"{area_name} {content}".lower()
+    
+    # Remove common stop words
+    stop_words = {
+        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 
+        'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 
+        'had', 'having', 'do', 'does', 'did', 'doing', 'will', 'would', 'could', 'should',
+        'may', 'might', 'must', 'can', 'shall'
+    }
+    
+    # Extract meaningful words (3+ characters)
+    words = re.findall(r'\b[a-zA-Z]{3,}\b', full_text)
+    
+    # Filter out stop words and get unique words
+    keywords = [word for word in words if word not in stop_words]
+    
+    # Add common accounting/finance terms that might be relevant
+    accounting_terms = {
+        'financial', 'reporting', 'accounting', 'standards', 'ifrs', 'ias', 'gaap',
+        'consolidated', 'group', 'subsidiary', 'associate', 'joint', 'venture',
+        'financial statements', 'balance sheet', 'income statement', 'cash flow',
+        'ratio analysis', 'performance', 'profitability', 'liquidity', 'gearing',
+        'lease', 'financial instruments', 'hedging', 'derivatives', 'taxation',
+        'ethics', 'governance', 'sustainability', 'environmental', 'social',
+        'audit', 'assurance', 'compliance', 'regulation', 'framework'
+    }
+    
+    # Add relevant accounting terms
+    for term in accounting_terms:
+        if term in full_text:
+            keywords.extend(term.split())
+    
+    # Prioritize longer words and unique terms
+    keywords = list(set(keywords))  # Remove duplicates
+    keywords.sort(key=lambda x: len(x), reverse=True)  # Sort by length
+    
+    # Return top 15-20 most relevant keywords
+    return keywords[:20]
+
+def extract_pdf_content(uploaded_file, syllabus_keywords=None, parallel=None):
+    """
+    Extract content from PDF file and structure it with syllabus mapping.
+    Results are cached by the SHA-256 of the file and of the syllabus keywords,
+    so repeat uploads and reruns skip PDF parsing entirely.
+    """
+    full_text, digest = cached_pdf_text(uploaded_file, parallel=parallel)
+    pdf_content = get_cache().get_or_compute(
+        'questions', digest, content_hash(syllabus_keywords),
+        compute=lambda: parse_pdf_content(full_text, uploaded_file.name, syllabus_keywords)
+    )
+    pdf_content['filename'] = uploaded_file.name
+    pdf_content['paper_hash'] = digest
+    return pdf_content
+
+def parse_pdf_content(full_text, filename, syllabus_keywords=None):
+    """
+    Structure the text of an exam paper into questions, solutions and marks.
+    'questions' and 'suggested_solutions' hold 500-character previews for
+    the tables; 'question_texts' and 'solution_texts' the full texts.
+    """
+    pdf_content = {
+        'filename': filename,
+        'exams_type': '',
+        'sitting': '',
+        'questions': [],
+        'suggested_solutions': [],
+        'question_texts': [],
+        'solution_texts': [],
+        'mark_allocations': [],
+        'syllabus_areas': []
+    }
+    
+    # Extract exam type and sitting (month and year)
+    exam_type_match = re.search(r'(NOVEMBER|MAY|MARCH|SEPTEMBER)\s+(\d{4})\s+(.*?)(?:\n|$)', full_text, re.IGNORECASE)
+    if exam_type_match:
+        pdf_content['exams_type'] = f"{exam_type_match.group(1)} {exam_type_match.group(3)}"
+        pdf_content['sitting'] = f"{exam_type_match.group(1).upper()} {exam_type_match.group(2)}"
+    
+    # Compile the syllabus keywords once for every question of the paper
+    matcher = KeywordMatcher(syllabus_keywords) if syllabus_keywords else syllabus_keywords
+    
+    # Segment questions, solutions and marks in one pass
+    for span in iter_question_spans(full_text):
+        question_text = span_text(full_text, span.question)
+        solution_text = span_text(full_text, span.solution)
+        
+        # Map to syllabus area
+        syllabus_area = map_question_to_syllabus(question_text, matcher) if syllabus_keywords is not None else "Syllabus not loaded"
+        
+        pdf_content['questions'].append(f"QUESTION {span.number}: {question_text[:500]}...")
+        pdf_content['suggested_solutions'].append(solution_text[:500] + "..." if solution_text else "Not available")
+        pdf_content['question_texts'].append(question_text)
+        pdf_content['solution_texts'].append(solution_text)
+        pdf_content['mark_allocations'].append(span.marks)
+        pdf_content['syllabus_areas'].append(syllabus_area)
+    
+    return pdf_content
+
+def map_question_to_syllabus(question_text, syllabus_keywords):
+    """
+    Map question content to syllabus areas based on extracted keywords from PDF.
+    syllabus_keywords may also be a KeywordMatcher compiled from them.
+    """
+    if not syllabus_keywords:
+        return "Syllabus not loaded"
+    
+    matcher = syllabus_keywords if isinstance(syllabus_keywords, KeywordMatcher) else KeywordMatcher(syllabus_keywords)
+    
+    # Find the best matching syllabus area in one pass over the question
+    best_match, max_keyword_count = matcher.best_area(question_text)
+    
+    return best_match if max_keyword_count > 0 else "General/Unknown"
@@ -0,0 +1,249 @@
+"""
+Background processing of exam paper upload batches.
+
+A batch is recorded in a local SQLite store and every file is handed to a
+shared process pool. Workers write their own progress and results back to
+the store, so the Streamlit page only polls it: the script thread is never
+blocked and a browser refresh can pick the job up again from its id.
+A file the pool could not run (a worker that died, a pool that broke) is
+marked failed with the reason, and failed files can be queued again.
+"""
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from io import BytesIO
+
+from pdf_cache import content_hash
+
+DB_PATH = os.environ.get('EXAM_JOBS_DB', './.cache/exam_jobs.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    created REAL NOT NULL,
+    owner_pid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint);
+CREATE TABLE IF NOT EXISTS job_files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    position INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    result TEXT,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS job_files_job ON job_files (job_id, position);
+"""
+
+PENDING = ('queued', 'running')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _connect(db_path):
+    folder = os.path.dirname(db_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _get_executor():
+    """Worker pool shared by every session of this process"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn keeps workers independent of the server's threads
+            _executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _discard_executor(executor):
+    """Drop a broken pool so the next submission starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _mark_failed(db_path, file_id, error):
+    """Record a file the pool could not process, unless its worker already recorded an outcome"""
+    with _connect(db_path) as conn:
+        conn.execute(
+            "UPDATE job_files SET status = 'failed', error = ?, finished = ? WHERE id = ? AND status IN (?, ?)",
+            (error, time.time(), file_id, *PENDING),
+        )
+
+
+def _on_file_done(db_path, file_id, executor, future):
+    """Done-callback of a file's future: failures of the pool itself never reach _process_file"""
+    if future.cancelled():
+        _mark_failed(db_path, file_id, 'Cancelled before it was processed')
+        return
+    error = future.exception()
+    if error is None:
+        return
+    _mark_failed(db_path, file_id, f"{type(error).__name__}: {error}")
+    if isinstance(error, BrokenProcessPool):
+        _discard_executor(executor)
+
+
+def _submit_files(db_path, file_ids, files, syllabus_keywords):
+    """Hand files to the worker pool; a file that cannot be submitted is marked failed at once"""
+    for file_id, (name, pdf_bytes) in zip(file_ids, files):
+        executor = _get_executor()
+        try:
+            future = executor.submit(_process_file, db_path, file_id, name, pdf_bytes, syllabus_keywords)
+        except Exception as e:
+            # A broken or shut-down pool refuses new work; the next file gets a fresh one
+            _mark_failed(db_path, file_id, f"{type(e).__name__}: {e}")
+            _discard_executor(executor)
+            continue
+        future.add_done_callback(partial(_on_file_done, db_path, file_id, executor))
+
+
+def _process_file(db_path, file_id, filename, pdf_bytes, syllabus_keywords):
+    """Worker: extract one paper, add it to the question bank and record its outcome in the store"""
+    from exam_extraction import extract_pdf_content
+    from question_bank import add_paper
+
+    with _connect(db_path) as conn:
+        conn.execute("UPDATE job_files SET status = 'running', started = ? WHERE id = ?", (time.time(), file_id))
+    try:
+        pdf_file = BytesIO(pdf_bytes)
+        pdf_file.name = filename
+        # Files already run in parallel, so pages are extracted in-process
+        content = extract_pdf_content(pdf_file, syllabus_keywords, parallel=False)
+        add_paper(content)
+        update = ("UPDATE job_files SET status = 'done', result = ?, finished = ? WHERE id = ?",
+                  (json.dumps(content, ensure_ascii=False), time.time(), file_id))
+    except Exception as e:
+        update = ("UPDATE job_files SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                  (str(e), time.time(), file_id))
+    with _connect(db_path) as conn:
+        conn.execute(*update)
+
+
+def submit_batch(files, syllabus_keywords, db_path=DB_PATH, retry=False):
+    """
+    Queue a batch of (filename, pdf_bytes) pairs and return its job id.
+
+    Submitting the same files with the same syllabus again returns the
+    existing job instead of processing the batch twice. With retry, the
+    failed and interrupted files of that job are queued again.
+    """
+    fingerprint = content_hash([
+        [[name, content_hash(pdf_bytes)] for name, pdf_bytes in files],
+        syllabus_keywords,
+    ])
+    with _connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT id FROM jobs WHERE fingerprint = ? ORDER BY created DESC LIMIT 1", (fingerprint,)
+        ).fetchone()
+        existing = get_job(row['id'], db_path) if row is not None else None
+        if existing is not None and retry:
+            job_id = row['id']
+            positions = [
+                position for position, file in enumerate(existing['files'])
+                if file['status'] in ('failed', 'interrupted')
+            ]
+            # This process now owns the job, so its requeued files are not reported as interrupted
+            conn.execute("UPDATE jobs SET owner_pid = ? WHERE id = ?", (os.getpid(), job_id))
+            file_ids = []
+            for position in positions:
+                file_id = conn.execute(
+                    "SELECT id FROM job_files WHERE job_id = ? AND position = ?", (job_id, position)
+                ).fetchone()['id']
+                conn.execute(
+                    "UPDATE job_files SET status = 'queued', error = NULL, result = NULL, started = NULL, "
+                    "finished = NULL WHERE id = ?",
+                    (file_id,),
+                )
+                file_ids.append(file_id)
+            files = [files[position] for position in positions]
+        elif existing is not None and existing['status'] != 'interrupted':
+            return row['id']
+        else:
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, fingerprint, created, owner_pid) VALUES (?, ?, ?, ?)",
+                (job_id, fingerprint, time.time(), os.getpid()),
+            )
+            file_ids = [
+                conn.execute(
+                    "INSERT INTO job_files (job_id, position, filename, status) VALUES (?, ?, ?, 'queued')",
+                    (job_id, position, name),
+                ).lastrowid
+                for position, (name, _) in enumerate(files)
+            ]
+
+    _submit_files(db_path, file_ids, files, syllabus_keywords)
+    return job_id
+
+
+def get_job(job_id, db_path=DB_PATH):
+    """
+    Progress and per-file results of a job, or None for an unknown id.
+
+    Files still pending from a previous server process can never finish;
+    they are reported as interrupted.
+    """
+    with _connect(db_path) as conn:
+        job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None:
+            return None
+        if job['owner_pid'] != os.getpid():
+            conn.execute(
+                "UPDATE job_files SET status = 'interrupted', error = 'Server restarted before this file was processed' "
+                "WHERE job_id = ? AND status IN (?, ?)",
+                (job_id, *PENDING),
+            )
+        rows = conn.execute("SELECT * FROM job_files WHERE job_id = ? ORDER BY position", (job_id,)).fetchall()
+
+    files = [
+        {
+            'filename': row['filename'],
+            'status': row['status'],
+            'error': row['error'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'seconds': row['finished'] - row['started'] if row['finished'] and row['started'] else None,
+        }
+        for row in rows
+    ]
+    counts = {}
+    for file in files:
+        counts[file['status']] = counts.get(file['status'], 0) + 1
+    pending = sum(counts.get(status, 0) for status in PENDING)
+    if pending:
+        status = 'running'
+    elif counts.get('interrupted'):
+        status = 'interrupted'
+    else:
+        status = 'finished'
+    return {
+        'id': job_id,
+        'status': status,
+        'total': len(files),
+        'completed': len(files) - pending,
+        'counts': counts,
+        'files': files,
+    }
@@ -0,0 +1,209 @@
+"""
+Per-feature explanations of classifier predictions, computed for a whole
+batch at once.
+
+The fitted pipeline's transform steps (ColumnTransformer, feature
+selection, ...) run once. Contributions are then taken over the
+transformed features the classifier actually sees:
+- linear models (logistic regression, SGD) get exact contributions to the
+  decision function: coef * x per feature, plus the intercept as the base;
+  the terms add up to the log-odds (margin for SGD) of the positive class;
+- decision trees and random forests get tree-path contributions: along
+  each row's path, every split is credited with the change in the positive
+  class probability from a node to its child, so the root probability plus
+  the contributions equals predict_proba. A forest's decision_path gives
+  every tree's path in one sparse matrix, and the per-node credits are
+  precomputed as another, so a batch costs one sparse product.
+
+PredictionCache keeps predictions and their explanations per record, so a
+subscriber scored again is answered without running the model.
+"""
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from pdf_cache import content_hash
+
+# Explanations keep this many features per record; requests ask for up to as many
+MAX_TOP_K = 20
+
+
+def transform_steps(pipeline, frame):
+    """Input of the final estimator of a fitted (sklearn or imblearn) pipeline; samplers only act in fit"""
+    features = frame
+    for _, step in pipeline.steps[:-1]:
+        if step is not None and step != "passthrough" and not hasattr(step, "fit_resample"):
+            features = step.transform(features)
+    return features
+
+
+def feature_names(pipeline, n_features):
+    """
+    Names of the transformed features, without the ColumnTransformer's
+    'transformer__' prefixes; positional names when a step cannot name its output
+    """
+    names = None
+    for _, step in pipeline.steps[:-1]:
+        if step is None or step == "passthrough" or hasattr(step, "fit_resample"):
+            continue
+        try:
+            names = step.get_feature_names_out(names)
+        except (AttributeError, TypeError, ValueError):
+            names = None
+            break
+    if names is None or len(names) != n_features:
+        return [f"feature {index}" for index in range(n_features)]
+    return [str(name).split("__", 1)[-1] for name in names]
+
+
+def linear_contributions(classifier, features):
+    """Intercept and coef * x per feature of a binary linear classifier, in decision-function units"""
+    coef = classifier.coef_[0]
+    if sparse.issparse(features):
+        contributions = features.multiply(coef).toarray()
+    else:
+        contributions = np.asarray(features, dtype=float) * coef
+    base = np.full(contributions.shape[0], float(classifier.intercept_[0]))
+    return base, contributions
+
+
+@lru_cache(maxsize=16)
+def _path_credits(classifier):
+    """
+    Root probability of the positive class and the sparse (nodes x features)
+    credit of every node, over all trees of a fitted tree or forest, averaged
+    over the trees
+    """
+    trees = getattr(classifier, "estimators_", [classifier])
+    n_features = classifier.n_features_in_
+    blocks, roots = [], []
+    for tree in trees:
+        structure = tree.tree_
+        values = structure.value[:, 0, :]
+        probability = values[:, 1] / values.sum(axis=1)
+        parents = np.full(structure.node_count, -1)
+        internal = np.flatnonzero(structure.children_left >= 0)
+        parents[structure.children_left[internal]] = internal
+        parents[structure.children_right[internal]] = internal
+        children = np.flatnonzero(parents >= 0)
+        credit = probability[children] - probability[parents[children]]
+        blocks.append(sparse.csr_matrix(
+            (credit / len(trees), (children, structure.feature[parents[children]])),
+            shape=(structure.node_count, n_features)
+        ))
+        roots.append(probability[0])
+    return float(np.mean(roots)), sparse.vstack(blocks, format="csr")
+
+
+def tree_contributions(classifier, features):
+    """Root probability and tree-path contribution per feature of a decision tree or random forest"""
+    root, credits = _path_credits(classifier)
+    paths = classifier.decision_path(features)
+    if isinstance(paths, tuple):  # forests also return the node offsets of each tree
+        paths = paths[0]
+    contributions = (paths @ credits).toarray()
+    return np.full(contributions.shape[0], root), contributions
+
+
+def contributions(pipeline, frame):
+    """
+    Unit, base values, per-feature contributions and feature names of a
+    batch, for the positive class (classes_[1]) of a binary classifier
+    """
+    classifier = pipeline.steps[-1][1]
+    features = transform_steps(pipeline, frame)
+    if hasattr(classifier, "coef_"):
+        unit = "log-odds" if hasattr(classifier, "predict_proba") else "margin"
+        base, values = linear_contributions(classifier, features)
+    elif hasattr(classifier, "tree_") or hasattr(getattr(classifier, "estimators_", [None])[0], "tree_"):
+        unit = "probability"
+        base, values = tree_contributions(classifier, features)
+    else:
+        raise ValueError(f"No explanation method for {type(classifier).__name__}")
+    return unit, base, values, feature_names(pipeline, values.shape[1])
+
+
+def top_features(values, names, k=MAX_TOP_K):
+    """Per row, the k features with the largest absolute contributions, largest first"""
+    k = min(k, values.shape[1])
+    magnitudes = np.abs(values)
+    top = np.argpartition(-magnitudes, k - 1, axis=1)[:, :k] if k < values.shape[1] else np.tile(
+        np.arange(values.shape[1]), (values.shape[0], 1)
+    )
+    rows = np.arange(values.shape[0])[:, None]
+    top = np.take_along_axis(top, np.argsort(-magnitudes[rows, top], axis=1, kind="stable"), axis=1)
+    return [
+        [{"feature": names[column], "contribution": round(float(values[row, column]), 6)} for column in columns]
+        for row, columns in enumerate(top)
+    ]
+
+
+class PredictionCache:
+    """
+    Process-wide LRU cache of scored records, keyed by model and record
+    content. An entry holds the prediction, the class probabilities and,
+    once asked for, the explanation.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def score(self, model_name, pipeline, frame, explain=False):
+        """
+        Cached entries for every row of frame. Rows not cached (or cached
+        without the explanation asked for) are scored together in one pass.
+        """
+        keys = [(model_name, content_hash(record)) for record in frame.to_dict(orient="records")]
+        entries = [self.get(key) for key in keys]
+        missing = [
+            position for position, entry in enumerate(entries)
+            if entry is None or (explain and entry["explanation"] is None)
+        ]
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            batch = frame.iloc[missing]
+            predictions = pipeline.predict(batch)
+            probabilities = pipeline.predict_proba(batch) if hasattr(pipeline, "predict_proba") else None
+            explained = [None] * len(missing)
+            if explain:
+                unit, base, values, names = contributions(pipeline, batch)
+                explained = [
+                    {"unit": unit, "base": round(float(row_base), 6), "top": top}
+                    for row_base, top in zip(base, top_features(values, names))
+                ]
+            for index, position in enumerate(missing):
+                entry = {
+                    "prediction": predictions[index].item(),
+                    "probability": None if probabilities is None else probabilities[index].tolist(),
+                    "explanation": explained[index],
+                }
+                self.put(keys[position], entry)
+                entries[position] = entry
+        return entries
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
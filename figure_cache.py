@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of serialized Plotly figures.
+
+    Entries are keyed by (dataset version, country, series, chart type) and
+    hold the figure JSON, so a chart built for one user is served to every
+    later rerun or session without calling Plotly Express again.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+
+    def get_or_build(self, key, build):
+        """
+        Return the figure dict stored under key, calling build() to create
+        the figure on a miss. build must return a plotly Figure.
+        """
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if figure_json is None:
+            start = time.perf_counter()
+            figure_json = build().to_json()
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.misses += 1
+                self.build_seconds += elapsed
+                self._entries[key] = figure_json
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return json.loads(figure_json)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for the dashboard debug panel"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "avg_build_ms": 1000 * self.build_seconds / self.misses if self.misses else 0.0,
+                "stored_kb": sum(len(v) for v in self._entries.values()) / 1024,
+            }
@@ -0,0 +1,20 @@
+"""
+File helpers shared by the dataset refresh, cache writers and command-line tools.
+"""
+import os
+import tempfile
+
+
+def write_atomic(path, write):
+    """Write through a temporary file in the same folder, then swap it in"""
+    folder = os.path.dirname(path) or '.'
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.tmp_', suffix=os.path.splitext(path)[1])
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
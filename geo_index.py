@@ -0,0 +1,135 @@
+"""
+Spatial index over point locations (device check-ins, communities).
+
+Points are bucketed into a regular latitude/longitude grid and sorted by
+cell, so a bounding-box or radius query only looks at the points of the
+cells it overlaps: one binary search per row of cells, then an exact
+vectorised filter over the candidates. Aggregations (points per cell,
+per-district centroids and spread) are plain numpy/pandas group-bys.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+# 0.1 degree is ~11 km at the equator, about the size of a sub-district
+DEFAULT_CELL_DEGREES = 0.1
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; arguments broadcast like numpy arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """
+    Grid index of points given as latitude and longitude arrays.
+
+    Query results are positions into the arrays the index was built from.
+    Points with a missing coordinate are not indexed. Queries do not wrap
+    around the antimeridian.
+    """
+
+    def __init__(self, lat, lon, cell_degrees=DEFAULT_CELL_DEGREES):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        self.cell_degrees = cell_degrees
+        self._columns = int(np.ceil(360 / cell_degrees)) + 1
+        self.size = len(lat)
+
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        keys = self._cell_keys(lat[valid], lon[valid])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._rows = valid[order]
+        self._lat = lat[self._rows]
+        self._lon = lon[self._rows]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _cell_row(self, lat):
+        return np.floor((np.clip(lat, -90, 90) + 90) / self.cell_degrees).astype(np.int64)
+
+    def _cell_column(self, lon):
+        return np.floor((np.clip(lon, -180, 180) + 180) / self.cell_degrees).astype(np.int64)
+
+    def _cell_keys(self, lat, lon):
+        return self._cell_row(lat) * self._columns + self._cell_column(lon)
+
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """Sorted-order slots of the points in every cell overlapping the box"""
+        rows = np.arange(self._cell_row(lat_min), self._cell_row(lat_max) + 1)
+        # The cells of one grid row are consecutive keys: one range per row
+        starts = np.searchsorted(self._keys, rows * self._columns + self._cell_column(lon_min), side="left")
+        ends = np.searchsorted(self._keys, rows * self._columns + self._cell_column(lon_max), side="right")
+        if not len(rows) or not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts, ends) if end > start])
+
+    def bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """Positions of the points inside a bounding box, in ascending order"""
+        slots = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self._lat[slots], self._lon[slots]
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return np.sort(self._rows[slots[inside]])
+
+    def radius(self, lat, lon, km):
+        """
+        Positions of the points within km of (lat, lon) and their distances,
+        nearest first.
+        """
+        lat_span = km / KM_PER_DEGREE
+        # Longitude degrees shrink towards the poles; widen the box to match
+        lon_span = lat_span / max(np.cos(np.radians(min(abs(lat) + lat_span, 89.9))), 1e-6)
+        slots = self._candidates(lat - lat_span, lat + lat_span, lon - lon_span, lon + lon_span)
+        distances = haversine_km(lat, lon, self._lat[slots], self._lon[slots])
+        inside = distances <= km
+        slots, distances = slots[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return self._rows[slots[order]], distances[order]
+
+    def cell_counts(self, weights=None):
+        """
+        One row per occupied cell: the cell centre, the number of points and,
+        when weights (aligned with the indexed arrays) are given, their sum.
+        """
+        keys, starts, counts = np.unique(self._keys, return_index=True, return_counts=True)
+        cells = pd.DataFrame({
+            "lat": (keys // self._columns + 0.5) * self.cell_degrees - 90,
+            "lon": (keys % self._columns + 0.5) * self.cell_degrees - 180,
+            "points": counts,
+        })
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)[self._rows]
+            cells["weight"] = np.add.reduceat(weights, starts) if len(starts) else []
+        return cells
+
+
+def district_coverage(points, district_column="district"):
+    """
+    Per-district rollup of a frame of points with lat, lon, a district
+    column and an 'active' flag: point counts, active points, the median
+    centre and the distance from it within which 90% of the points lie.
+    """
+    located = points.dropna(subset=["lat", "lon"])
+    by_district = located.groupby(district_column, observed=True)
+    centres = by_district[["lat", "lon"]].median()
+    distances = haversine_km(
+        located["lat"], located["lon"],
+        centres["lat"].reindex(located[district_column]).to_numpy(),
+        centres["lon"].reindex(located[district_column]).to_numpy(),
+    )
+    coverage = points.groupby(district_column, observed=True).agg(
+        points=("active", "size"),
+        active=("active", "sum"),
+    )
+    coverage["located"] = by_district.size().reindex(coverage.index, fill_value=0)
+    coverage = coverage.join(centres)
+    coverage["radius_km"] = pd.Series(distances, index=located.index).groupby(
+        located[district_column], observed=True
+    ).quantile(0.9)
+    return coverage.sort_values("points", ascending=False)
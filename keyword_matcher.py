@@ -0,0 +1,72 @@
+import re
+from collections import Counter
+
+# Keywords and question text are split into the same word tokens, so a
+# keyword only matches whole words: "ias" no longer hits inside "bias".
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    return WORD_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher compiled once per syllabus.
+
+    Every keyword (single word or phrase) becomes a tuple of word tokens in
+    one lookup table. Scoring a question is a single pass over its tokens
+    that probes the table only with the lengths of phrases starting with
+    the current token, so the cost grows with the length of the question,
+    not with the size of the syllabus.
+    """
+
+    def __init__(self, syllabus_keywords):
+        self.areas = list(syllabus_keywords)
+        self._areas_by_phrase = {}
+        for area_index, keywords in enumerate(syllabus_keywords.values()):
+            for keyword in keywords:
+                phrase = tuple(tokenize(keyword))
+                if not phrase:
+                    continue
+                areas = self._areas_by_phrase.setdefault(phrase, [])
+                if area_index not in areas:
+                    areas.append(area_index)
+        self._lengths_by_first = {}
+        for phrase in self._areas_by_phrase:
+            self._lengths_by_first.setdefault(phrase[0], set()).add(len(phrase))
+        self._lengths_by_first = {token: sorted(lengths) for token, lengths in self._lengths_by_first.items()}
+
+    def found_phrases(self, text):
+        """Distinct keyword phrases present in text"""
+        tokens = tokenize(text)
+        table = self._areas_by_phrase
+        lengths_by_first = self._lengths_by_first
+        found = set()
+        for start, token in enumerate(tokens):
+            for length in lengths_by_first.get(token, ()):
+                phrase = tuple(tokens[start:start + length])
+                if len(phrase) < length:
+                    break
+                if phrase in table:
+                    found.add(phrase)
+        return found
+
+    def score(self, text):
+        """Number of distinct keywords of each area found in text (areas with hits only)"""
+        hits = Counter()
+        for phrase in self.found_phrases(text):
+            for area_index in self._areas_by_phrase[phrase]:
+                hits[area_index] += 1
+        return {self.areas[area_index]: count for area_index, count in sorted(hits.items())}
+
+    def best_area(self, text):
+        """
+        (area, hits) of the area with the most keyword hits; ties go to the
+        area listed first. Returns (None, 0) when nothing matches.
+        """
+        best_match, max_hits = None, 0
+        for area, hits in self.score(text).items():
+            if hits > max_hits:
+                best_match, max_hits = area, hits
+        return best_match, max_hits
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException
+from typing import List
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 import joblib
 import uvicorn
@@ -10,6 +11,7 @@ from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.preprocessing import FunctionTransformer
 from log_transformer import LogTransformer  # Import the LogTransformer class
+from explanations import MAX_TOP_K, PredictionCache
 
 # Load the trained model
 logistic_model = joblib.load("./Models/logistic_model.joblib")
@@ -39,7 +41,7 @@ log_transformer = LogTransformer()
 # Numerical transformer with LogTransformer
 numerical_pipeline = Pipeline(steps=[
     ('num_imputer', SimpleImputer(strategy='median')),
-    ('log_transform', FunctionTransformer(log_transformer.transform)),
+    ('log_transform', FunctionTransformer(log_transformer.transform, feature_names_out='one-to-one')),
     ('scaler', StandardScaler())
 ])
 
@@ -58,43 +60,82 @@ preprocessor = ColumnTransformer(
     remainder='drop'
 )
 
-# Combine the preprocessor with the classifier in a pipeline
-pipeline = Pipeline([
-    ('preprocessor', preprocessor),
-    ('classifier', logistic_model)  # or random_forest_model
-])
+# Combine the preprocessor with each classifier in a pipeline (saved models that are
+# already full pipelines are used as they are)
+def make_pipeline(model):
+    if isinstance(model, Pipeline):
+        return model
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('classifier', model)
+    ])
 
-# Prediction endpoint with logistic model
-@app.post("/predict_with_logistic_model")
-def predict_with_logistic_model(data: InputData):
-    # Convert input data to DataFrame
-    input_df = pd.DataFrame([data.model_dump()])
-    
-    # Make predictions
-    prediction = pipeline.predict(input_df)
-    probability = pipeline.predict_proba(input_df)
+pipelines = {
+    "logistic": make_pipeline(logistic_model),
+    "random_forest": make_pipeline(random_forest_model),
+}
+
+# Predictions and explanations of records already scored, per model
+prediction_cache = PredictionCache(max_entries=10000)
+
+def score(model_name, records, explain, top_k):
+    # One DataFrame and one model pass for the whole batch; cached records are skipped
+    input_df = pd.DataFrame([record.model_dump() for record in records])
+    entries = prediction_cache.score(model_name, pipelines[model_name], input_df, explain=explain)
 
     # Prepare response
-    result = "Churn" if prediction[0] == 1 else "No Churn"
-    probability = probability.tolist()
-        
-    return {"prediction": result, "probability": probability}
+    results = []
+    for entry in entries:
+        result = {
+            "prediction": "Churn" if entry["prediction"] == 1 else "No Churn",
+            "probability": entry["probability"]
+        }
+        if explain:
+            explanation = entry["explanation"]
+            result["explanation"] = {**explanation, "top": explanation["top"][:top_k]}
+        results.append(result)
+    return results
 
-# Prediction endpoint with random forest model
+# Prediction endpoint with logistic model; explain=true adds the top_k features
+# behind the prediction (exact contributions to the log-odds of churn)
+@app.post("/predict_with_logistic_model")
+def predict_with_logistic_model(
+    data: InputData,
+    explain: bool = False,
+    top_k: int = Query(5, ge=1, le=MAX_TOP_K)
+):
+    result = score("logistic", [data], explain, top_k)[0]
+    result["probability"] = [result["probability"]]
+    return result
+
+# Prediction endpoint with random forest model; explain=true adds the top_k features
+# behind the prediction (tree-path contributions to the probability of churn)
 @app.post("/predict_with_random_forest_model")
-def predict_with_random_forest_model(data: InputData):
-    # Convert input data to DataFrame
-    input_df = pd.DataFrame([data.model_dump()])
-    
-    # Make predictions
-    prediction = pipeline.predict(input_df)
-    probability = pipeline.predict_proba(input_df)
+def predict_with_random_forest_model(
+    data: InputData,
+    explain: bool = False,
+    top_k: int = Query(5, ge=1, le=MAX_TOP_K)
+):
+    result = score("random_forest", [data], explain, top_k)[0]
+    result["probability"] = [result["probability"]]
+    return result
 
-    # Prepare response
-    result = "Churn" if prediction[0] == 1 else "No Churn"
-    probability = probability.tolist()
-        
-    return {"prediction": result, "probability": probability}
+# Batch prediction endpoints: a list of subscribers scored and explained in one pass
+@app.post("/predict_batch_with_logistic_model")
+def predict_batch_with_logistic_model(
+    data: List[InputData],
+    explain: bool = False,
+    top_k: int = Query(5, ge=1, le=MAX_TOP_K)
+):
+    return {"predictions": score("logistic", data, explain, top_k) if data else []}
+
+@app.post("/predict_batch_with_random_forest_model")
+def predict_batch_with_random_forest_model(
+    data: List[InputData],
+    explain: bool = False,
+    top_k: int = Query(5, ge=1, le=MAX_TOP_K)
+):
+    return {"predictions": score("random_forest", data, explain, top_k) if data else []}
 
 # Run the FastAPI app
 if __name__ == '__main__':
@@ -0,0 +1,265 @@
+"""
+Evaluation of the bank-marketing pipelines from cached scores.
+
+Every pipeline in Notebook/ scores the evaluation file (by default
+Notebook/test_df.csv) once. The score vectors and the true labels are
+cached under ./.cache/evaluation, keyed by the contents of the data file
+and of each pipeline file (plus the manifest of its package, when the
+pipeline is served from one), so a retrained or repackaged pipeline or a
+new data file is re-scored and everything else is reused without loading
+a model. Pipelines are loaded as the API and batch scorer load them,
+through bank_marketing.load_pipeline.
+
+Everything else is computed from those arrays with numpy:
+- threshold_curves sorts the scores once and accumulates the confusion
+  counts at every distinct threshold;
+- metrics at any threshold, ROC and precision-recall curves and the
+  threshold sweeps are lookups into those counts;
+- calibration bins the probabilities with bincount.
+
+Scores are P(yes). Models without predict_proba (the hinge-loss SGD) are
+scored by decision_function passed through the logistic function, so a
+0.5 threshold is their own decision rule; they are left out of
+calibration.
+
+Usage (pre-computes the cache, e.g. where the pipelines can be loaded):
+    python model_evaluation.py [--data ./Notebook/test_df.csv] [--model-dir ./Notebook]
+"""
+import argparse
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from bank_marketing import (
+    FEATURES, MODEL_DIR, TARGET, available_models, csv_separator, encoder_path, fresh_package, load_pipeline,
+    pipeline_path
+)
+from file_utils import write_atomic
+from pdf_cache import content_hash
+
+EVALUATION_DATA = "./Notebook/test_df.csv"
+CACHE_DIR = "./.cache/evaluation"
+CALIBRATION_BINS = 10
+
+
+def file_key(path):
+    """Content hash of a file, shortened"""
+    with open(path, "rb") as file:
+        return content_hash(file.read())[:16]
+
+
+def served_files(model_name, model_dir=MODEL_DIR):
+    """Files a pipeline is served from: its pickle, and its package manifest while the package is current"""
+    package = fresh_package(model_name, model_dir)
+    manifest = [os.path.join(package, "manifest.json")] if package is not None else []
+    return [pipeline_path(model_name, model_dir), *manifest]
+
+
+def evaluation_version(data_path=EVALUATION_DATA, model_dir=MODEL_DIR):
+    """Version tag of the data file and the served pipelines, changes whenever one of them is rewritten"""
+    paths = [data_path, *(path for name in available_models(model_dir) for path in served_files(name, model_dir))]
+    return "|".join(f"{path}:{os.stat(path).st_mtime_ns}-{os.stat(path).st_size}" for path in paths)
+
+
+def _model_scores(pipeline, features, positive):
+    """P(positive) of every row, or the logistic of the decision function; and whether it is a probability"""
+    if hasattr(pipeline, "predict_proba"):
+        return pipeline.predict_proba(features)[:, np.searchsorted(pipeline.classes_, positive)], True
+    margin = pipeline.decision_function(features)
+    if positive != pipeline.classes_[-1]:
+        margin = -margin
+    return 1 / (1 + np.exp(-margin)), False
+
+
+def load_scores(data_path=EVALUATION_DATA, model_dir=MODEL_DIR, cache_dir=CACHE_DIR):
+    """
+    True labels (1 = 'yes') and {model: (scores, is_probability)} of every
+    pipeline, scoring only those not already cached. Pipelines that fail to
+    load or score are returned in errors instead.
+    """
+    folder = os.path.join(cache_dir, file_key(data_path))
+    os.makedirs(folder, exist_ok=True)
+    data = encoder = None
+
+    def read_data():
+        nonlocal data, encoder
+        if data is None:
+            data = pd.read_csv(data_path, sep=csv_separator(data_path))
+            encoder = joblib.load(encoder_path(model_dir))
+        return data, encoder
+
+    labels_path = os.path.join(folder, "labels.npy")
+    if os.path.exists(labels_path):
+        y_true = np.load(labels_path)
+    else:
+        frame, encoder = read_data()
+        y_true = (frame[TARGET].to_numpy() == "yes").astype(np.int8)
+        write_atomic(labels_path, lambda tmp: np.save(tmp, y_true))
+
+    scores, errors = {}, {}
+    for name in available_models(model_dir):
+        key = "-".join(file_key(path) for path in served_files(name, model_dir))
+        cache_path = os.path.join(folder, f"{name}-{key}.npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                scores[name] = (cached["scores"], bool(cached["is_probability"]))
+            continue
+        try:
+            frame, encoder = read_data()
+            pipeline = load_pipeline(name, model_dir)
+            values, is_probability = _model_scores(pipeline, frame[FEATURES], encoder.transform(["yes"])[0])
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            continue
+        write_atomic(cache_path, lambda tmp: np.savez(tmp, scores=values, is_probability=is_probability))
+        scores[name] = (values, is_probability)
+    return y_true, scores, errors
+
+
+def threshold_curves(y_true, scores):
+    """
+    Confusion counts at every distinct score threshold, highest first.
+    Rows scoring at or above a threshold are predicted 'yes'; the first
+    entry (threshold +inf) predicts nothing.
+    """
+    order = np.argsort(-scores, kind="mergesort")
+    ordered, hits = scores[order], y_true[order]
+    ends = np.r_[np.flatnonzero(np.diff(ordered)), len(ordered) - 1]
+    tp = np.r_[0, np.cumsum(hits)[ends]]
+    fp = np.r_[0, ends + 1 - tp[1:]]
+    return {
+        "thresholds": np.r_[np.inf, ordered[ends]],
+        "tp": tp,
+        "fp": fp,
+        "positives": int(hits.sum()),
+        "negatives": int(len(hits) - hits.sum()),
+    }
+
+
+def counts_at(curves, thresholds):
+    """True and false positives at any thresholds, by binary search in the curves"""
+    positions = np.searchsorted(-curves["thresholds"], -np.asarray(thresholds, dtype=float), side="right") - 1
+    return curves["tp"][positions], curves["fp"][positions]
+
+
+def _divide(numerator, denominator):
+    """Elementwise ratio, 0 where the denominator is 0 (as sklearn's zero_division=0)"""
+    denominator = np.asarray(denominator, dtype=float)
+    return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), 0.0)
+
+
+def metrics_from_counts(tp, fp, positives, negatives):
+    """
+    Metrics of confusion counts (arrays broadcast). Precision, Recall and
+    F1_Score are weighted by class support like all_model_tuning_results.csv;
+    the Positive_* columns are for the 'yes' class alone.
+    """
+    tp, fp = np.asarray(tp, dtype=float), np.asarray(fp, dtype=float)
+    fn, tn = positives - tp, negatives - fp
+    total = positives + negatives
+    precision_yes, precision_no = _divide(tp, tp + fp), _divide(tn, tn + fn)
+    recall_yes, recall_no = _divide(tp, positives), _divide(tn, negatives)
+    f1_yes = _divide(2 * precision_yes * recall_yes, precision_yes + recall_yes)
+    f1_no = _divide(2 * precision_no * recall_no, precision_no + recall_no)
+    return pd.DataFrame({
+        "Precision": (positives * precision_yes + negatives * precision_no) / total,
+        "Recall": (positives * recall_yes + negatives * recall_no) / total,
+        "Accuracy": (tp + tn) / total,
+        "F1_Score": (positives * f1_yes + negatives * f1_no) / total,
+        "Positive_Precision": precision_yes,
+        "Positive_Recall": recall_yes,
+        "Positive_F1": f1_yes,
+        "Predicted_Yes": tp + fp,
+    })
+
+
+def roc_curve(curves):
+    """False and true positive rates over all thresholds, and the area under them"""
+    fpr = curves["fp"] / max(curves["negatives"], 1)
+    tpr = curves["tp"] / max(curves["positives"], 1)
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    return fpr, tpr, auc
+
+
+def precision_recall_curve(curves):
+    """'yes' precision and recall over all thresholds, and the average precision"""
+    tp, fp = curves["tp"][1:], curves["fp"][1:]
+    precision = tp / (tp + fp)
+    recall = tp / max(curves["positives"], 1)
+    average_precision = float(np.sum(np.diff(np.r_[0, recall]) * precision))
+    return precision, recall, average_precision
+
+
+def calibration(y_true, probabilities, bins=CALIBRATION_BINS):
+    """Mean predicted probability, observed 'yes' rate and rows per probability bin, and the Brier score"""
+    index = np.minimum((probabilities * bins).astype(int), bins - 1)
+    rows = np.bincount(index, minlength=bins)
+    table = pd.DataFrame({
+        "bin": np.arange(bins),
+        "predicted": _divide(np.bincount(index, weights=probabilities, minlength=bins), rows),
+        "observed": _divide(np.bincount(index, weights=y_true, minlength=bins), rows),
+        "rows": rows,
+    })
+    return table[table["rows"] > 0], float(np.mean((probabilities - y_true) ** 2))
+
+
+def build_evaluation(y_true, scores, sweep=np.linspace(0.01, 0.99, 99)):
+    """
+    Everything the comparison needs, per model: threshold curves, ROC and PR
+    curves with their areas, calibration (probabilities only), the metrics
+    over a threshold sweep and the threshold of best F1 on it.
+    """
+    evaluation = {}
+    for name, (values, is_probability) in scores.items():
+        curves = threshold_curves(y_true, values)
+        swept = metrics_from_counts(*counts_at(curves, sweep), curves["positives"], curves["negatives"])
+        swept.insert(0, "Threshold", sweep)
+        fpr, tpr, auc = roc_curve(curves)
+        precision, recall, average_precision = precision_recall_curve(curves)
+        evaluation[name] = {
+            "curves": curves,
+            "roc": (fpr, tpr),
+            "pr": (precision, recall),
+            "auc": auc,
+            "average_precision": average_precision,
+            "calibration": calibration(y_true, values) if is_probability else None,
+            "sweep": swept,
+            "best_threshold": float(sweep[swept["F1_Score"].to_numpy().argmax()]),
+        }
+    return evaluation
+
+
+def compare_at(evaluation, threshold):
+    """One row of metrics per model at a threshold, from the cached curves"""
+    if not evaluation:
+        return pd.DataFrame()
+    models = list(evaluation.values())
+    counts = np.array([[count[0] for count in counts_at(model["curves"], [threshold])] for model in models])
+    curves = models[0]["curves"]
+    metrics = metrics_from_counts(counts[:, 0], counts[:, 1], curves["positives"], curves["negatives"])
+    metrics.insert(0, "Model Name", list(evaluation))
+    metrics["AUC"] = [model["auc"] for model in models]
+    metrics["Average_Precision"] = [model["average_precision"] for model in models]
+    metrics["Brier"] = [model["calibration"][1] if model["calibration"] is not None else np.nan for model in models]
+    metrics["Best_F1_Threshold"] = [model["best_threshold"] for model in models]
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score the bank-marketing pipelines once and cache the scores")
+    parser.add_argument("--data", default=EVALUATION_DATA, help=f"Labelled CSV (default {EVALUATION_DATA})")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help=f"Folder of the pipelines (default {MODEL_DIR})")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        parser.error(f"data not found: {args.data}")
+
+    y_true, scores, errors = load_scores(args.data, args.model_dir)
+    for name, error in errors.items():
+        print(f"{name}: {error}")
+    print(compare_at(build_evaluation(y_true, scores), 0.5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
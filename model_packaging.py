@@ -0,0 +1,227 @@
+"""
+Packaging of trained pipelines as pickled metadata plus memory-mappable arrays.
+
+A package is a folder next to the pickle it was made from
+(Notebook/<model>_pipeline.pack):
+    model.pkl       the pipeline pickled with every numpy array of at least
+                    MIN_ARRAY_BYTES replaced by a reference
+    arrays/NNN.npy  those arrays as uncompressed .npy files
+    manifest.json   shape, dtype and original dtype of every array, and
+                    the size, mtime and content hash of the source pickle
+
+Loading unpickles the small model.pkl and maps the arrays copy-on-write
+(np.load mmap_mode="c"). Nothing is read until it is used, and processes
+loading the same package share the page cache instead of each holding
+its own deserialised copy. A package is only used while the pickle is
+the one it was made from: same size and mtime, or else same content hash.
+
+float64 arrays are stored as float32 when the packed pipeline still gives
+the same predictions, and scores within SCORE_TOLERANCE, on check data.
+Each array is tried on its own, largest first. Arrays that compiled
+scikit-learn code needs as float64 (tree node values, libsvm support
+vectors) fail that check and are kept as they are. Without check data
+nothing is downcast.
+
+Usage:
+    python model_packaging.py                              # every pipeline in ./Notebook, checked on test_df.csv
+    python model_packaging.py --models SVM KNN --no-downcast
+"""
+import argparse
+import io
+import json
+import os
+import pickle
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from bank_marketing import FEATURES, MODEL_DIR, available_models, csv_separator, package_path, pipeline_path
+from pdf_cache import content_hash
+
+MIN_ARRAY_BYTES = 16 * 1024
+SCORE_TOLERANCE = 1e-4
+CHECK_DATA = "./Notebook/test_df.csv"
+
+MODEL_FILE = "model.pkl"
+MANIFEST_FILE = "manifest.json"
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler that sets large numeric arrays aside and pickles a reference to them"""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = []
+        self._seen = {}
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.nbytes < MIN_ARRAY_BYTES or obj.dtype.hasobject:
+            return None
+        if id(obj) not in self._seen:
+            self._seen[id(obj)] = len(self.arrays)
+            self.arrays.append(obj)
+        return self._seen[id(obj)]
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """Unpickler that resolves array references through a lookup"""
+
+    def __init__(self, file, lookup):
+        super().__init__(file)
+        self._lookup = lookup
+
+    def persistent_load(self, pid):
+        return self._lookup(pid)
+
+
+def split_arrays(model):
+    """Pickled metadata of a model and the large arrays it refers to"""
+    buffer = io.BytesIO()
+    pickler = _ArrayPickler(buffer)
+    pickler.dump(model)
+    return buffer.getvalue(), pickler.arrays
+
+
+def join_arrays(metadata, lookup):
+    """Model from its pickled metadata, with array references resolved by lookup(index)"""
+    return _ArrayUnpickler(io.BytesIO(metadata), lookup).load()
+
+
+def model_outputs(model, frame):
+    """Predictions and scores (probabilities or decision values) of a model on a frame"""
+    scores = model.predict_proba(frame) if hasattr(model, "predict_proba") else model.decision_function(frame)
+    return model.predict(frame), scores
+
+
+def choose_downcasts(metadata, arrays, check_data):
+    """Indices of the float64 arrays that can be stored as float32 without changing the model's outputs"""
+    predictions, scores = model_outputs(join_arrays(metadata, arrays.__getitem__), check_data)
+    candidates = sorted(
+        (index for index, array in enumerate(arrays) if array.dtype == np.float64),
+        key=lambda index: -arrays[index].nbytes
+    )
+    chosen = set()
+    for index in candidates:
+        trial = chosen | {index}
+        try:
+            model = join_arrays(
+                metadata, lambda pid: arrays[pid].astype(np.float32) if pid in trial else arrays[pid]
+            )
+            trial_predictions, trial_scores = model_outputs(model, check_data)
+        except (TypeError, ValueError):
+            continue
+        if np.array_equal(trial_predictions, predictions) and np.allclose(
+            trial_scores, scores, rtol=0, atol=SCORE_TOLERANCE
+        ):
+            chosen = trial
+    return chosen
+
+
+def file_hash(path):
+    """Content hash of a file"""
+    with open(path, "rb") as file:
+        return content_hash(file.read())
+
+
+def source_stamp(path):
+    """Size, mtime and content hash of the pickle a package is made from"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_hash(path)}
+
+
+def package_matches(folder, source):
+    """
+    Whether a package was made from the pickle at source as it is now. The
+    content hash is only computed when the size matches but the mtime does
+    not (a pickle touched, or replaced by a copy keeping its own mtime).
+    """
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE), encoding="utf-8") as file:
+            stamp = json.load(file).get("source")
+        stat = os.stat(source)
+    except (OSError, ValueError):
+        return False
+    if not stamp or stat.st_size != stamp["size"]:
+        return False
+    return stat.st_mtime_ns == stamp["mtime_ns"] or file_hash(source) == stamp["sha256"]
+
+
+def pack_model(model, folder, check_data=None, source=None):
+    """
+    Write a model as a package folder, replacing any previous package;
+    returns the manifest. source is the pickle the model was loaded from;
+    without it the package is never preferred to a pickle.
+    """
+    metadata, arrays = split_arrays(model)
+    downcast = choose_downcasts(metadata, arrays, check_data) if check_data is not None else set()
+    building = f"{folder}.tmp"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(os.path.join(building, "arrays"))
+    manifest = {"source": source_stamp(source) if source is not None else None, "arrays": []}
+    for index, array in enumerate(arrays):
+        stored = array.astype(np.float32) if index in downcast else np.ascontiguousarray(array)
+        np.save(os.path.join(building, "arrays", f"{index:03d}.npy"), stored)
+        manifest["arrays"].append({
+            "shape": list(array.shape), "dtype": stored.dtype.str, "original_dtype": array.dtype.str,
+            "bytes": int(stored.nbytes)
+        })
+    with open(os.path.join(building, MODEL_FILE), "wb") as file:
+        file.write(metadata)
+    manifest["metadata_bytes"] = len(metadata)
+    with open(os.path.join(building, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1)
+
+    # Swap the finished folder in; a reader never sees a half-written package
+    previous = f"{folder}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(folder):
+        os.replace(folder, previous)
+    os.replace(building, folder)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def load_package(folder, mmap_mode="c"):
+    """Model of a package folder with its arrays memory-mapped (mmap_mode=None reads them into memory)"""
+    with open(os.path.join(folder, MODEL_FILE), "rb") as file:
+        metadata = file.read()
+    return join_arrays(
+        metadata, lambda pid: np.load(os.path.join(folder, "arrays", f"{pid:03d}.npy"), mmap_mode=mmap_mode)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Package the bank-marketing pipelines as metadata plus mapped arrays")
+    parser.add_argument("--models", nargs="*", default=None, help="Model families (default: every pipeline found)")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help=f"Folder of the pipelines (default {MODEL_DIR})")
+    parser.add_argument("--check-data", default=CHECK_DATA, help=f"Rows the float32 check runs on (default {CHECK_DATA})")
+    parser.add_argument("--no-downcast", action="store_true", help="Keep every array's dtype")
+    args = parser.parse_args(argv)
+    found = available_models(args.model_dir)
+    models = found if args.models is None else args.models
+    missing = [name for name in models if name not in found]
+    if missing:
+        parser.error(f"no pipeline for: {', '.join(missing)} in {args.model_dir}")
+
+    check_data = None
+    if not args.no_downcast:
+        if not os.path.exists(args.check_data):
+            parser.error(f"check data not found: {args.check_data} (or pass --no-downcast)")
+        check_data = pd.read_csv(args.check_data, sep=csv_separator(args.check_data))[FEATURES]
+    for name in models:
+        start = time.perf_counter()
+        source = pipeline_path(name, args.model_dir)
+        manifest = pack_model(joblib.load(source), package_path(name, args.model_dir), check_data, source)
+        arrays = manifest["arrays"]
+        downcast = sum(array["dtype"] != array["original_dtype"] for array in arrays)
+        print(f"{name:<20} {os.path.getsize(source) / 1024:>8.0f} KB pickle -> "
+              f"{manifest['metadata_bytes'] / 1024:>6.0f} KB metadata + {len(arrays)} arrays "
+              f"({sum(array['bytes'] for array in arrays) / 1024:,.0f} KB, {downcast} as float32) "
+              f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
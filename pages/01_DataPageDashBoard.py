@@ -1,13 +1,5 @@
 import streamlit as st
-import numpy as np
-import pandas as pd
-import apy  # import your dataset loaders from app.py
-
-# Define constants for session keys
-DATA_KEY1 = "data_key1"   # Health, Nutrition & Population
-DATA_KEY2 = "data_key2"   # Population Estimates
-DATA_KEY3 = "data_key3"   # Statistical Performance Indicators
-DATA_KEY4 = "data_key4"   # World Development Indicators
+from dashboard_engine import DATASETS, load_dataset
 
 # Page config
 st.set_page_config(
@@ -16,18 +8,16 @@ st.set_page_config(
     layout='wide'
 )
 
-# Cached loader for all 4 datasets
-@st.cache_resource
+# Loader for every registered dataset (cached in dashboard_engine)
 def load_all_data():
-    try:
-        df1 = apy.load_data()    # Health, Nutrition & Population
-        df2 = apy.load_data2()   # Population Estimates
-        df3 = apy.load_data3()   # Statistical Performance Indicators
-        df4 = apy.load_data4()   # World Development Indicators
-        return df1, df2, df3, df4
-    except FileNotFoundError as e:
-        st.error(f"Error loading dataset: {e}")
-        return None, None, None, None
+    datasets = {}
+    for dataset_key in DATASETS:
+        try:
+            datasets[dataset_key] = load_dataset(dataset_key)
+        except FileNotFoundError as e:
+            st.error(f"Error loading dataset: {e}")
+            datasets[dataset_key] = None
+    return datasets
 
 # Function to display each dataset separately
 def show_dataset(title, df, key_prefix):
@@ -60,23 +50,15 @@ else:
     st.title('Datasets Overview')
 
     # Load all datasets
-    df1, df2, df3, df4 = load_all_data()
+    datasets = load_all_data()
 
-    # Store datasets into session_state with static keys
-    if df1 is not None:
-        st.session_state[DATA_KEY1] = df1
-    if df2 is not None:
-        st.session_state[DATA_KEY2] = df2
-    if df3 is not None:
-        st.session_state[DATA_KEY3] = df3
-    if df4 is not None:
-        st.session_state[DATA_KEY4] = df4
+    # Store datasets into session_state with their registry keys
+    for dataset_key, df in datasets.items():
+        if df is not None:
+            st.session_state[DATASETS[dataset_key]["session_key"]] = df
 
     # Show all datasets with Series Name selection
-    show_dataset("World Development Indicators", df1, "df1")
-    st.divider()
-    show_dataset("Statistic on Non Communicable Disease", df2, "df2")
-    st.divider()
-    show_dataset("Population Segregation", df3, "df3")
-    st.divider()
-    show_dataset("Technology Performance Indicators", df4, "df4")
+    for position, (dataset_key, df) in enumerate(datasets.items()):
+        if position:
+            st.divider()
+        show_dataset(DATASETS[dataset_key]["label"], df, f"df{position + 1}")
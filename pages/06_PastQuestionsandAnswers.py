@@ -1,15 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import streamlit_authenticator as stauth
-import yaml
-from yaml.loader import SafeLoader
-from io import BytesIO
-from PIL import Image
-import plotly.io as pio
-import streamlit as st
-from PyPDF2 import PdfReader
+from functools import partial
 import re
+from keyword_matcher import KeywordMatcher
+from pdf_cache import cached_pdf_text
+from table_export import XLSX_MIME, ColumnWidths, build_csv, build_parquet, build_xlsx, parquet_available, record_rows
 
 
 st.set_page_config(
@@ -25,17 +20,40 @@ st.title("📚 Group Past Questions by Syllabus Topics")
 syllabus_file = st.file_uploader("Upload Syllabus PDF", type=["pdf"])
 past_questions_file = st.file_uploader("Upload Past Questions & Solutions PDF", type=["pdf"])
 
-def extract_text(pdf_file):
-    text = ""
-    reader = PdfReader(pdf_file)
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text
+COLUMNS = ["Topic", "Question_Answer"]
+
+def build_excel(grouped_data, widths):
+    return build_xlsx([("Grouped_QAs", COLUMNS, record_rows(grouped_data, COLUMNS), widths)])
+
+def group_by_topics(topics, qa_pairs, widths=None):
+    """
+    Rows of (topic, Q&A) for every topic found in every Q&A chunk; widths,
+    if given, is updated with every row for the Excel export.
+
+    Topics are matched literally as whole-word phrases (case-insensitive),
+    so regex metacharacters in syllabus lines are harmless. All topics are
+    compiled into one matcher and each chunk is scanned once.
+    """
+    matcher = KeywordMatcher({index: [topic] for index, topic in enumerate(topics)})
+    
+    qas_by_topic = {}
+    for qa_index, qa in enumerate(qa_pairs):
+        for topic_index in matcher.score(qa):
+            qas_by_topic.setdefault(topic_index, []).append(qa_index)
+    
+    grouped_data = []
+    for topic_index, topic in enumerate(topics):
+        for qa_index in qas_by_topic.get(topic_index, []):
+            row = {"Topic": topic, "Question_Answer": qa_pairs[qa_index].strip()}
+            grouped_data.append(row)
+            if widths is not None:
+                widths.update(row)
+    return grouped_data
 
 if syllabus_file and past_questions_file:
     # Extract text
-    syllabus_text = extract_text(syllabus_file)
-    past_qs_text = extract_text(past_questions_file)
+    syllabus_text, _ = cached_pdf_text(syllabus_file)
+    past_qs_text, _ = cached_pdf_text(past_questions_file)
 
     # Parse topics (assuming each topic is on its own line or numbered)
     topics = [line.strip() for line in syllabus_text.splitlines() if line.strip()]
@@ -43,22 +61,25 @@ if syllabus_file and past_questions_file:
     # Split past questions into Q&A pairs (adjust regex for your format)
     qa_pairs = re.split(r"\n?Q\d+[:.)]", past_qs_text, flags=re.IGNORECASE)
     
-    grouped_data = []
-    for topic in topics:
-        related_qas = [qa for qa in qa_pairs if re.search(topic, qa, re.IGNORECASE)]
-        for qa in related_qas:
-            grouped_data.append({"Topic": topic, "Question_Answer": qa.strip()})
+    widths = ColumnWidths()
+    grouped_data = group_by_topics(topics, qa_pairs, widths)
     
     if grouped_data:
         df = pd.DataFrame(grouped_data)
         st.success(f"Found {len(df)} matches!")
         st.dataframe(df, use_container_width=True)
 
-        # Download as Excel
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name="Grouped_QAs")
-        st.download_button("📥 Download as Excel", data=output.getvalue(),
-                           file_name="Grouped_Questions.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        # Download as Excel, CSV or Parquet (each built only when its button is clicked)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button("📥 Download as Excel", data=partial(build_excel, grouped_data, widths),
+                               file_name="Grouped_Questions.xlsx", mime=XLSX_MIME)
+        with col2:
+            st.download_button("📥 Download as CSV", data=partial(build_csv, grouped_data, COLUMNS),
+                               file_name="Grouped_Questions.csv", mime="text/csv")
+        with col3:
+            if parquet_available():
+                st.download_button("📥 Download as Parquet", data=partial(build_parquet, grouped_data, COLUMNS),
+                                   file_name="Grouped_Questions.parquet", mime="application/vnd.apache.parquet")
     else:
         st.warning("No matches found. Try refining topic names or check your PDFs.")
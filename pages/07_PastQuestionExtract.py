@@ -1,149 +1,47 @@
 import streamlit as st
-import PyPDF2
 import pandas as pd
-import re
-from io import BytesIO
-import os
+from functools import partial
+import time
+from exam_extraction import extract_syllabus_keywords, load_syllabus_index
+from exam_jobs import get_job, submit_batch
+from pdf_cache import content_hash
+from table_export import (XLSX_MIME, ColumnWidths, build_csv, build_parquet, build_xlsx,
+                          frame_rows, parquet_available, record_rows)
+
+# Seconds between progress checks while a batch is being processed
+POLL_SECONDS = 1.0
 
 def extract_keywords_from_syllabus_pdf(uploaded_syllabus_pdf):
     """
     Extract syllabus areas and keywords from a PDF syllabus document
     """
     try:
-        # Read PDF content
-        pdf_reader = PyPDF2.PdfReader(uploaded_syllabus_pdf)
-        syllabus_text = ""
-        
-        for page in pdf_reader.pages:
-            syllabus_text += page.extract_text() + "\n"
-        
-        # Extract syllabus areas and their content
-        syllabus_areas = extract_syllabus_areas(syllabus_text)
-        
-        # Generate keywords for each area
-        syllabus_keywords = {}
-        for area_name, area_content in syllabus_areas.items():
-            keywords = generate_keywords_from_content(area_content, area_name)
-            syllabus_keywords[area_name] = keywords
-        
-        return syllabus_keywords, syllabus_text
-        
+        return extract_syllabus_keywords(uploaded_syllabus_pdf)
     except Exception as e:
         st.error(f"Error processing syllabus PDF: {str(e)}")
         return None, None
 
-def extract_syllabus_areas(syllabus_text):
-    """
-    Extract syllabus areas from the syllabus text
-    """
-    syllabus_areas = {}
-    
-    # Common patterns for syllabus structure
-    patterns = [
-        # Pattern for "A) Area Name" format
-        r'([A-Z]\))\s*([^\.\n]+?)\s*(?=[A-Z]\)|\n\n|$)',
-        # Pattern for numbered sections "1. Area Name"
-        r'(\d+\.)\s*([^\.\n]+?)\s*(?=\d+\.|\n\n|$)',
-        # Pattern for bold or heading-like text
-        r'\n\s*([A-Z][A-Za-z\s]{10,50}?)\s*\n',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, syllabus_text, re.MULTILINE | re.DOTALL)
-        if matches:
-            for match in matches:
-                if len(match) >= 2:
-                    area_code = match[0].strip()
-                    area_name = match[1].strip()
-                    # Extract content for this area
-                    area_content = extract_area_content(syllabus_text, area_code, area_name)
-                    syllabus_areas[area_name] = area_content
-            break
-    
-    # If no structured patterns found, try to extract major sections
-    if not syllabus_areas:
-        # Look for lines that seem like section headers
-        lines = syllabus_text.split('\n')
-        current_area = None
-        current_content = []
-        
-        for line in lines:
-            line = line.strip()
-            if len(line) > 5 and (line.isupper() or re.match(r'^[A-Z][A-Za-z\s]{10,}', line)):
-                if current_area and current_content:
-                    syllabus_areas[current_area] = ' '.join(current_content)
-                current_area = line
-                current_content = []
-            elif current_area and line:
-                current_content.append(line)
-        
-        if current_area and current_content:
-            syllabus_areas[current_area] = ' '.join(current_content)
-    
-    return syllabus_areas
+@st.cache_resource(max_entries=4, show_spinner="Building the TF-IDF index...")
+def get_syllabus_index(syllabus_hash, _uploaded_syllabus_pdf):
+    """TF-IDF index of a syllabus, unpickled once per syllabus file instead of on every poll rerun"""
+    return load_syllabus_index(_uploaded_syllabus_pdf)
 
-def extract_area_content(full_text, area_code, area_name):
+def apply_tfidf_mapping(all_data, question_texts, syllabus_index, widths=None):
     """
-    Extract the content for a specific syllabus area
+    Re-map every extracted question with the TF-IDF engine: the full texts
+    of the whole batch are vectorized at once and scored against all areas
+    in one sparse product
     """
-    # Look for content between this area and the next one
-    pattern = rf"{re.escape(area_code)}\s*{re.escape(area_name)}(.*?)(?=(?:[A-Z]\)|\d+\.|\n\n|[A-Z][A-Z\s]{{10,}}|\Z))"
-    match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
-    
-    if match:
-        return match.group(1).strip()
-    else:
-        # Fallback: look for the area name and take next 500 characters
-        pattern = rf"{re.escape(area_name)}(.*?)(?=\n\n|\Z)"
-        match = re.search(pattern, full_text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()[:500]
-    
-    return area_name  # Return area name as fallback content
-
-def generate_keywords_from_content(content, area_name):
-    """
-    Generate relevant keywords from syllabus area content
-    """
-    # Combine area name and content for keyword extraction
-    full_text = f"{area_name} {content}".lower()
-    
-    # Remove common stop words
-    stop_words = {
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 
-        'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 
-        'had', 'having', 'do', 'does', 'did', 'doing', 'will', 'would', 'could', 'should',
-        'may', 'might', 'must', 'can', 'shall'
-    }
-    
-    # Extract meaningful words (3+ characters)
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', full_text)
-    
-    # Filter out stop words and get unique words
-    keywords = [word for word in words if word not in stop_words]
-    
-    # Add common accounting/finance terms that might be relevant
-    accounting_terms = {
-        'financial', 'reporting', 'accounting', 'standards', 'ifrs', 'ias', 'gaap',
-        'consolidated', 'group', 'subsidiary', 'associate', 'joint', 'venture',
-        'financial statements', 'balance sheet', 'income statement', 'cash flow',
-        'ratio analysis', 'performance', 'profitability', 'liquidity', 'gearing',
-        'lease', 'financial instruments', 'hedging', 'derivatives', 'taxation',
-        'ethics', 'governance', 'sustainability', 'environmental', 'social',
-        'audit', 'assurance', 'compliance', 'regulation', 'framework'
-    }
-    
-    # Add relevant accounting terms
-    for term in accounting_terms:
-        if term in full_text:
-            keywords.extend(term.split())
-    
-    # Prioritize longer words and unique terms
-    keywords = list(set(keywords))  # Remove duplicates
-    keywords.sort(key=lambda x: len(x), reverse=True)  # Sort by length
-    
-    # Return top 15-20 most relevant keywords
-    return keywords[:20]
+    assignments = syllabus_index.assign(question_texts)
+    for row, assignment in zip(all_data, assignments):
+        mapping = {
+            'Syllabus Area': assignment['area'] or "General/Unknown",
+            'Mapping Confidence': round(assignment['confidence'], 3),
+            'Top Areas': "; ".join(f"{area} ({score:.2f})" for area, score in assignment['top'])
+        }
+        row.update(mapping)
+        if widths is not None:
+            widths.update(mapping)
 
 def load_syllabus_structure(uploaded_syllabus_file):
     """Load syllabus structure data from Excel file (optional)"""
@@ -154,83 +52,85 @@ def load_syllabus_structure(uploaded_syllabus_file):
         st.error(f"Error loading syllabus structure file: {str(e)}")
         return None
 
-def extract_pdf_content(uploaded_file, syllabus_keywords=None):
+def job_rows(job, widths=None):
     """
-    Extract content from PDF file and structure it with syllabus mapping
+    Table rows for every question of the files a job has finished so far;
+    widths, if given, is updated with every row for the Excel export
     """
-    pdf_content = {
-        'filename': uploaded_file.name,
-        'exams_type': '',
-        'questions': [],
-        'suggested_solutions': [],
-        'mark_allocations': [],
-        'syllabus_areas': []
-    }
-    
-    # Read PDF content
-    pdf_reader = PyPDF2.PdfReader(uploaded_file)
-    full_text = ""
-    
-    for page in pdf_reader.pages:
-        full_text += page.extract_text() + "\n"
-    
-    # Extract exam type
-    exam_type_match = re.search(r'(NOVEMBER|MAY|MARCH|SEPTEMBER)\s+\d{4}\s+(.*?)(?:\n|$)', full_text, re.IGNORECASE)
-    if exam_type_match:
-        pdf_content['exams_type'] = f"{exam_type_match.group(1)} {exam_type_match.group(2)}"
+    all_data = []
+    for file in job['files']:
+        content = file['result']
+        if content is None:
+            continue
+        
+        # Create rows for each question
+        for i in range(len(content['questions'])):
+            row = {
+                'PDF Name': content['filename'],
+                'Exam Type': content['exams_type'],
+                'Question Number': f"Q{i+1}",
+                'Question': content['questions'][i],
+                'Suggested Solution': content['suggested_solutions'][i],
+                'Mark Allocation': content['mark_allocations'][i] or "Not specified",
+                'Syllabus Area': content['syllabus_areas'][i]
+            }
+            all_data.append(row)
+            if widths is not None:
+                widths.update(row)
+    return all_data
+
+def job_question_texts(job):
+    """Full text of every question of the finished files, in the order of job_rows"""
+    return [
+        text
+        for file in job['files'] if file['result'] is not None
+        for text in file['result']['question_texts']
+    ]
+
+def render_job_progress(job, widths=None):
+    """Show batch progress and per-file errors; returns the rows extracted so far"""
+    if job['status'] == 'running':
+        st.progress(job['completed'] / job['total'], text=f"Processed {job['completed']} of {job['total']} file(s)...")
     
-    # Extract questions and solutions
-    questions = re.split(r'QUESTION\s+(ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN)', full_text)
+    for file in job['files']:
+        if file['status'] in ('failed', 'interrupted'):
+            st.error(f"Error processing {file['filename']}: {file['error']}")
     
-    for i in range(1, len(questions), 2):
-        if i < len(questions):
-            question_number = questions[i]
-            question_content = questions[i+1] if i+1 < len(questions) else ""
-            
-            # Split question and solution
-            parts = re.split(r'(SOLUTION|ANSWER|WORKINGS)', question_content, maxsplit=1, flags=re.IGNORECASE)
-            
-            question_text = parts[0] if len(parts) > 0 else ""
-            solution_text = parts[2] if len(parts) > 2 else ""
-            
-            # Extract mark allocation
-            marks_match = re.search(r'\(Total:\s*(\d+)\s*marks\)', question_text)
-            marks = marks_match.group(1) if marks_match else ""
-            
-            # Clean up text
-            question_text = re.sub(r'\s+', ' ', question_text).strip()
-            solution_text = re.sub(r'\s+', ' ', solution_text).strip()
-            
-            # Map to syllabus area
-            syllabus_area = map_question_to_syllabus(question_text, syllabus_keywords) if syllabus_keywords is not None else "Syllabus not loaded"
-            
-            pdf_content['questions'].append(f"QUESTION {question_number}: {question_text[:500]}...")
-            pdf_content['suggested_solutions'].append(solution_text[:500] + "..." if solution_text else "Not available")
-            pdf_content['mark_allocations'].append(marks)
-            pdf_content['syllabus_areas'].append(syllabus_area)
+    with st.expander("Per-file status"):
+        st.dataframe(pd.DataFrame([
+            {
+                'PDF Name': file['filename'],
+                'Status': file['status'],
+                'Seconds': round(file['seconds'], 2) if file['seconds'] is not None else None
+            }
+            for file in job['files']
+        ]))
     
-    return pdf_content
+    return job_rows(job, widths)
 
-def map_question_to_syllabus(question_text, syllabus_keywords):
+def build_excel_export(all_data, widths, syllabus_analysis, syllabus_keywords):
     """
-    Map question content to syllabus areas based on extracted keywords from PDF
+    Build the Excel export; called only when the download button is clicked.
+    Rows are streamed from the extracted records and column widths come from
+    the lengths recorded while they were extracted.
     """
-    if not syllabus_keywords:
-        return "Syllabus not loaded"
+    columns = list(all_data[0])
+    sheets = [('Extracted_Questions', columns, record_rows(all_data, columns), widths)]
     
-    question_text_lower = question_text.lower()
+    # Syllabus analysis sheet
+    if not syllabus_analysis.empty:
+        analysis = syllabus_analysis.reset_index()
+        sheets.append(('Syllabus_Analysis', list(analysis.columns), frame_rows(analysis), None))
     
-    # Find the best matching syllabus area
-    best_match = "Unknown Syllabus Area"
-    max_keyword_count = 0
+    # Syllabus keywords reference sheet
+    if syllabus_keywords:
+        syllabus_ref_rows = (
+            [area, ', '.join(keywords), len(keywords)]
+            for area, keywords in syllabus_keywords.items()
+        )
+        sheets.append(('Syllabus_Keywords', ['Syllabus Area', 'Keywords', 'Keyword Count'], syllabus_ref_rows, None))
     
-    for area, keywords in syllabus_keywords.items():
-        keyword_count = sum(1 for keyword in keywords if keyword in question_text_lower)
-        if keyword_count > max_keyword_count:
-            max_keyword_count = keyword_count
-            best_match = area
-    
-    return best_match if max_keyword_count > 0 else "General/Unknown"
+    return build_xlsx(sheets)
 
 def main():
     st.title("📊 PDF Exam Paper Extractor with Dynamic Syllabus Mapping")
@@ -266,6 +166,22 @@ def main():
         else:
             st.sidebar.error("Could not extract syllabus areas from the PDF.")
     
+    # Mapping engine
+    mapping_engine = st.sidebar.radio(
+        "🧭 Syllabus Mapping Engine",
+        ["Keyword matching", "TF-IDF similarity"],
+        help="TF-IDF compares each question with the full text of every syllabus area and reports a confidence"
+    )
+    
+    syllabus_index = None
+    if mapping_engine == "TF-IDF similarity" and uploaded_syllabus_pdf and syllabus_keywords:
+        try:
+            syllabus_index = get_syllabus_index(
+                content_hash(uploaded_syllabus_pdf.getvalue()), uploaded_syllabus_pdf
+            )
+        except Exception as e:
+            st.sidebar.error(f"Error building the TF-IDF index: {str(e)}")
+    
     # Optional: Syllabus structure upload (Excel with weights)
     st.sidebar.header("📊 Optional: Syllabus Structure")
     uploaded_syllabus_structure = st.sidebar.file_uploader(
@@ -290,6 +206,7 @@ def main():
         help="Upload one or more PDF exam papers"
     )
     
+    job_id = st.query_params.get("job")
     if uploaded_files:
         if syllabus_keywords is None:
             st.warning("⚠️ No syllabus PDF loaded. Please upload a syllabus PDF document above.")
@@ -297,28 +214,43 @@ def main():
         
         st.success(f"Uploaded {len(uploaded_files)} file(s)")
         
-        all_data = []
+        # Hand the batch to the background workers once per upload set; polling
+        # reruns reuse the job id instead of re-reading and re-hashing every file
+        upload_key = (
+            uploaded_syllabus_pdf.file_id,
+            tuple((f.file_id, f.name, f.size) for f in uploaded_files)
+        )
+        if st.session_state.get("exam_upload_key") != upload_key:
+            st.session_state["exam_job_id"] = submit_batch(
+                [(f.name, f.getvalue()) for f in uploaded_files], syllabus_keywords
+            )
+            st.session_state["exam_upload_key"] = upload_key
+        job_id = st.session_state["exam_job_id"]
+        st.query_params["job"] = job_id
+    
+    job = get_job(job_id) if job_id else None
+    if job is not None:
+        widths = ColumnWidths()
+        all_data = render_job_progress(job, widths)
         
-        for uploaded_file in uploaded_files:
-            with st.spinner(f"Processing {uploaded_file.name}..."):
-                try:
-                    content = extract_pdf_content(uploaded_file, syllabus_keywords)
-                    
-                    # Create rows for each question
-                    for i in range(len(content['questions'])):
-                        row = {
-                            'PDF Name': content['filename'],
-                            'Exam Type': content['exams_type'],
-                            'Question Number': f"Q{i+1}",
-                            'Question': content['questions'][i],
-                            'Suggested Solution': content['suggested_solutions'][i],
-                            'Mark Allocation': content['mark_allocations'][i] or "Not specified",
-                            'Syllabus Area': content['syllabus_areas'][i]
-                        }
-                        all_data.append(row)
-                        
-                except Exception as e:
-                    st.error(f"Error processing {uploaded_file.name}: {str(e)}")
+        retryable = [file for file in job['files'] if file['status'] in ('failed', 'interrupted')]
+        if retryable and job['status'] != 'running':
+            if not uploaded_files:
+                st.info("Upload the same files again to retry the ones that failed.")
+            elif st.button(f"🔁 Retry {len(retryable)} failed file(s)"):
+                submit_batch([(f.name, f.getvalue()) for f in uploaded_files], syllabus_keywords, retry=True)
+                st.rerun()
+        
+        if job['status'] == 'running':
+            if all_data:
+                st.subheader("📋 Extracted Data So Far")
+                st.dataframe(pd.DataFrame(all_data))
+            # Poll the job store until every file has finished
+            time.sleep(POLL_SECONDS)
+            st.rerun()
+        
+        if all_data and syllabus_index is not None:
+            apply_tfidf_mapping(all_data, job_question_texts(job), syllabus_index, widths)
         
         if all_data:
             # Create DataFrame
@@ -357,55 +289,43 @@ def main():
                     st.bar_chart(syllabus_analysis['Question Count'])
                     st.caption("Question Count by Syllabus Area")
             
-            # Export to Excel
-            st.subheader("📥 Export to Excel")
-            
-            # Create Excel file with multiple sheets
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Main data sheet
-                df.to_excel(writer, sheet_name='Extracted_Questions', index=False)
-                
-                # Syllabus analysis sheet
-                if not syllabus_analysis.empty:
-                    syllabus_analysis.to_excel(writer, sheet_name='Syllabus_Analysis')
-                
-                # Syllabus keywords reference sheet
-                if syllabus_keywords:
-                    syllabus_ref_data = []
-                    for area, keywords in syllabus_keywords.items():
-                        syllabus_ref_data.append({
-                            'Syllabus Area': area,
-                            'Keywords': ', '.join(keywords),
-                            'Keyword Count': len(keywords)
-                        })
-                    syllabus_ref_df = pd.DataFrame(syllabus_ref_data)
-                    syllabus_ref_df.to_excel(writer, sheet_name='Syllabus_Keywords', index=False)
-                
-                # Auto-adjust column widths
-                for sheet_name in writer.sheets:
-                    worksheet = writer.sheets[sheet_name]
-                    if sheet_name == 'Extracted_Questions':
-                        for idx, col in enumerate(df.columns):
-                            max_len = max(df[col].astype(str).str.len().max(), len(col)) + 2
-                            worksheet.set_column(idx, idx, min(max_len, 50))
+            # Export to Excel, or CSV/Parquet for bulk downstream use
+            st.subheader("📥 Export")
+            columns = list(all_data[0])
             
-            output.seek(0)
+            # Download buttons (each file is built only when clicked)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.download_button(
+                    label="📥 Download Excel File",
+                    data=partial(build_excel_export, all_data, widths, syllabus_analysis, syllabus_keywords),
+                    file_name="extracted_questions_with_syllabus.xlsx",
+                    mime=XLSX_MIME
+                )
+            with col2:
+                st.download_button(
+                    label="📥 Download CSV",
+                    data=partial(build_csv, all_data, columns),
+                    file_name="extracted_questions_with_syllabus.csv",
+                    mime="text/csv"
+                )
+            with col3:
+                if parquet_available():
+                    st.download_button(
+                        label="📥 Download Parquet",
+                        data=partial(build_parquet, all_data, columns),
+                        file_name="extracted_questions_with_syllabus.parquet",
+                        mime="application/vnd.apache.parquet"
+                    )
             
-            # Download button
-            st.download_button(
-                label="📥 Download Excel File",
-                data=output,
-                file_name="extracted_questions_with_syllabus.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            st.caption("Every extracted question is also saved to the Question Bank page for later search.")
             
             # Statistics
             st.subheader("📊 Extraction Statistics")
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total PDFs", len(uploaded_files))
+                st.metric("Total PDFs", job['total'])
             with col2:
                 st.metric("Total Questions", len(all_data))
             with col3:
@@ -416,9 +336,10 @@ def main():
                 st.metric("Syllabus Areas Covered", unique_syllabus_areas)
             
             # Syllabus extraction details
-            st.subheader("🔍 Syllabus Extraction Details")
-            st.info(f"✅ Successfully extracted {len(syllabus_keywords)} syllabus areas from the PDF document")
-            st.write("The system automatically generated keywords from each syllabus area's content for intelligent question mapping.")
+            if syllabus_keywords:
+                st.subheader("🔍 Syllabus Extraction Details")
+                st.info(f"✅ Successfully extracted {len(syllabus_keywords)} syllabus areas from the PDF document")
+                st.write("The system automatically generated keywords from each syllabus area's content for intelligent question mapping.")
             
         else:
             st.warning("No questions were extracted from the uploaded files.")
@@ -1,9 +1,47 @@
 import streamlit as st
-import PyPDF2
 import pandas as pd
 import re
-from io import BytesIO
+from functools import partial
 import os
+from keyword_matcher import KeywordMatcher
+from pdf_cache import cached_pdf_text
+from question_segmenter import iter_question_spans, span_text
+from table_export import (XLSX_MIME, ColumnWidths, build_csv, build_parquet, build_xlsx,
+                          frame_rows, parquet_available, record_rows)
+
+# Define keywords for each syllabus area
+SYLLABUS_KEYWORDS = {
+    'Application of International Financial Reporting Standards': [
+        'ifrs', 'ias', 'international financial reporting', 'accounting standard',
+        'financial reporting', 'consolidated', 'group', 'subsidiary', 'associate',
+        'joint venture', 'business combination', 'goodwill', 'fair value',
+        'impairment', 'revenue recognition', 'lease', 'financial instrument',
+        'eps', 'earnings per share', 'deferred tax', 'provision'
+    ],
+    'Preparation of financial statements for a group': [
+        'consolidated', 'group', 'subsidiary', 'parent', 'nci', 'non-controlling',
+        'goodwill', 'elimination', 'intercompany', 'acquisition', 'disposal',
+        'consolidation adjustment', 'group structure'
+    ],
+    'Evaluate entity position, performance and prospects using a range of financial and other data': [
+        'ratio', 'analysis', 'performance', 'profitability', 'liquidity', 'gearing',
+        'efficiency', 'position', 'prospects', 'financial health', 'evaluation',
+        'comparative analysis', 'investment decision', 'report', 'recommendation'
+    ],
+    'Specialized transactions': [
+        'lease', 'financial instrument', 'hedge', 'foreign currency', 'derivative',
+        'share-based payment', 'pension', 'insurance', 'extractive industry',
+        'agriculture', 'service concession', 'discontinued operation'
+    ],
+    'Environmental, social and governance issues, sustainability reporting, contemporary issues and ethics': [
+        'ethics', 'ethical', 'governance', 'sustainability', 'environmental',
+        'social', 'esg', 'corporate governance', 'ethical issue', 'director',
+        'proposal', 'conflict', 'transparency', 'accountability'
+    ]
+}
+
+# Compiled once; matches whole words and phrases only
+SYLLABUS_MATCHER = KeywordMatcher(SYLLABUS_KEYWORDS)
 
 def load_syllabus(uploaded_syllabus_file):
     """Load syllabus data from Excel file"""
@@ -28,46 +66,25 @@ def extract_pdf_content(uploaded_file, syllabus_df=None):
     }
     
     # Read PDF content
-    pdf_reader = PyPDF2.PdfReader(uploaded_file)
-    full_text = ""
-    
-    for page in pdf_reader.pages:
-        full_text += page.extract_text() + "\n"
+    full_text, _ = cached_pdf_text(uploaded_file)
     
     # Extract exam type
     exam_type_match = re.search(r'(NOVEMBER|MAY|MARCH|SEPTEMBER)\s+\d{4}\s+(.*?)(?:\n|$)', full_text, re.IGNORECASE)
     if exam_type_match:
         pdf_content['exams_type'] = f"{exam_type_match.group(1)} {exam_type_match.group(2)}"
     
-    # Extract questions and solutions
-    questions = re.split(r'QUESTION\s+(ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN)', full_text)
-    
-    for i in range(1, len(questions), 2):
-        if i < len(questions):
-            question_number = questions[i]
-            question_content = questions[i+1] if i+1 < len(questions) else ""
-            
-            # Split question and solution
-            parts = re.split(r'(SOLUTION|ANSWER|WORKINGS)', question_content, maxsplit=1, flags=re.IGNORECASE)
-            
-            question_text = parts[0] if len(parts) > 0 else ""
-            solution_text = parts[2] if len(parts) > 2 else ""
-            
-            # Extract mark allocation
-            marks_match = re.search(r'\(Total:\s*(\d+)\s*marks\)', question_text)
-            marks = marks_match.group(1) if marks_match else ""
-            
-            # Clean up text
-            question_text = re.sub(r'\s+', ' ', question_text).strip()
-            solution_text = re.sub(r'\s+', ' ', solution_text).strip()
-            
-            # Map to syllabus area
-            syllabus_area = map_question_to_syllabus(question_text, syllabus_df) if syllabus_df is not None else "Syllabus not loaded"
-            
-            pdf_content['questions'].append(f"QUESTION {question_number}: {question_text[:500]}...")
-            pdf_content['suggested_solutions'].append(solution_text[:500] + "..." if solution_text else "Not available")
-            pdf_content['mark_allocations'].append(marks)
-            pdf_content['syllabus_areas'].append(syllabus_area)
+    # Segment questions, solutions and marks in one pass
+    for span in iter_question_spans(full_text):
+        question_text = full_text[span.question[0]:span.question[1]]
+        solution_preview = span_text(full_text, span.solution, 500)
+        
+        # Map to syllabus area
+        syllabus_area = map_question_to_syllabus(question_text, syllabus_df) if syllabus_df is not None else "Syllabus not loaded"
+        
+        pdf_content['questions'].append(f"QUESTION {span.number}: {span_text(full_text, span.question, 500)}...")
+        pdf_content['suggested_solutions'].append(solution_preview + "..." if solution_preview else "Not available")
+        pdf_content['mark_allocations'].append(span.marks)
+        pdf_content['syllabus_areas'].append(syllabus_area)
     
     return pdf_content
 
@@ -75,50 +92,27 @@ def map_question_to_syllabus(question_text, syllabus_df):
     """
     Map question content to syllabus areas based on keywords
     """
-    question_text_lower = question_text.lower()
-    
-    # Define keywords for each syllabus area
-    syllabus_keywords = {
-        'Application of International Financial Reporting Standards': [
-            'ifrs', 'ias', 'international financial reporting', 'accounting standard',
-            'financial reporting', 'consolidated', 'group', 'subsidiary', 'associate',
-            'joint venture', 'business combination', 'goodwill', 'fair value',
-            'impairment', 'revenue recognition', 'lease', 'financial instrument',
-            'eps', 'earnings per share', 'deferred tax', 'provision'
-        ],
-        'Preparation of financial statements for a group': [
-            'consolidated', 'group', 'subsidiary', 'parent', 'nci', 'non-controlling',
-            'goodwill', 'elimination', 'intercompany', 'acquisition', 'disposal',
-            'consolidation adjustment', 'group structure'
-        ],
-        'Evaluate entity position, performance and prospects using a range of financial and other data': [
-            'ratio', 'analysis', 'performance', 'profitability', 'liquidity', 'gearing',
-            'efficiency', 'position', 'prospects', 'financial health', 'evaluation',
-            'comparative analysis', 'investment decision', 'report', 'recommendation'
-        ],
-        'Specialized transactions': [
-            'lease', 'financial instrument', 'hedge', 'foreign currency', 'derivative',
-            'share-based payment', 'pension', 'insurance', 'extractive industry',
-            'agriculture', 'service concession', 'discontinued operation'
-        ],
-        'Environmental, social and governance issues, sustainability reporting, contemporary issues and ethics': [
-            'ethics', 'ethical', 'governance', 'sustainability', 'environmental',
-            'social', 'esg', 'corporate governance', 'ethical issue', 'director',
-            'proposal', 'conflict', 'transparency', 'accountability'
-        ]
-    }
+    # Find the best matching syllabus area in one pass over the question
+    best_match, max_keyword_count = SYLLABUS_MATCHER.best_area(question_text)
     
-    # Find the best matching syllabus area
-    best_match = "Unknown Syllabus Area"
-    max_keyword_count = 0
+    return best_match if max_keyword_count > 0 else "General/Unknown"
+
+def build_excel_export(all_data, widths, syllabus_df=None, syllabus_analysis=None):
+    """
+    Build the Excel export; called only when the download button is clicked.
+    Rows are streamed from the extracted records and column widths come from
+    the lengths recorded while they were extracted.
+    """
+    columns = list(all_data[0])
+    sheets = [('Extracted_Questions', columns, record_rows(all_data, columns), widths)]
     
-    for area, keywords in syllabus_keywords.items():
-        keyword_count = sum(1 for keyword in keywords if keyword in question_text_lower)
-        if keyword_count > max_keyword_count:
-            max_keyword_count = keyword_count
-            best_match = area
+    # Syllabus analysis sheet
+    if syllabus_df is not None:
+        analysis = syllabus_analysis.reset_index()
+        sheets.append(('Syllabus_Analysis', list(analysis.columns), frame_rows(analysis), None))
+        sheets.append(('Syllabus_Reference', [str(column) for column in syllabus_df.columns], frame_rows(syllabus_df), None))
     
-    return best_match if max_keyword_count > 0 else "General/Unknown"
+    return build_xlsx(sheets)
 
 def main():
     st.title("📊 PDF Exam Paper Extractor with Syllabus Mapping")
@@ -153,6 +147,8 @@ def main():
         st.success(f"Uploaded {len(uploaded_files)} file(s)")
         
         all_data = []
+        widths = ColumnWidths()
+        syllabus_analysis = None
         
         for uploaded_file in uploaded_files:
             with st.spinner(f"Processing {uploaded_file.name}..."):
@@ -171,6 +167,7 @@ def main():
                             'Syllabus Area': content['syllabus_areas'][i]
                         }
                         all_data.append(row)
+                        widths.update(row)
                         
                 except Exception as e:
                     st.error(f"Error processing {uploaded_file.name}: {str(e)}")
@@ -210,40 +207,34 @@ def main():
                     st.bar_chart(syllabus_analysis['Question Count'])
                     st.caption("Question Count by Syllabus Area")
             
-            # Export to Excel
-            st.subheader("📥 Export to Excel")
+            # Export to Excel, or CSV/Parquet for bulk downstream use
+            st.subheader("📥 Export")
+            columns = list(all_data[0])
             
-            # Create Excel file with multiple sheets
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                # Main data sheet
-                df.to_excel(writer, sheet_name='Extracted_Questions', index=False)
-                
-                # Syllabus analysis sheet
-                if syllabus_df is not None:
-                    syllabus_analysis.to_excel(writer, sheet_name='Syllabus_Analysis')
-                    syllabus_df.to_excel(writer, sheet_name='Syllabus_Reference', index=False)
-                
-                # Auto-adjust column widths for all sheets
-                for sheet_name in writer.sheets:
-                    worksheet = writer.sheets[sheet_name]
-                    for idx, col in enumerate(df.columns if sheet_name == 'Extracted_Questions' else syllabus_analysis.columns):
-                        max_len = max(
-                            df[col].astype(str).str.len().max() if sheet_name == 'Extracted_Questions' 
-                            else syllabus_analysis[col].astype(str).str.len().max(), 
-                            len(col)
-                        ) + 2
-                        worksheet.set_column(idx, idx, min(max_len, 50))
-            
-            output.seek(0)
-            
-            # Download button
-            st.download_button(
-                label="📥 Download Excel File",
-                data=output,
-                file_name="extracted_questions_with_syllabus.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            # Download buttons (each file is built only when clicked)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.download_button(
+                    label="📥 Download Excel File",
+                    data=partial(build_excel_export, all_data, widths, syllabus_df, syllabus_analysis),
+                    file_name="extracted_questions_with_syllabus.xlsx",
+                    mime=XLSX_MIME
+                )
+            with col2:
+                st.download_button(
+                    label="📥 Download CSV",
+                    data=partial(build_csv, all_data, columns),
+                    file_name="extracted_questions_with_syllabus.csv",
+                    mime="text/csv"
+                )
+            with col3:
+                if parquet_available():
+                    st.download_button(
+                        label="📥 Download Parquet",
+                        data=partial(build_parquet, all_data, columns),
+                        file_name="extracted_questions_with_syllabus.parquet",
+                        mime="application/vnd.apache.parquet"
+                    )
             
             # Statistics
             st.subheader("📊 Extraction Statistics")
@@ -0,0 +1,110 @@
+import streamlit as st
+import pandas as pd
+from functools import partial
+from question_bank import bank_summary, facet_counts, search
+from table_export import build_csv
+
+# Questions shown per results page
+PAGE_SIZE = 50
+
+RESULT_COLUMNS = {
+    'sitting': 'Sitting',
+    'syllabus_area': 'Syllabus Area',
+    'marks': 'Marks',
+    'snippet': 'Match',
+    'papers': 'Papers',
+    'filename': 'First Seen In',
+}
+
+def facet_filter(label, values, counts, key):
+    """Sidebar multiselect over every value of a facet, labelled with its current match count"""
+    return st.sidebar.multiselect(
+        label,
+        options=values,
+        format_func=lambda value: f"{value or 'Unknown'} ({counts.get(value, 0)})",
+        key=key
+    )
+
+def escape_markdown(text):
+    """Keep "$" amounts from being rendered as LaTeX"""
+    return text.replace('$', '\\$')
+
+def build_results_csv(text, sittings, areas, marks_range):
+    """Every matching question with full texts; built only when the download button is clicked"""
+    rows, _ = search(text, sittings, areas, marks_range, limit=None)
+    columns = ['sitting', 'exam_type', 'syllabus_area', 'marks', 'question_number', 'filename', 'question', 'solution']
+    return build_csv(rows, columns)
+
+def main():
+    st.title("🗃️ Question Bank")
+    st.write("Search every question extracted from the exam papers processed so far")
+
+    summary = bank_summary()
+    if not summary['questions']:
+        st.info("The question bank is empty. Process exam papers on the PDF Exam Paper Extractor page to fill it.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Questions", summary['questions'])
+    with col2:
+        st.metric("Papers", summary['papers'])
+    with col3:
+        st.metric("Sittings", len([value for value in summary['values']['sitting'] if value]))
+
+    text = st.text_input("🔍 Search questions and solutions", placeholder="e.g. deferred tax on leases")
+
+    # Facet filters; counts reflect the search text and the other filters
+    st.sidebar.header("🔎 Filters")
+    low, high = summary['marks']
+    marks_range = None
+    if low is not None and low < high:
+        selected = st.sidebar.slider("Marks", low, high, (low, high))
+        if selected != (low, high):
+            marks_range = selected
+
+    counts = facet_counts(
+        text,
+        st.session_state.get('bank_sittings', []),
+        st.session_state.get('bank_areas', []),
+        marks_range
+    )
+    sittings = facet_filter("Exam Sitting", summary['values']['sitting'], counts['sitting'], 'bank_sittings')
+    areas = facet_filter("Syllabus Area", summary['values']['syllabus_area'], counts['syllabus_area'], 'bank_areas')
+
+    rows, total = search(text, sittings, areas, marks_range, limit=PAGE_SIZE, offset=0)
+    pages = max(1, -(-total // PAGE_SIZE))
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+        if page > 1:
+            rows, total = search(text, sittings, areas, marks_range, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE)
+
+    st.subheader(f"📋 {total} matching question(s)")
+    if not rows:
+        st.warning("No questions match. Try fewer words or clear some filters.")
+        return
+
+    st.dataframe(
+        pd.DataFrame(rows)[list(RESULT_COLUMNS)].rename(columns=RESULT_COLUMNS),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.download_button(
+        label="📥 Download All Matches (CSV)",
+        data=partial(build_results_csv, text, sittings, areas, marks_range),
+        file_name="question_bank_search.csv",
+        mime="text/csv"
+    )
+
+    # Full text of the questions on this page
+    st.subheader("📝 Questions")
+    for row in rows:
+        marks = f"{row['marks']} marks" if row['marks'] is not None else "marks not specified"
+        with st.expander(f"{row['sitting'] or 'Unknown sitting'} · {row['syllabus_area']} · {marks}"):
+            st.markdown(f"**Question**\n\n{escape_markdown(row['question'])}")
+            st.markdown(f"**Suggested solution**\n\n{escape_markdown(row['solution'] or 'Not available')}")
+            st.caption(f"{row['question_number']} of {row['filename']}; found in {row['papers']} paper(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from device_fleet import (
+    DEVICE_LOGS, STALENESS_LABELS, assign_districts, build_fleet_summary, load_device_log, load_group_districts,
+    log_version, unmatched_groups
+)
+from geo_index import GridIndex, district_coverage
+
+st.set_page_config(
+    page_title='Device Fleet',
+    page_icon='📱',
+    layout='wide'
+)
+
+STALENESS_COLORS = dict(zip(STALENESS_LABELS, ["#1a9850", "#91cf60", "#fee08b", "#fc8d59", "#d73027", "#999999"]))
+
+@st.cache_resource(max_entries=4, show_spinner="Loading device log...")
+def get_device_log(log_key, version):
+    return load_device_log(log_key)
+
+@st.cache_resource(max_entries=8, show_spinner="Computing fleet rollups...")
+def get_fleet_summary(log_key, version, as_of):
+    """Rollups of one log version; as_of is None or a timestamp rounded to the hour, so reruns reuse them"""
+    return build_fleet_summary(get_device_log(log_key, version), as_of)
+
+@st.cache_resource(max_entries=4, show_spinner="Indexing device locations...")
+def get_coverage_index(log_key, version):
+    """
+    Grid index and districts of the devices of one log version. Device
+    rows do not depend on the staleness reference, so every summary of the
+    version shares them.
+    """
+    devices = get_fleet_summary(log_key, version, None)["devices"]
+    districts = assign_districts(devices["group"], load_group_districts(log_key)).to_numpy()
+    return GridIndex(devices["lat"].to_numpy(), devices["lon"].to_numpy()), districts
+
+def render_coverage(log_key, version, devices, group_label):
+    """Map of device coverage, the district rollup and a radius search around a district or point"""
+    st.subheader("🗺️ Coverage")
+    index, districts = get_coverage_index(log_key, version)
+    active = devices["days_since"].to_numpy() <= 30
+
+    # One bubble per grid cell keeps the map light however many devices there are
+    cells = index.cell_counts(active)
+    cells["size"] = np.sqrt(cells["points"]) * 1500
+    cells["color"] = np.where(cells["weight"] > 0, "#1a9850", "#d73027")
+    st.map(cells, latitude="lat", longitude="lon", size="size", color="color")
+    st.caption(
+        f"{len(index)} of {index.size} devices have a location. Bubbles are {index.cell_degrees}° cells sized by "
+        "device count; green cells have a device seen this month."
+    )
+
+    coverage = district_coverage(devices.assign(district=districts, active=active))
+    st.dataframe(
+        coverage.reset_index(),
+        column_config={
+            "district": "District",
+            "points": "Devices",
+            "active": "Seen this month",
+            "located": "With location",
+            "lat": st.column_config.NumberColumn("Centre lat", format="%.4f"),
+            "lon": st.column_config.NumberColumn("Centre lon", format="%.4f"),
+            "radius_km": st.column_config.NumberColumn("90% within (km)", format="%.1f"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # Groups missing from the district listing end up in 'Unassigned'; say how many and which
+    unmatched = unmatched_groups(devices["group"], districts)
+    if len(unmatched):
+        st.warning(
+            f"{unmatched.sum():,} of {len(devices):,} devices ({unmatched.sum() / len(devices):.0%}) are in a "
+            f"{group_label.lower()} the district listing ({DEVICE_LOGS[log_key]['districts']['path']}) does not "
+            f"name, across {len(unmatched):,} {group_label.lower()} name(s); they are counted as Unassigned."
+        )
+        with st.expander(f"Unmatched {group_label.lower()} names"):
+            st.dataframe(
+                unmatched.head(50).rename_axis(group_label).reset_index(name="Devices"),
+                use_container_width=True,
+                hide_index=True
+            )
+
+    centres = coverage.dropna(subset=["lat", "lon"]).drop(index="Unassigned", errors="ignore")
+    col1, col2 = st.columns(2)
+    with col1:
+        centre = st.selectbox("Devices near", options=[*centres.index, "A point"])
+    with col2:
+        km = st.slider("Within (km)", 1, 100, 20)
+    if centre == "A point":
+        # Start from the middle of the districts, or of Ghana
+        default_lat, default_lon = centres[["lat", "lon"]].median().fillna({"lat": 7.95, "lon": -1.02})
+        col3, col4 = st.columns(2)
+        with col3:
+            lat = st.number_input("Latitude", -90.0, 90.0, float(default_lat), format="%.5f")
+        with col4:
+            lon = st.number_input("Longitude", -180.0, 180.0, float(default_lon), format="%.5f")
+        centre = f"{lat:.4f}, {lon:.4f}"
+    else:
+        lat, lon = centres.loc[centre, ["lat", "lon"]]
+
+    rows, distances = index.radius(lat, lon, km)
+    st.write(f"**{len(rows)}** device(s) within {km} km of {centre}")
+    if len(rows):
+        nearby = devices.iloc[rows][["group", "uuid", "model", "osVersion", "lastConnected", "stale"]]
+        st.dataframe(
+            nearby.assign(district=districts[rows], distance_km=distances),
+            column_config={
+                "group": group_label,
+                "lastConnected": st.column_config.DatetimeColumn("Last check-in", format="YYYY-MM-DD HH:mm"),
+                "stale": "Staleness",
+                "district": "District",
+                "distance_km": st.column_config.NumberColumn("Distance (km)", format="%.1f"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+def main():
+    if not st.session_state.get("authentication_status"):
+        st.info('Please log in to access the application from the MainPage.')
+        return
+
+    st.title("📱 Device Fleet Monitoring")
+    st.write("Check-in freshness and OS versions of the field tablets")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        log_key = st.radio(
+            "Device log",
+            options=list(DEVICE_LOGS),
+            format_func=lambda key: DEVICE_LOGS[key]["label"],
+            horizontal=True
+        )
+    with col2:
+        reference = st.radio(
+            "Measure staleness from",
+            options=["Latest check-in in the log", "Now"],
+            horizontal=True
+        )
+    spec = DEVICE_LOGS[log_key]
+    group_label = spec["group_label"]
+
+    try:
+        version = log_version(log_key)
+    except FileNotFoundError as e:
+        st.error(f"Error loading device log: {e}")
+        return
+    as_of = pd.Timestamp.now().floor("h") if reference == "Now" else None
+    summary = get_fleet_summary(log_key, version, as_of)
+    devices, groups, os_versions = summary["devices"], summary["groups"], summary["os_versions"]
+    if devices.empty:
+        st.warning("The device log is empty.")
+        return
+
+    fleet = devices.drop_duplicates("uuid", keep="last")
+    metric1, metric2, metric3, metric4 = st.columns(4)
+    with metric1:
+        st.metric("Devices", fleet["uuid"].nunique())
+    with metric2:
+        st.metric(f"{group_label}s", len(groups))
+    with metric3:
+        st.metric("Seen this month", int((fleet["days_since"] <= 30).sum()))
+    with metric4:
+        st.metric("On the most common OS", f"{os_versions['share'].iloc[0]:.0%}" if len(os_versions) else "n/a")
+    st.caption(f"Staleness measured from {summary['as_of']:%Y-%m-%d %H:%M}")
+
+    # Fleet-wide staleness and OS versions
+    chart1, chart2 = st.columns(2)
+    with chart1:
+        counts = fleet["stale"].value_counts().reindex(STALENESS_LABELS, fill_value=0)
+        fig = px.bar(
+            x=counts.index, y=counts.to_numpy(), color=counts.index,
+            color_discrete_map=STALENESS_COLORS,
+            labels={"x": "Last check-in", "y": "Devices"},
+            title="Devices by last check-in"
+        )
+        fig.update_layout(showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+    with chart2:
+        st.subheader("OS versions")
+        st.dataframe(
+            os_versions.reset_index(),
+            column_config={
+                "osVersion": "OS version",
+                "devices": "Devices",
+                "share": st.column_config.ProgressColumn("Share of fleet", format="percent", min_value=0, max_value=1),
+                "stale_share": st.column_config.NumberColumn("Not seen this month", format="percent"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+    # Per-group rollup, stalest first
+    st.subheader(f"📋 {group_label}s")
+    search = st.text_input(f"Filter {group_label.lower()}s", placeholder="Part of a name")
+    table = groups.reset_index()
+    if search:
+        table = table[table["group"].str.contains(search, case=False, regex=False)]
+    only_stale = st.checkbox(f"Only {group_label.lower()}s with no device seen this month")
+    if only_stale:
+        table = table[table["median_days_since"].isna() | (table[["Today", "This week", "This month"]].sum(axis=1) == 0)]
+    st.dataframe(
+        table,
+        column_config={
+            "group": group_label,
+            "devices": "Devices",
+            "last_check_in": st.column_config.DatetimeColumn("Last check-in", format="YYYY-MM-DD HH:mm"),
+            "median_days_since": st.column_config.NumberColumn("Median days since check-in", format="%.0f"),
+            "on_common_os": st.column_config.NumberColumn("On the most common OS", format="percent"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+    selected = st.selectbox(f"Devices of a {group_label.lower()}", options=table["group"], index=None)
+    if selected is not None:
+        rows = devices[devices["group"] == selected]
+        st.dataframe(
+            rows[["uuid", "model", "osVersion", "lastConnected", "days_since", "stale", "lat", "lon"]],
+            column_config={
+                "lastConnected": st.column_config.DatetimeColumn("Last check-in", format="YYYY-MM-DD HH:mm"),
+                "days_since": st.column_config.NumberColumn("Days since", format="%.1f"),
+                "stale": "Staleness",
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+    render_coverage(log_key, version, devices, group_label)
+
+if __name__ == "__main__":
+    main()
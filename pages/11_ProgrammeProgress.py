@@ -0,0 +1,109 @@
+import streamlit as st
+import plotly.express as px
+from programme_progress import PROGRAMME_TABLES, build_cube, filter_cube, load_table, rollup, selected_rows, table_version
+
+st.set_page_config(
+    page_title='Programme Progress',
+    page_icon='🏗️',
+    layout='wide'
+)
+
+@st.cache_resource(max_entries=4, show_spinner="Loading listing...")
+def get_programme(table_key, version):
+    """Typed listing, its cube and the cube's row index, built once per file version"""
+    table = load_table(table_key)
+    cube, rows = build_cube(table, PROGRAMME_TABLES[table_key])
+    return table, cube, rows
+
+def format_measures(spec):
+    """Column formats of a rollup table"""
+    config = {"records": st.column_config.NumberColumn("Records", format="%d")}
+    for column in spec["sums"]:
+        config[column] = st.column_config.NumberColumn(column, format="%.0f")
+    for column in spec["means"]:
+        config[f"Mean {column}"] = st.column_config.NumberColumn(f"Mean {column}", format="%.1f")
+    for label in spec["ratios"]:
+        config[label] = st.column_config.NumberColumn(label, format="percent")
+    return config
+
+def main():
+    if not st.session_state.get("authentication_status"):
+        st.info('Please log in to access the application from the MainPage.')
+        return
+
+    st.title("🏗️ Programme Progress")
+    table_key = st.radio(
+        "Programme",
+        options=list(PROGRAMME_TABLES),
+        format_func=lambda key: PROGRAMME_TABLES[key]["label"],
+        horizontal=True
+    )
+    spec = PROGRAMME_TABLES[table_key]
+    try:
+        table, cube, rows = get_programme(table_key, table_version(table_key))
+    except FileNotFoundError as e:
+        st.error(f"Error loading listing: {e}")
+        return
+
+    # Filters are answered from the cube; option counts come from it too
+    st.sidebar.header("🔎 Filters")
+    filters = {}
+    for column in spec["dimensions"]:
+        counts = cube.groupby(column, observed=True)["records"].sum()
+        filters[column] = st.sidebar.multiselect(
+            column,
+            options=list(counts.index),
+            format_func=lambda value, counts=counts: f"{value} ({counts[value]})",
+            key=f"{table_key}_{column}"
+        )
+    mask = filter_cube(cube, filters)
+    totals = rollup(cube, spec, mask=mask).iloc[0]
+
+    values = [("Records", f"{totals['records']:,.0f}")]
+    values += [(column, f"{totals[column]:,.0f}") for column in spec["sums"] if column not in spec["means"]]
+    values += [(f"Mean {column}", f"{totals[f'Mean {column}']:.1f}") for column in spec["means"]]
+    values += [(label, f"{totals[label]:.0%}") for label in spec["ratios"]]
+    for metric, (label, value) in zip(st.columns(len(values)), values):
+        with metric:
+            st.metric(label, value)
+
+    # Drill down: totals by one dimension, split by another
+    col1, col2 = st.columns(2)
+    with col1:
+        by = st.selectbox("Group by", options=spec["dimensions"], key=f"{table_key}_by")
+    with col2:
+        split = st.selectbox(
+            "Split by",
+            options=[column for column in spec["dimensions"] if column != by],
+            key=f"{table_key}_split"
+        )
+    # Averaged columns are offered as their means; summing percentages means nothing
+    measures = [
+        "records",
+        *(column for column in spec["sums"] if column not in spec["means"]),
+        *(f"Mean {column}" for column in spec["means"])
+    ]
+    measure = st.selectbox("Measure", options=measures, key=f"{table_key}_measure")
+
+    grouped = rollup(cube, spec, by=[by], mask=mask).sort_values(measure, ascending=False)
+    breakdown = rollup(cube, spec, by=[by, split], mask=mask).reset_index()
+    fig = px.bar(
+        breakdown,
+        x=by,
+        y=measure,
+        color=split,
+        category_orders={by: list(grouped.index)},
+        # Means of the splits do not stack into the mean of the group
+        barmode="group" if measure.startswith("Mean ") else "relative",
+        title=f"{measure} by {by} and {split}"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(grouped.reset_index(), column_config=format_measures(spec), use_container_width=True, hide_index=True)
+
+    # Listing rows behind the selection
+    positions = selected_rows(rows, mask)
+    with st.expander(f"📋 {len(positions)} {spec['item_label'].lower()}(s) in this selection"):
+        st.dataframe(table.iloc[positions], use_container_width=True, hide_index=True)
+
+if __name__ == "__main__":
+    main()
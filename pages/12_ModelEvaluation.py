@@ -0,0 +1,111 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from model_evaluation import EVALUATION_DATA, build_evaluation, compare_at, evaluation_version, load_scores
+
+st.set_page_config(
+    page_title='Model Evaluation',
+    page_icon='🎯',
+    layout='wide'
+)
+
+@st.cache_resource(max_entries=2, show_spinner="Scoring the pipelines...")
+def get_evaluation(version):
+    """Curves of every pipeline, built once per version of the data and pipeline files"""
+    y_true, scores, errors = load_scores()
+    return build_evaluation(y_true, scores), errors, len(y_true), int(y_true.sum())
+
+def curve_figure(lines, x_label, y_label, title, marker):
+    """One line per model from {model: (x, y)}, with each model's point at the current threshold"""
+    fig = go.Figure()
+    for name, (x, y) in lines.items():
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=name))
+    fig.add_trace(go.Scatter(
+        x=marker[0], y=marker[1], mode="markers", name="Threshold", marker=dict(size=10, color="black")
+    ))
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label)
+    return fig
+
+def main():
+    if not st.session_state.get("authentication_status"):
+        st.info('Please log in to access the application from the MainPage.')
+        return
+
+    st.title("🎯 Model Evaluation")
+    try:
+        evaluation, errors, rows, positives = get_evaluation(evaluation_version())
+    except FileNotFoundError as e:
+        st.error(f"Error loading evaluation data: {e}")
+        return
+    for name, error in errors.items():
+        st.warning(f"{name} could not be scored: {error}")
+    if not evaluation:
+        return
+    st.caption(
+        f"{rows:,} rows of {EVALUATION_DATA} ({positives:,} subscribed). Scores are computed once per pipeline "
+        "file and cached; every threshold below is answered from them."
+    )
+
+    # Metrics of every model at one threshold
+    threshold = st.slider("Decision threshold (P(yes))", min_value=0.01, max_value=0.99, value=0.5, step=0.01)
+    comparison = compare_at(evaluation, threshold)
+    st.dataframe(
+        comparison,
+        column_config={
+            "Predicted_Yes": st.column_config.NumberColumn("Predicted_Yes", format="%d"),
+            **{
+                column: st.column_config.NumberColumn(column, format="%.3f")
+                for column in comparison.columns if column not in ("Model Name", "Predicted_Yes")
+            }
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+    positive_rates = comparison["Positive_Recall"].to_numpy()
+    false_rates = (comparison["Predicted_Yes"].to_numpy() - positive_rates * positives) / (rows - positives)
+    roc_tab, pr_tab, calibration_tab, sweep_tab = st.tabs(["ROC", "Precision-Recall", "Calibration", "Threshold sweep"])
+    with roc_tab:
+        fig = curve_figure(
+            {name: model["roc"] for name, model in evaluation.items()},
+            "False positive rate", "True positive rate", "ROC curves (dots: current threshold)",
+            marker=(false_rates, positive_rates)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    with pr_tab:
+        fig = curve_figure(
+            {name: model["pr"][::-1] for name, model in evaluation.items()},
+            "Recall", "Precision", "Precision-recall curves (dots: current threshold)",
+            marker=(comparison["Positive_Recall"], comparison["Positive_Precision"])
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    with calibration_tab:
+        calibrated = {
+            name: model["calibration"][0] for name, model in evaluation.items() if model["calibration"] is not None
+        }
+        if calibrated:
+            table = pd.concat(calibrated, names=["Model", None]).reset_index(level=0)
+            fig = px.line(table, x="predicted", y="observed", color="Model", markers=True, hover_data=["rows"],
+                          title="Calibration: observed subscription rate per predicted probability bin")
+            fig.add_trace(go.Scatter(
+                x=[0, 1], y=[0, 1], mode="lines", name="Perfect", line=dict(dash="dash", color="grey")
+            ))
+            st.plotly_chart(fig, use_container_width=True)
+        margin_models = [name for name, model in evaluation.items() if model["calibration"] is None]
+        if margin_models:
+            st.caption(f"Not shown (decision scores, not probabilities): {', '.join(margin_models)}")
+    with sweep_tab:
+        metric = st.selectbox(
+            "Metric", options=["F1_Score", "Precision", "Recall", "Accuracy", "Positive_F1", "Positive_Precision",
+                               "Positive_Recall"]
+        )
+        sweep = pd.concat(
+            {name: model["sweep"] for name, model in evaluation.items()}, names=["Model", None]
+        ).reset_index(level=0)
+        fig = px.line(sweep, x="Threshold", y=metric, color="Model", title=f"{metric} by decision threshold")
+        fig.add_vline(x=threshold, line_dash="dash", line_color="grey")
+        st.plotly_chart(fig, use_container_width=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+from pdf_text import extract_pdf_text, read_pdf_bytes
+
+# Bump when the extraction or parsing logic changes so old entries are ignored
+CACHE_VERSION = 5
+
+DEFAULT_CACHE_DIR = os.environ.get('EXAM_CACHE_DIR', './.cache/exam_papers')
+DEFAULT_MAX_MB = float(os.environ.get('EXAM_CACHE_MAX_MB', '256'))
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes, or of the JSON form of any other value"""
+    if not isinstance(data, (bytes, bytearray)):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class ContentCache:
+    """
+    On-disk cache keyed by content hashes with a size-bounded LRU policy.
+    Values are stored as JSON, or pickled when pickled=True (for objects
+    such as fitted vectorizers and sparse matrices).
+
+    Each entry is one file; reading an entry refreshes its modification time
+    and writing one evicts the least recently used files once the folder
+    grows past max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, parts, pickled):
+        extension = 'pkl' if pickled else 'json'
+        return os.path.join(self.directory, f"v{CACHE_VERSION}-{kind}-{'-'.join(parts)}.{extension}")
+
+    def get(self, kind, *parts, pickled=False):
+        """Cached value or None"""
+        path = self._path(kind, parts, pickled)
+        try:
+            if pickled:
+                with open(path, 'rb') as file:
+                    value = pickle.load(file)
+            else:
+                with open(path, encoding='utf-8') as file:
+                    value = json.load(file)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, kind, *parts, value, pickled=False):
+        """Store value atomically, then enforce the size bound"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp_')
+        if pickled:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(value, file, ensure_ascii=False)
+        os.replace(tmp_path, self._path(kind, parts, pickled))
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.startswith('.tmp_'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def get_or_compute(self, kind, *parts, compute, pickled=False):
+        value = self.get(kind, *parts, pickled=pickled)
+        if value is None:
+            value = compute()
+            self.put(kind, *parts, value=value, pickled=pickled)
+        return value
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Cache shared by the pages of this process"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ContentCache()
+    return _default_cache
+
+
+def cached_pdf_text(pdf_file, parallel=None):
+    """
+    Text of a PDF, read from the cache when the same bytes were seen before.
+    Returns (text, sha256 of the PDF bytes).
+    """
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    digest = content_hash(pdf_bytes)
+    text = get_cache().get_or_compute('text', digest, compute=lambda: extract_pdf_text(pdf_bytes, parallel=parallel))
+    return text, digest
@@ -0,0 +1,96 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+# Below this many pages the cost of shipping the PDF to worker processes
+# outweighs the parallel speed-up, so pages are extracted in-process.
+PARALLEL_MIN_PAGES = 24
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def read_pdf_bytes(pdf_file):
+    """
+    Return the raw bytes of a PDF given an uploaded file, a file-like
+    object, a path or bytes.
+    """
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as file:
+            return file.read()
+    if hasattr(pdf_file, 'getvalue'):
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def _extract_page_range(pdf_bytes, start, stop):
+    """Worker: text of pages [start, stop), empty string for pages without text"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(BytesIO(pdf_bytes))
+    return [reader.pages[number].extract_text() or "" for number in range(start, stop)]
+
+
+def _get_pool():
+    """Process pool shared by every extraction in this process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _pool
+
+
+def iter_page_texts(pdf_file, first_page=0, last_page=None, parallel=None):
+    """
+    Yield the text of each page in order.
+
+    Large documents are split into page ranges extracted concurrently in a
+    process pool; results are still yielded page by page as soon as their
+    range is ready, so callers that only need the beginning of a document
+    can stop early. Pages without extractable text yield an empty string.
+    """
+    from PyPDF2 import PdfReader
+
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    reader = PdfReader(BytesIO(pdf_bytes))
+    page_count = len(reader.pages)
+    stop = page_count if last_page is None else min(last_page, page_count)
+    if first_page >= stop:
+        return
+
+    if parallel is None:
+        parallel = stop - first_page >= PARALLEL_MIN_PAGES and (os.cpu_count() or 1) > 1
+
+    if not parallel:
+        for number in range(first_page, stop):
+            yield reader.pages[number].extract_text() or ""
+        return
+
+    # A few ranges per worker keeps the pool busy when page costs vary
+    chunks = (os.cpu_count() or 1) * 4
+    chunk_size = max(1, -(-(stop - first_page) // chunks))
+    starts = list(range(first_page, stop, chunk_size))
+    futures = [
+        _get_pool().submit(_extract_page_range, pdf_bytes, start, min(start + chunk_size, stop))
+        for start in starts
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_text(pdf_file, parallel=None):
+    """
+    Full text of a PDF with a newline after every page, joined once.
+    """
+    pages = list(iter_page_texts(pdf_file, parallel=parallel))
+    if not pages:
+        return ""
+    return "\n".join(pages) + "\n"
@@ -0,0 +1,128 @@
+"""
+Progress rollups of the LIPW sub-projects and the PI classes.
+
+DB/SubProjectsListing.csv lists the sub-projects with their district,
+type, status, completion and beneficiaries; DB/Bzcoclasscommunity.csv
+lists the classes with their batch, status and self-selected/enrolled
+counts. Each table is loaded once into typed columns and summed into a
+cube with one row per combination of its dimensions. Dashboard filters
+and drill-downs are answered by re-aggregating the cube, which has a few
+hundred rows however large the listing grows, and the listing rows behind
+a selection are found through the cube's row index.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# dimensions: categorical columns the cube is grouped by
+# sums: numeric columns summed per cube cell
+# means: sums also averaged over the records that have a value
+# ratios: label -> (numerator sum, denominator sum)
+PROGRAMME_TABLES = {
+    "subprojects": {
+        "label": "LIPW sub-projects",
+        "path": "./DB/SubProjectsListing.csv",
+        "name": "subProject",
+        "item_label": "Sub-project",
+        "dimensions": ["District", "Type", "Status", "Community Type"],
+        "sums": ["Beneficiaries", "Beneficiaries reached", "% Completion"],
+        "means": ["% Completion"],
+        "ratios": {"Share of beneficiaries reached": ("Beneficiaries reached", "Beneficiaries")},
+    },
+    "classes": {
+        "label": "PI classes",
+        "path": "./DB/Bzcoclasscommunity.csv",
+        "name": "Class Name",
+        "item_label": "Class",
+        "dimensions": ["District", "Batch", "Status", "Rural Or Urban"],
+        "sums": ["Self Selected", "Enrolled"],
+        "means": [],
+        "ratios": {"Enrolment rate": ("Enrolled", "Self Selected")},
+    },
+}
+
+
+def table_version(table_key):
+    """Version tag of a listing, changes whenever the file is rewritten"""
+    stat = os.stat(PROGRAMME_TABLES[table_key]["path"])
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def normalize_names(names):
+    """Names with surrounding spaces removed and inner runs of whitespace collapsed"""
+    return names.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+
+
+def load_table(table_key):
+    """
+    Typed listing: whitespace-normalised names, categorical dimensions
+    (district names in title case) and numeric measures. Sub-projects also
+    get 'Beneficiaries reached', their beneficiaries weighted by completion.
+    """
+    spec = PROGRAMME_TABLES[table_key]
+    table = pd.read_csv(spec["path"], encoding="latin1")
+    table[spec["name"]] = normalize_names(table[spec["name"]])
+    for column in spec["dimensions"]:
+        values = normalize_names(table[column].fillna("Unknown"))
+        if column == "District":
+            values = values.str.title()
+        table[column] = values.astype("category")
+    if table_key == "subprojects":
+        table["% Completion"] = pd.to_numeric(table["% Completion"], errors="coerce").clip(0, 100)
+        table["Beneficiaries"] = pd.to_numeric(table["Beneficiaries"], errors="coerce")
+        table["Beneficiaries reached"] = table["Beneficiaries"] * table["% Completion"] / 100
+    else:
+        for column in spec["sums"]:
+            table[column] = pd.to_numeric(table[column], errors="coerce")
+    return table
+
+
+def build_cube(table, spec):
+    """
+    Sums per combination of the dimensions, with 'records' and a
+    '<column> count' of the non-missing values of every mean column, and
+    the listing row positions of every cell.
+    """
+    counts = table[spec["means"]].notna().astype(int).add_suffix(" count")
+    grouped = table[spec["dimensions"]].join(table[spec["sums"]]).join(counts).groupby(
+        spec["dimensions"], observed=True, sort=False
+    )
+    cube = grouped.sum(min_count=0)
+    cube.insert(0, "records", grouped.size())
+    cube = cube.reset_index()
+    rows = [grouped.indices[key] for key in cube[spec["dimensions"]].itertuples(index=False, name=None)]
+    return cube, rows
+
+
+def filter_cube(cube, filters):
+    """Boolean mask of the cube cells matching {dimension: selected values}; empty selections match all"""
+    mask = np.ones(len(cube), dtype=bool)
+    for column, values in filters.items():
+        if values:
+            mask &= cube[column].isin(values).to_numpy()
+    return mask
+
+
+def rollup(cube, spec, by=(), mask=None):
+    """
+    Totals of the selected cube cells grouped by some dimensions (grand
+    totals when by is empty), with the means and ratios of the spec.
+    """
+    cells = cube if mask is None else cube[mask]
+    measures = ["records", *spec["sums"], *(f"{column} count" for column in spec["means"])]
+    if by:
+        totals = cells.groupby(list(by), observed=True)[measures].sum()
+    else:
+        totals = pd.DataFrame({column: [cells[column].sum()] for column in measures})
+    for column in spec["means"]:
+        totals[f"Mean {column}"] = totals[column] / totals[f"{column} count"].replace(0, np.nan)
+    for label, (numerator, denominator) in spec["ratios"].items():
+        totals[label] = totals[numerator] / totals[denominator].replace(0, np.nan)
+    return totals.drop(columns=[f"{column} count" for column in spec["means"]])
+
+
+def selected_rows(rows, mask):
+    """Listing row positions behind the selected cube cells, in listing order"""
+    picked = [cell_rows for cell_rows, keep in zip(rows, mask) if keep]
+    return np.sort(np.concatenate(picked)) if picked else np.empty(0, dtype=np.int64)
@@ -0,0 +1,206 @@
+"""
+Persistent bank of every question extracted from the exam papers.
+
+Questions are kept in a local SQLite store, deduplicated by a hash of their
+normalised text, with an FTS5 index over the question and solution texts.
+Facets (exam sitting, syllabus area, marks) are indexed columns, so
+searches stay interactive as the bank grows to tens of thousands of
+questions.
+"""
+import os
+import re
+import sqlite3
+import time
+
+from pdf_cache import content_hash
+
+DB_PATH = os.environ.get('QUESTION_BANK_DB', './.cache/question_bank.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    question TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    marks INTEGER,
+    exam_type TEXT NOT NULL,
+    sitting TEXT NOT NULL,
+    syllabus_area TEXT NOT NULL,
+    question_number TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    added REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_sitting ON questions (sitting);
+CREATE INDEX IF NOT EXISTS questions_area ON questions (syllabus_area);
+CREATE INDEX IF NOT EXISTS questions_marks ON questions (marks);
+CREATE TABLE IF NOT EXISTS question_sources (
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    paper_hash TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (question_id, paper_hash)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question, solution, content='questions', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts (rowid, question, solution) VALUES (new.id, new.question, new.solution);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, question, solution)
+    VALUES ('delete', old.id, old.question, old.solution);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE OF question, solution ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, question, solution)
+    VALUES ('delete', old.id, old.question, old.solution);
+    INSERT INTO questions_fts (rowid, question, solution) VALUES (new.id, new.question, new.solution);
+END;
+"""
+
+FACETS = ('sitting', 'syllabus_area')
+
+_initialised = set()
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if db_path not in _initialised:
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        _initialised.add(db_path)
+    return conn
+
+
+def question_key(question_text):
+    """Deduplication key: the same wording with any case and spacing is one question"""
+    return content_hash(' '.join(question_text.lower().split()).encode('utf-8'))
+
+
+def add_paper(pdf_content, db_path=DB_PATH):
+    """
+    Store the questions of one parsed paper (as returned by
+    extract_pdf_content). Returns (new questions, questions already banked).
+    """
+    paper_hash = pdf_content.get('paper_hash') or content_hash(pdf_content['question_texts'])
+    added = duplicates = 0
+    with _connect(db_path) as conn:
+        for i, question_text in enumerate(pdf_content['question_texts']):
+            if not question_text:
+                continue
+            key = question_key(question_text)
+            marks = pdf_content['mark_allocations'][i]
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO questions (content_hash, question, solution, marks, exam_type, sitting, "
+                "syllabus_area, question_number, filename, added) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, question_text, pdf_content['solution_texts'][i],
+                    int(marks) if marks.isdigit() else None,
+                    pdf_content['exams_type'], pdf_content['sitting'], pdf_content['syllabus_areas'][i],
+                    f"Q{i+1}", pdf_content['filename'], time.time(),
+                ),
+            )
+            if cursor.rowcount:
+                added += 1
+                question_id = cursor.lastrowid
+            else:
+                duplicates += 1
+                question_id = conn.execute("SELECT id FROM questions WHERE content_hash = ?", (key,)).fetchone()[0]
+            conn.execute(
+                "INSERT OR IGNORE INTO question_sources (question_id, paper_hash, filename) VALUES (?, ?, ?)",
+                (question_id, paper_hash, pdf_content['filename']),
+            )
+    return added, duplicates
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text typed by a user: every word must
+    occur, the last one as a prefix. None when there are no words.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+def _filters(match=None, sittings=(), areas=(), marks_range=None, skip=None):
+    """SQL conditions (on questions q) and parameters for a set of filters"""
+    clauses, params = [], []
+    if match:
+        clauses.append("q.id IN (SELECT rowid FROM questions_fts WHERE questions_fts MATCH ?)")
+        params.append(match)
+    for column, values in (('sitting', sittings), ('syllabus_area', areas)):
+        if values and column != skip:
+            clauses.append(f"q.{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if marks_range is not None:
+        clauses.append("q.marks BETWEEN ? AND ?")
+        params.extend(marks_range)
+    return clauses, params
+
+
+def search(text='', sittings=(), areas=(), marks_range=None, limit=50, offset=0, db_path=DB_PATH):
+    """
+    Questions matching the free text and filters, best matches first (newest
+    first without text), with the total number of matches. Each row has a
+    'snippet' with the matched words in «», and 'papers', the number of
+    papers the question was found in. limit=None returns every match.
+    """
+    match = fts_query(text)
+    clauses, params = _filters(None, sittings, areas, marks_range)
+    if match:
+        # CROSS JOIN keeps the full-text match as the outer loop
+        source = "questions_fts CROSS JOIN questions q ON q.id = questions_fts.rowid"
+        clauses.insert(0, "questions_fts MATCH ?")
+        params.insert(0, match)
+        snippet = "snippet(questions_fts, -1, '«', '»', ' … ', 24)"
+        order = "bm25(questions_fts)"
+    else:
+        source = "questions q"
+        snippet = "substr(q.question, 1, 200)"
+        order = "q.id DESC"
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    with _connect(db_path) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT q.id, q.sitting, q.exam_type, q.syllabus_area, q.marks, q.question_number, q.filename, "
+            f"q.question, q.solution, {snippet} AS snippet, "
+            f"(SELECT COUNT(*) FROM question_sources s WHERE s.question_id = q.id) AS papers "
+            f"FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            [*params, -1 if limit is None else limit, offset],
+        ).fetchall()
+    return [dict(row) for row in rows], total
+
+
+def facet_counts(text='', sittings=(), areas=(), marks_range=None, db_path=DB_PATH):
+    """
+    Number of matching questions per value of each facet. A facet is
+    counted with every filter except its own, so choosing one sitting still
+    shows how many matches the other sittings have.
+    """
+    match = fts_query(text)
+    counts = {}
+    with _connect(db_path) as conn:
+        for column in FACETS:
+            clauses, params = _filters(match, sittings, areas, marks_range, skip=column)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            counts[column] = dict(conn.execute(
+                f"SELECT q.{column}, COUNT(*) FROM questions q {where} GROUP BY q.{column}", params
+            ).fetchall())
+    return counts
+
+
+def bank_summary(db_path=DB_PATH):
+    """Totals and the values every facet can take"""
+    with _connect(db_path) as conn:
+        questions, low, high = conn.execute("SELECT COUNT(*), MIN(marks), MAX(marks) FROM questions").fetchone()
+        papers = conn.execute("SELECT COUNT(DISTINCT paper_hash) FROM question_sources").fetchone()[0]
+        values = {
+            column: [row[0] for row in conn.execute(f"SELECT DISTINCT {column} FROM questions ORDER BY {column}")]
+            for column in FACETS
+        }
+    return {'questions': questions, 'papers': papers, 'marks': (low, high), 'values': values}
@@ -0,0 +1,113 @@
+"""
+Single-pass segmentation of exam paper text into questions.
+
+One scan of the text finds question headers, solution markers and mark
+allocations. A small state machine turns them into offset spans, and
+text is only copied out of the paper when a caller asks for it through
+span_text.
+"""
+import re
+from collections import namedtuple
+
+UNITS = 'ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE'
+TEENS = 'TEN|ELEVEN|TWELVE|THIRTEEN|FOURTEEN|FIFTEEN|SIXTEEN|SEVENTEEN|EIGHTEEN|NINETEEN'
+TENS = 'TWENTY|THIRTY|FORTY|FIFTY|SIXTY|SEVENTY|EIGHTY|NINETY'
+
+# "12", "3b", "ONE", "Twenty-One", optionally followed by sub-parts such as
+# "(a)", "(iv)" or "(2)"
+NUMBER = (
+    rf"(?i:(?:\d+[a-z]?|(?:{TENS})(?:[\s-]+(?:{UNITS}))?|{TEENS}|{UNITS})\b"
+    r"(?:\s*\((?:[a-z]|[ivx]{1,4}|\d{1,2})\))*)"
+)
+
+# The scan looks for plain literals only, which the regex engine can skip
+# to quickly; what follows a literal is checked at that position alone.
+# Solution markers match in upper, title or lower case as before.
+TRIGGER_PATTERN = re.compile(
+    r"(?:QUESTION|Question|SOLUTION|Solution|solution|ANSWER|Answer|answer"
+    r"|WORKINGS|Workings|workings|\(Total:)"
+)
+HEADER_NUMBER = re.compile(rf"\s+({NUMBER})")
+MARKS_TOTAL = re.compile(r"\s*(\d+)\s*marks\)")
+
+# number: the label as printed ("ONE", "1(a)"); start/end: offsets of the
+# whole section from its header; question and solution: (start, end)
+# offsets of their bodies (solution is None when the paper has none);
+# marks: the "(Total: N marks)" figure of the question, or ""
+QuestionSpan = namedtuple('QuestionSpan', 'number start end question solution marks')
+
+
+def iter_question_spans(text):
+    """
+    Yield a QuestionSpan for every question of an exam paper, in order.
+
+    Text before the first header is skipped. A header repeating the number
+    of the current question before its solution starts (such as a
+    "QUESTION ONE (continued)" page heading) does not open a new question.
+    """
+    current = None
+
+    def close(end):
+        question_end = current['solution_marker'] if current['solution'] is not None else end
+        solution = (current['solution'], end) if current['solution'] is not None else None
+        return QuestionSpan(
+            current['number'], current['start'], end,
+            (current['body'], question_end), solution, current['marks'],
+        )
+
+    for match in TRIGGER_PATTERN.finditer(text):
+        literal = match.group()
+        if literal in ('QUESTION', 'Question'):
+            # "Question" only opens a question at the start of a line
+            if literal == 'Question' and text[text.rfind('\n', 0, match.start()) + 1:match.start()].strip():
+                continue
+            header = HEADER_NUMBER.match(text, match.end())
+            if header is None:
+                continue
+            number = re.sub(r'\s*\(', '(', ' '.join(header.group(1).split()))
+            key = re.sub(r'[\s-]+', '', number).upper()
+            if current is not None and current['solution'] is None and key == current['key']:
+                continue
+            if current is not None:
+                yield close(match.start())
+            current = {
+                'number': number,
+                'key': key,
+                'start': match.start(),
+                'body': header.end(),
+                'solution_marker': None,
+                'solution': None,
+                'marks': '',
+            }
+        elif current is None or current['solution'] is not None:
+            continue
+        elif literal == '(Total:':
+            marks = MARKS_TOTAL.match(text, match.end())
+            if marks is not None and not current['marks']:
+                current['marks'] = marks.group(1)
+        else:
+            current['solution_marker'] = match.start()
+            current['solution'] = match.end()
+
+    if current is not None:
+        yield close(len(text))
+
+
+def span_text(text, span, limit=None):
+    """
+    Text of a (start, end) span with whitespace runs collapsed to single
+    spaces. With a limit only as much of the span as is needed to produce
+    the first limit characters is read.
+    """
+    if span is None:
+        return ""
+    start, end = span
+    if limit is None:
+        return ' '.join(text[start:end].split())
+
+    window = min(end, start + 2 * limit + 64)
+    while True:
+        cleaned = ' '.join(text[start:window].split())
+        if len(cleaned) > limit or window >= end:
+            return cleaned[:limit]
+        window = min(end, start + 2 * (window - start))
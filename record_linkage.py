@@ -0,0 +1,329 @@
+"""
+Record linkage between beneficiary lists.
+
+Links two tables of beneficiaries (by default the LEPIP system enrolment
+list and the LEPIP cross-sector dataset) in two stages:
+
+1. exact joins on normalised identifiers (NHIS number, LEAP code, eZwich
+   number, programme record id, phone) through hash joins;
+2. fuzzy name matching for the records still unlinked, comparing only
+   records that share one of their rarest name tokens or token pairs
+   (blocking), with the date of birth as supporting evidence.
+
+Each stage resolves its candidate pairs greedily into one-to-one links,
+best first. The work grows with the number of candidate pairs instead of
+with the product of the table sizes, so hundreds of thousands of
+beneficiaries link in near-linear time.
+
+Usage:
+    python record_linkage.py                       # system list -> cross-sector dataset
+    python record_linkage.py --threshold 0.9 --output ./dataset/Linked.csv
+"""
+import argparse
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# Column layout of each source. 'keys' maps an identifier type to the
+# columns holding it; records are only compared on types both sides have.
+SOURCES = {
+    "system": {
+        "path": "./DB/systemdataset.csv",
+        "name": "Beneficiary",
+        "birth": "Date Of Birth",
+        "keys": {
+            "ezwich": ["eZwich #"],
+            "phone": ["Mobile"],
+            # Holds the Kobo record id, or a LEAP code for some beneficiaries
+            "record_id": ["Prog. ID"],
+            "leap_code": ["Prog. ID"],
+        },
+    },
+    "lepip": {
+        "path": "./DB/LEPIP_Beneficiaries_in_Cross_Sector_Dataset.csv",
+        "name": "Name (Full Name)_x",
+        # Despite its name the column holds the date of birth
+        "birth": "Death of Birth_x",
+        "keys": {
+            "nhis": ["NHIS number_x"],
+            "leap_code": ["Beneficiary LEAP Code_x"],
+            "ezwich": ["HHEzwichNumber"],
+            "record_id": ["_id"],
+            "phone": ["Contact", "Other Contact"],
+        },
+    },
+}
+
+# Identifier types from the most to the least specific
+KEY_TYPES = ("nhis", "leap_code", "ezwich", "record_id", "phone")
+
+# Identifier values shared by more records than this on either side are
+# placeholders or household-level values and link nothing
+MAX_KEY_RECORDS = 3
+
+# Name blocks (tokens and token pairs) that would pair up more records than
+# this are too common to block on; the records still meet through their
+# other blocks
+MAX_BLOCK_PAIRS = 1000
+
+# Blocks kept per record, cheapest first
+BLOCKS_PER_RECORD = 4
+
+# Score added to a name match when the dates of birth agree
+BIRTH_BONUS = 0.05
+
+DEFAULT_THRESHOLD = 0.85
+
+
+def _digits(values):
+    text = values.astype("string").str.strip().str.replace(r"\.0$", "", regex=True)
+    return text.str.replace(r"\D", "", regex=True)
+
+
+def normalize_phone(values):
+    """Ghanaian phone numbers as their 9 national digits ('024…', '+233 24…' and '24…' agree)"""
+    digits = _digits(values).str.replace(r"^(?:233|0)", "", regex=True)
+    return digits.where(digits.str.len() == 9)
+
+
+def normalize_identifier(values, min_length=6):
+    """Identifiers as digits only ('101439302-5' and '1014393025' agree); short values are placeholders"""
+    digits = _digits(values)
+    return digits.where(digits.str.len() >= min_length)
+
+
+KEY_NORMALIZERS = {
+    "nhis": normalize_identifier,
+    "leap_code": normalize_identifier,
+    "ezwich": normalize_identifier,
+    "record_id": normalize_identifier,
+    "phone": normalize_phone,
+}
+
+
+def _fold_name(name):
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    tokens = "".join(char if char.isalpha() else " " for char in name).split()
+    return " ".join(sorted(tokens))
+
+
+def normalize_names(values):
+    """Names lower-cased, without accents or punctuation, with tokens sorted ('Tia, Esther' == 'esther tia')"""
+    return values.fillna("").astype(str).map(_fold_name)
+
+
+def _birth_days(df, spec):
+    """Dates of birth as Excel day serials (NaN when missing)"""
+    column = spec.get("birth")
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+
+def _key_table(df, spec, key_type):
+    """Long table of (row, key) for one identifier type of a source"""
+    normalize = KEY_NORMALIZERS[key_type]
+    parts = [
+        pd.DataFrame({"row": np.arange(len(df)), "key": normalize(df[column])})
+        for column in spec["keys"].get(key_type, [])
+        if column in df.columns
+    ]
+    if not parts:
+        return pd.DataFrame({"row": pd.Series(dtype=int), "key": pd.Series(dtype="string")})
+    table = pd.concat(parts, ignore_index=True).dropna().drop_duplicates()
+    # Drop placeholder and shared values
+    return table[table.groupby("key")["row"].transform("size") <= MAX_KEY_RECORDS]
+
+
+def _name_similarity(left_names, right_names, cutoff=0.0):
+    """
+    0-1 similarity of each pair of folded names; pairs that cannot reach
+    cutoff score 0. Pairs grouped by right name reuse its analysis.
+    """
+    matcher = SequenceMatcher(None)
+    scores = np.zeros(len(left_names))
+    for i, (left, right) in enumerate(zip(left_names, right_names)):
+        if not left or not right:
+            continue
+        # Both are no-ops when the sequence is unchanged
+        matcher.set_seq2(right)
+        matcher.set_seq1(left)
+        # The quick ratios are cheap upper bounds of ratio()
+        if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+            scores[i] = matcher.ratio()
+    return scores
+
+
+def _resolve(pairs):
+    """Greedy one-to-one assignment of scored candidate pairs, best first"""
+    if pairs.empty:
+        return pairs
+    pairs = pairs.sort_values("score", ascending=False, kind="stable")
+    used_left, used_right = set(), set()
+    keep = np.zeros(len(pairs), dtype=bool)
+    for position, (left, right) in enumerate(zip(pairs["left_row"].to_numpy(), pairs["right_row"].to_numpy())):
+        if left in used_left or right in used_right:
+            continue
+        used_left.add(left)
+        used_right.add(right)
+        keep[position] = True
+    return pairs[keep]
+
+
+def _key_candidates(left, right, left_spec, right_spec, left_names, right_names):
+    """Pairs agreeing on at least one identifier, scored by how many agree plus name similarity"""
+    joined = []
+    for key_type in KEY_TYPES:
+        if key_type not in left_spec["keys"] or key_type not in right_spec["keys"]:
+            continue
+        pairs = _key_table(left, left_spec, key_type).merge(
+            _key_table(right, right_spec, key_type), on="key", suffixes=("_left", "_right")
+        )
+        pairs["method"] = key_type
+        joined.append(pairs[["row_left", "row_right", "method"]])
+    if not joined:
+        return pd.DataFrame(columns=["left_row", "right_row", "method", "name_score", "score"])
+
+    pairs = (
+        pd.concat(joined, ignore_index=True)
+        .rename(columns={"row_left": "left_row", "row_right": "right_row"})
+        .drop_duplicates()
+        .groupby(["left_row", "right_row"], sort=False)["method"]
+        .agg(lambda methods: "+".join(methods))
+        .reset_index()
+    )
+    pairs["name_score"] = _name_similarity(
+        left_names.to_numpy()[pairs["left_row"]], right_names.to_numpy()[pairs["right_row"]]
+    )
+    # Every agreeing identifier outranks any name evidence; among pairs with
+    # the same identifiers (say a shared household phone) the name decides
+    pairs["score"] = pairs["method"].str.count(r"\+") + 1 + pairs["name_score"]
+    return pairs
+
+
+def _name_blocks(rows, names):
+    """Long table of (row, block) with every name token and every pair of tokens"""
+    table = pd.DataFrame({"row": rows, "block": [
+        tokens + [f"{first} {second}" for i, first in enumerate(tokens) for second in tokens[i + 1:]]
+        for tokens in (name.split() for name in names.to_numpy()[rows])
+    ]})
+    # astype keeps the text dtype when no record has a token (explode then gives floats)
+    table = table.explode("block").dropna().drop_duplicates().astype({"block": "string"})
+    return table[table["block"].str.len() > 1]
+
+
+def _name_candidates(left_rows, right_rows, left_names, right_names, left_birth, right_birth, threshold):
+    """Pairs of unlinked records sharing a name block, scored on name and date of birth"""
+    if not len(left_rows) or not len(right_rows):
+        # Every record of one side is already linked, or a table is empty
+        return pd.DataFrame({
+            "left_row": pd.Series(dtype=int), "right_row": pd.Series(dtype=int), "method": pd.Series(dtype=str),
+            "name_score": pd.Series(dtype=float), "score": pd.Series(dtype=float),
+        })
+    left_blocks = _name_blocks(left_rows, left_names)
+    right_blocks = _name_blocks(right_rows, right_names)
+
+    # Pairs each block would generate. Blocks over the limit are dropped and
+    # every record keeps only its cheapest few, so the number of pairs grows
+    # with the number of records rather than with their product
+    cost = (left_blocks["block"].value_counts() * right_blocks["block"].value_counts()).dropna()
+    cost = cost[cost <= MAX_BLOCK_PAIRS]
+
+    def cheapest(table):
+        table = table.assign(cost=table["block"].map(cost)).dropna(subset=["cost"])
+        return table.sort_values(["row", "cost"], kind="stable").groupby("row").head(BLOCKS_PER_RECORD)
+
+    pairs = cheapest(left_blocks).merge(cheapest(right_blocks), on="block", suffixes=("_left", "_right"))
+    pairs = pairs[["row_left", "row_right"]].drop_duplicates().rename(
+        columns={"row_left": "left_row", "row_right": "right_row"}
+    ).sort_values("right_row", kind="stable")
+    if pairs.empty:
+        return pairs.assign(method=pd.Series(dtype=str), name_score=0.0, score=0.0)
+
+    pairs["method"] = "name"
+    # Names further apart than the birth date bonus can make up are not scored in full
+    pairs["name_score"] = _name_similarity(
+        left_names.to_numpy()[pairs["left_row"]], right_names.to_numpy()[pairs["right_row"]],
+        cutoff=threshold - BIRTH_BONUS
+    )
+    # A date of birth within a day supports the match, one more than a year apart counts against it
+    gap = np.abs(left_birth[pairs["left_row"].to_numpy()] - right_birth[pairs["right_row"].to_numpy()])
+    pairs["score"] = pairs["name_score"] + np.where(gap <= 1, BIRTH_BONUS, 0.0) - np.where(gap > 366, 0.1, 0.0)
+    return pairs[pairs["score"] >= threshold]
+
+
+def link_records(left, right, left_spec, right_spec, threshold=DEFAULT_THRESHOLD):
+    """
+    One-to-one links between the rows of two beneficiary tables.
+
+    Returns a DataFrame of left_row and right_row (positions in left and
+    right), method (the agreeing identifier types joined by '+', or
+    'name'), name_score (0-1 similarity of the folded names) and score.
+    Name-only pairs need a score of at least threshold.
+    """
+    left_names = normalize_names(left[left_spec["name"]])
+    right_names = normalize_names(right[right_spec["name"]])
+
+    links = _resolve(_key_candidates(left, right, left_spec, right_spec, left_names, right_names))
+
+    left_rows = np.setdiff1d(np.arange(len(left)), links["left_row"].to_numpy())
+    right_rows = np.setdiff1d(np.arange(len(right)), links["right_row"].to_numpy())
+    name_links = _resolve(_name_candidates(
+        left_rows, right_rows, left_names, right_names,
+        _birth_days(left, left_spec), _birth_days(right, right_spec), threshold,
+    ))
+
+    columns = ["left_row", "right_row", "method", "name_score", "score"]
+    return pd.concat([links[columns], name_links[columns]], ignore_index=True).astype(
+        {"left_row": int, "right_row": int}
+    )
+
+
+def merge_linked(left, right, links, suffixes=("", "_linked")):
+    """
+    Every left row with the columns of its linked right row (if any), plus
+    link_method and link_score. Unlinked rows have link_method 'unmatched'.
+    """
+    matched = links.set_index("left_row")
+    merged = left.reset_index(drop=True).copy()
+    right_positions = matched["right_row"].reindex(np.arange(len(left)))
+    linked_right = right.reset_index(drop=True).reindex(right_positions.to_numpy()).reset_index(drop=True)
+    merged = merged.join(linked_right, rsuffix=suffixes[1])
+    merged["link_method"] = matched["method"].reindex(np.arange(len(left))).fillna("unmatched").to_numpy()
+    merged["link_score"] = matched["score"].reindex(np.arange(len(left))).round(3).to_numpy()
+    return merged
+
+
+def load_source(source):
+    """A source table with every column read as text, so identifiers keep their digits"""
+    return pd.read_csv(SOURCES[source]["path"], dtype=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Link beneficiary records across the LEPIP datasets")
+    parser.add_argument("--left", default="system", help=f"Source to link from (one of {', '.join(SOURCES)})")
+    parser.add_argument("--right", default="lepip", help=f"Source to link to (one of {', '.join(SOURCES)})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum score for links made on names alone")
+    parser.add_argument("--output", default="./dataset/LEPIP_Linked_Beneficiaries.csv",
+                        help="Where to write the linked table")
+    args = parser.parse_args(argv)
+    unknown = [name for name in (args.left, args.right) if name not in SOURCES]
+    if unknown:
+        parser.error(f"unknown source(s): {', '.join(unknown)}")
+
+    left, right = load_source(args.left), load_source(args.right)
+    links = link_records(left, right, SOURCES[args.left], SOURCES[args.right], threshold=args.threshold)
+    merged = merge_linked(left, right, links)
+    merged.to_csv(args.output, index=False)
+
+    print(f"{args.left}: {len(left)} records, {args.right}: {len(right)} records")
+    for method, count in merged["link_method"].value_counts().items():
+        print(f"  {method:<28} {count}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
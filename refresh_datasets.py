@@ -0,0 +1,127 @@
+"""
+Incremental refresh of the processed indicator datasets.
+
+Turns the raw Data360 exports in DB/ into dataset/*Processed.csv and their
+Parquet caches. Only rows that are new or changed since the last refresh
+are cleaned; unchanged rows are reused from the previous columnar cache.
+
+Usage:
+    python refresh_datasets.py                 # refresh every dataset
+    python refresh_datasets.py population      # refresh selected datasets
+    python refresh_datasets.py --full          # ignore caches and rebuild
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_registry import DATASETS
+from file_utils import write_atomic
+
+# Dimension columns that identify one observation in a Data360 export
+KEY_COLUMNS = [
+    'Country Code', 'Series Code', 'SEX', 'AGE', 'URBANISATION',
+    'COMP_BREAKDOWN_1', 'COMP_BREAKDOWN_2', 'COMP_BREAKDOWN_3', 'Year'
+]
+
+
+def read_raw(raw_path):
+    """Read a raw export and attach per-row key and content hashes"""
+    raw = pd.read_csv(raw_path)
+    raw = raw.loc[:, ~raw.columns.str.startswith('Unnamed:')]
+    key_columns = [col for col in KEY_COLUMNS if col in raw.columns]
+    raw['_key_hash'] = pd.util.hash_pandas_object(raw[key_columns], index=False).to_numpy()
+    raw['_row_hash'] = pd.util.hash_pandas_object(raw.drop(columns='_key_hash'), index=False).to_numpy()
+    # Exact duplicate rows collapse onto one content hash
+    return raw.drop_duplicates('_row_hash').reset_index(drop=True)
+
+
+def clean_rows(rows):
+    """Cleaning applied to new or changed rows"""
+    rows = rows.copy()
+    rows['Year'] = pd.to_numeric(rows['Year'], errors='coerce').astype('Int64')
+    rows['OBS_VALUE'] = pd.to_numeric(rows['OBS_VALUE'], errors='coerce')
+    return rows
+
+
+def read_cache(cache_path):
+    """Previously published rows with their hashes, or None"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path)
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+def refresh_dataset(spec, full=False):
+    """
+    Refresh one dataset and return a summary of what changed.
+    Nothing is rewritten when the raw file has no new or changed rows.
+    """
+    raw = read_raw(spec['raw_path'])
+    previous = None if full else read_cache(spec['cache_path'])
+
+    if previous is not None and list(previous.columns) == list(raw.columns):
+        is_known = raw['_row_hash'].isin(previous['_row_hash']).to_numpy()
+        removed = int((~previous['_row_hash'].isin(raw['_row_hash'])).sum())
+    else:
+        previous = None
+        is_known = np.zeros(len(raw), dtype=bool)
+        removed = 0
+
+    delta = raw.loc[~is_known]
+    summary = {
+        'rows': len(raw),
+        'new': 0,
+        'changed': 0,
+        'removed': removed,
+        'unchanged': int(is_known.sum()),
+    }
+    if previous is not None:
+        changed = delta['_key_hash'].isin(previous['_key_hash'])
+        summary['changed'] = int(changed.sum())
+        summary['new'] = int((~changed).sum())
+    else:
+        summary['new'] = len(delta)
+
+    if previous is not None and delta.empty and not removed and os.path.exists(spec['path']):
+        return summary
+
+    cleaned = clean_rows(delta)
+    if previous is not None:
+        # Reuse cleaned rows from the cache, keeping the raw file's row order
+        reused = previous.set_index('_row_hash').loc[raw.loc[is_known, '_row_hash']].reset_index()
+        reused.index = raw.index[is_known]
+        processed = pd.concat([reused[cleaned.columns], cleaned]).sort_index()
+    else:
+        processed = cleaned
+
+    write_atomic(spec['path'], lambda tmp: processed.drop(columns=['_key_hash', '_row_hash']).to_csv(tmp, index=False))
+    try:
+        write_atomic(spec['cache_path'], lambda tmp: processed.to_parquet(tmp, index=False))
+    except ImportError:
+        print("  pyarrow is not installed; skipping the columnar cache (next run rebuilds in full)")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh dataset/*Processed.csv from the raw DB/ exports")
+    parser.add_argument('datasets', nargs='*', help=f"Datasets to refresh (default: all of {', '.join(DATASETS)})")
+    parser.add_argument('--full', action='store_true', help="Ignore the caches and rebuild every row")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+
+    for dataset_key in args.datasets or DATASETS:
+        summary = refresh_dataset(DATASETS[dataset_key], full=args.full)
+        print(
+            f"{dataset_key}: {summary['rows']} rows, {summary['new']} new, {summary['changed']} changed, "
+            f"{summary['removed']} removed, {summary['unchanged']} unchanged"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Batch scoring of a bank-marketing customer file with every trained pipeline.
+
+The input CSV (comma or semicolon separated, with the columns of
+Notebook/test_df.csv) is read in chunks. Each chunk is scored in a
+process pool whose workers load the pipelines and Encoder/label_encoder.pkl
+once, when they start; a model folder holding its own label_encoder.pkl
+(as training runs write) uses that encoder. Results are written in input order as they
+complete, so only a few chunks are held in memory at a time. The output
+has one row per input row, with the input row number, any --keep columns
+and, per model:
+    '<model> prediction'   decoded label ('yes'/'no')
+    '<model> probability'  probability of 'yes' (models with predict_proba)
+
+The output format follows its extension (.parquet or .csv), and the file
+only replaces an existing one once scoring has finished. An input with
+no rows gives an empty output that still has every column.
+
+Usage:
+    python score_bank_customers.py Notebook/test_df.csv predictions.parquet
+    python score_bank_customers.py customers.csv predictions.csv --models SVM KNN --keep y
+    python score_bank_customers.py customers.csv predictions.parquet --model-dir ./Models/<version> --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from bank_marketing import (
+    FEATURES, MODEL_DIR, available_models, csv_separator, encoder_path, load_pipeline, predict_pipeline
+)
+from file_utils import write_atomic
+
+CHUNK_SIZE = 20000
+
+# Chunks queued per worker; bounds memory while keeping every worker busy
+CHUNKS_PER_WORKER = 2
+
+_pipelines = None
+_encoder = None
+
+
+def _init_worker(model_dir, model_names, encoder_path):
+    """Load the pipelines and the label encoder once per worker process"""
+    global _pipelines, _encoder
+    _pipelines = {name: load_pipeline(name, model_dir) for name in model_names}
+    _encoder = joblib.load(encoder_path)
+
+
+def score_chunk(chunk, keep=()):
+    """Per-model prediction and 'yes' probability columns of a chunk of input rows"""
+    columns = {"row": chunk.index.to_numpy(), **{column: chunk[column].to_numpy() for column in keep}}
+    features = chunk[FEATURES]
+    yes = _encoder.transform(["yes"])[0]
+    for name, pipeline in _pipelines.items():
+        if chunk.empty:
+            # Estimators refuse 0-row input; only the output columns are needed
+            columns[f"{name} prediction"] = pd.Series([], dtype="string")
+            if hasattr(pipeline.steps[-1][1], "predict_proba"):
+                columns[f"{name} probability"] = np.array([], dtype=np.float32)
+            continue
+        codes, probabilities = predict_pipeline(pipeline, features)
+        columns[f"{name} prediction"] = _encoder.inverse_transform(codes)
+        if probabilities is not None:
+            columns[f"{name} probability"] = probabilities[:, np.searchsorted(pipeline.classes_, yes)].astype(np.float32)
+    return pd.DataFrame(columns)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a Parquet or CSV file"""
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self.parquet = None
+        self.rows = 0
+
+    def write(self, frame):
+        if self.file_format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.parquet is None:
+                self.parquet = pq.ParquetWriter(self.path, table.schema)
+            self.parquet.write_table(table.cast(self.parquet.schema))
+        else:
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def close(self):
+        if self.parquet is not None:
+            self.parquet.close()
+
+
+def show_progress(rows, done_bytes, total_bytes, start, stream=sys.stderr):
+    """One-line progress display: rows scored, share of the input read and throughput"""
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    share = done_bytes / total_bytes if total_bytes else 1.0
+    bar = "#" * int(share * 30)
+    stream.write(f"\r[{bar:<30}] {share:>4.0%}  {rows:>12,} rows  {rows / elapsed:>10,.0f} rows/s")
+    stream.flush()
+
+
+def score_file(input_path, output_path, model_names, model_dir=MODEL_DIR, keep=(), chunk_size=CHUNK_SIZE,
+               workers=None, file_format="parquet", progress=True):
+    """Score the input file into output_path and return the number of rows"""
+    workers = workers or os.cpu_count() or 1
+    total_bytes = os.path.getsize(input_path)
+    start = time.perf_counter()
+    writer = ChunkWriter(output_path, file_format)
+    with open(input_path, "rb") as handle, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(model_dir, model_names, encoder_path(model_dir))
+    ) as pool:
+        reader = pd.read_csv(
+            handle, sep=csv_separator(input_path), usecols=list(dict.fromkeys([*FEATURES, *keep])),
+            chunksize=chunk_size
+        )
+        pending = deque()
+        empty = None
+
+        def write_next():
+            writer.write(pending.popleft().result())
+            if progress:
+                show_progress(writer.rows, handle.tell(), total_bytes, start)
+
+        try:
+            for chunk in reader:
+                if chunk.empty:
+                    empty = chunk
+                    continue
+                pending.append(pool.submit(score_chunk, chunk, tuple(keep)))
+                while len(pending) >= workers * CHUNKS_PER_WORKER:
+                    write_next()
+            while pending:
+                write_next()
+            if writer.rows == 0:
+                # No rows at all: still write the header (or Parquet schema) of the output
+                empty = empty if empty is not None else pd.DataFrame(columns=list(dict.fromkeys([*FEATURES, *keep])))
+                writer.write(pool.submit(score_chunk, empty, tuple(keep)).result())
+        finally:
+            writer.close()
+    if progress:
+        show_progress(writer.rows, total_bytes, total_bytes, start)
+        sys.stderr.write("\n")
+    return writer.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a bank-marketing customer file with the trained pipelines")
+    parser.add_argument("input", help="Customer CSV with the columns of Notebook/test_df.csv")
+    parser.add_argument("output", help="Predictions file, .parquet or .csv")
+    parser.add_argument("--models", nargs="*", default=None, help="Model families (default: every pipeline found)")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help=f"Folder of the pipelines (default {MODEL_DIR})")
+    parser.add_argument("--keep", nargs="*", default=[], help="Input columns copied to the output, e.g. y")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--quiet", action="store_true", help="No progress display")
+    args = parser.parse_args(argv)
+
+    found = available_models(args.model_dir)
+    models = found if args.models is None else args.models
+    missing = [name for name in models if name not in found]
+    if missing:
+        parser.error(f"no pipeline for: {', '.join(missing)} in {args.model_dir} (found: {', '.join(found) or 'none'})")
+    if not models:
+        parser.error(f"no pipelines found in {args.model_dir}")
+    if not os.path.exists(args.input):
+        parser.error(f"input not found: {args.input}")
+    file_format = os.path.splitext(args.output)[1].lower().lstrip(".")
+    if file_format not in ("parquet", "csv"):
+        parser.error("output must end in .parquet or .csv")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    start = time.perf_counter()
+    rows = []
+    write_atomic(args.output, lambda tmp: rows.append(score_file(
+        args.input, tmp, models, args.model_dir, args.keep, args.chunk_size, args.workers, file_format,
+        progress=not args.quiet
+    )))
+    seconds = time.perf_counter() - start
+    print(f"Scored {rows[0]:,} rows with {len(models)} model(s) in {seconds:.1f} s "
+          f"({rows[0] / seconds:,.0f} rows/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
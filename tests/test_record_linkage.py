@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record_linkage import link_records
+
+LEFT_SPEC = {"name": "name", "birth": "birth", "keys": {"nhis": ["nhis"], "phone": ["phone"]}}
+RIGHT_SPEC = {"name": "full_name", "birth": "dob", "keys": {"nhis": ["nhis_number"], "phone": ["contact"]}}
+
+
+def make_left():
+    return pd.DataFrame({
+        "name": ["Ama Mensah", "Kofi Boateng", "Esther Tia"],
+        "birth": ["30000", "31000", "32000"],
+        "nhis": ["10143930", "20254041", "30365152"],
+        "phone": ["0241234567", None, "0201112223"],
+    })
+
+
+def make_right():
+    return pd.DataFrame({
+        "full_name": ["Tia, Esther", "MENSAH Ama", "Boateng Kofi"],
+        "dob": ["32000", "30000", "31000"],
+        "nhis_number": ["3036515-2", "1014393-0", "2025404-1"],
+        "contact": ["+233 20 111 2223", "241234567", None],
+    })
+
+
+def test_every_row_linked_by_identifier():
+    links = link_records(make_left(), make_right(), LEFT_SPEC, RIGHT_SPEC)
+    pairs = dict(zip(links["left_row"], links["right_row"]))
+    assert pairs == {0: 1, 1: 2, 2: 0}
+    assert not (links["method"] == "name").any()
+
+
+def test_empty_table_links_nothing():
+    empty = make_right().iloc[:0]
+    assert link_records(make_left(), empty, LEFT_SPEC, RIGHT_SPEC).empty
+    assert link_records(empty, make_left(), RIGHT_SPEC, LEFT_SPEC).empty
+
+
+def test_unlinked_rows_fall_back_to_names():
+    right = make_right().assign(nhis_number=None, contact=None)
+    links = link_records(make_left(), right, LEFT_SPEC, RIGHT_SPEC)
+    assert dict(zip(links["left_row"], links["right_row"])) == {0: 1, 1: 2, 2: 0}
+    assert (links["method"] == "name").all()
@@ -0,0 +1,71 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Rows of the question x area score matrix densified at a time
+SCORE_BLOCK_ROWS = 4096
+
+
+class SyllabusIndex:
+    """
+    TF-IDF index over the areas of one syllabus.
+
+    Each area document (area name plus its syllabus content) becomes an
+    L2-normalised sparse TF-IDF row, so the cosine similarity between a
+    batch of questions and every area is a single sparse matrix product.
+    """
+
+    def __init__(self, syllabus_areas):
+        self.areas = list(syllabus_areas)
+        documents = [f"{area} {content}" for area, content in syllabus_areas.items()]
+        self.vectorizer = TfidfVectorizer(
+            stop_words='english',
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            dtype=np.float32,
+        )
+        try:
+            self.area_matrix = self.vectorizer.fit_transform(documents).T.tocsr()
+        except ValueError:
+            # No areas, or nothing but stop words in them
+            self.area_matrix = None
+
+    def score(self, texts):
+        """Sparse (questions x areas) cosine similarity matrix"""
+        return self.vectorizer.transform(texts) @ self.area_matrix
+
+    def assign(self, texts, top_k=3):
+        """
+        Best syllabus areas for every text in one pass.
+
+        Returns one dict per text with the best 'area' (None when no term
+        is shared with any area), its 'score', a 'confidence' (the best
+        score's share of the top-k scores) and the 'top' k (area, score)
+        pairs.
+        """
+        texts = list(texts)
+        if self.area_matrix is None or not texts:
+            return [{'area': None, 'score': 0.0, 'confidence': 0.0, 'top': []} for _ in texts]
+
+        top_k = min(top_k, len(self.areas))
+        scores = self.score(texts).tocsr()
+        results = []
+        for start in range(0, scores.shape[0], SCORE_BLOCK_ROWS):
+            block = scores[start:start + SCORE_BLOCK_ROWS].toarray()
+            top = np.argpartition(-block, top_k - 1, axis=1)[:, :top_k]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            totals = top_scores.sum(axis=1)
+            for areas, area_scores, total in zip(top, top_scores, totals):
+                best = float(area_scores[0])
+                results.append({
+                    'area': self.areas[areas[0]] if best > 0 else None,
+                    'score': best,
+                    'confidence': best / float(total) if total > 0 else 0.0,
+                    'top': [
+                        (self.areas[area], float(score))
+                        for area, score in zip(areas, area_scores) if score > 0
+                    ],
+                })
+        return results
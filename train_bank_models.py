@@ -0,0 +1,442 @@
+"""
+Training and tuning of the bank-marketing pipelines.
+
+Scripted version of the modelling in Notebook/notebook.ipynb. The data is
+split as in the notebook (20% stratified test set, random_state 42) and
+the preprocessing (ColumnTransformer -> SMOTE -> SelectKBest(k=15)) is
+fitted once per cross-validation fold and once on the full training set.
+The resulting matrices are cached on disk under ./.cache/training, keyed
+by the data contents, so later runs skip them.
+
+Every model family is tuned at the same time in a process pool by
+successive halving: many sampled candidates are scored on a small share
+of each fold's training rows, and the best third is promoted to three
+times the rows, until one candidate is left. The winner is refitted on
+the full training matrix and assembled with the fitted preprocessing into
+a pipeline shaped like the notebook's.
+
+Each run writes a versioned folder, ./Models/<timestamp>-<data key>, with
+the pipelines, the label encoder, all_model_tuning_results.csv and a
+manifest.json. Nothing is served from it automatically: the API, batch
+scorer and evaluation read ./Notebook unless given the folder (e.g.
+score_bank_customers.py --model-dir ./Models/<version>, which also picks
+up the folder's label encoder).
+
+In the results, Fit_Seconds is the worker time spent on a model family
+(every candidate fit plus the refit) and Finished_After_Seconds is when,
+counted from the start of tuning, the family's winner was refitted; the
+families are tuned side by side, so the latter is not a per-model time.
+
+Usage:
+    python train_bank_models.py                            # all models, ./DB/bank-additional-full.csv
+    python train_bank_models.py --models SVM KNN --candidates 24
+    python train_bank_models.py --data ./DB/bank-additional.csv --output ./Models --workers 4
+"""
+import argparse
+import json
+import math
+import os
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from bank_marketing import (
+    CATEGORICAL_FEATURES, MODEL_NAMES, NUMERIC_FEATURES, TARGET, TRAINING_DATA, csv_separator, pipeline_path
+)
+from pdf_cache import content_hash
+
+CACHE_DIR = "./.cache/training"
+
+# Bump when the preprocessing changes so cached matrices are rebuilt
+PREPARE_VERSION = 1
+
+# Successive halving: share of candidates kept per rung and the smallest
+# number of training rows a candidate is scored on
+HALVING_FACTOR = 3
+MIN_RESOURCES = 500
+
+_folds = None
+
+
+def make_classifier(model_name):
+    """Untuned classifier of a model family, as configured in the notebook"""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+
+    return {
+        "Decision Tree": lambda: DecisionTreeClassifier(random_state=42),
+        "Logistic Regression": lambda: LogisticRegression(max_iter=1000, random_state=42),
+        "KNN": lambda: KNeighborsClassifier(),
+        "SVM": lambda: SVC(probability=True, random_state=42),
+        # Stops once the held-out score stalls instead of running every epoch
+        "SGD": lambda: SGDClassifier(random_state=42, early_stopping=True, n_iter_no_change=5),
+        "Random Forest": lambda: RandomForestClassifier(random_state=42),
+        "Gradient Boosting": lambda: GradientBoostingClassifier(
+            random_state=42, n_iter_no_change=10, validation_fraction=0.1
+        ),
+    }[model_name]()
+
+
+def search_space(model_name):
+    """Parameter distributions sampled for a model family"""
+    from scipy.stats import loguniform, randint
+
+    return {
+        "Decision Tree": {
+            "max_depth": [None, 4, 6, 8, 10, 14, 20],
+            "min_samples_split": randint(2, 40),
+            "min_samples_leaf": randint(1, 20),
+            "criterion": ["gini", "entropy"],
+        },
+        "Logistic Regression": {
+            "C": loguniform(1e-3, 1e2),
+            "solver": ["liblinear", "lbfgs"],
+            "class_weight": [None, "balanced"],
+        },
+        "KNN": {
+            "n_neighbors": randint(3, 40),
+            "weights": ["uniform", "distance"],
+            "p": [1, 2],
+        },
+        "SVM": {
+            "C": loguniform(1e-2, 1e2),
+            "gamma": ["scale", "auto"],
+            "kernel": ["rbf"],
+        },
+        "SGD": {
+            "alpha": loguniform(1e-6, 1e-2),
+            "loss": ["hinge", "log_loss", "modified_huber"],
+            "penalty": ["l2", "l1", "elasticnet"],
+        },
+        "Random Forest": {
+            "n_estimators": randint(100, 400),
+            "max_depth": [None, 8, 12, 16, 24],
+            "min_samples_leaf": randint(1, 10),
+            "max_features": ["sqrt", "log2", 0.5],
+        },
+        "Gradient Boosting": {
+            "n_estimators": randint(100, 500),
+            "learning_rate": loguniform(0.02, 0.3),
+            "max_depth": randint(2, 6),
+            "subsample": [0.7, 0.85, 1.0],
+        },
+    }[model_name]
+
+
+def read_training_data(path):
+    """The bank-marketing CSV (comma or semicolon separated) without duplicate rows"""
+    data = pd.read_csv(path, sep=csv_separator(path))
+    return data.drop_duplicates().reset_index(drop=True)
+
+
+def make_preprocessing():
+    """Unfitted preprocessing steps of the notebook pipelines"""
+    from imblearn.over_sampling import SMOTE
+    from sklearn.compose import ColumnTransformer
+    from sklearn.feature_selection import SelectKBest, mutual_info_classif
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocessor = ColumnTransformer(transformers=[
+        ("num", Pipeline(steps=[("imputer", SimpleImputer(strategy="mean")), ("scaler", StandardScaler())]),
+         NUMERIC_FEATURES),
+        ("cat", Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        ]), CATEGORICAL_FEATURES),
+    ])
+    return [
+        ("preprocessor", preprocessor),
+        ("smote", SMOTE(random_state=42, sampling_strategy="auto")),
+        ("feature_selection", SelectKBest(mutual_info_classif, k=15)),
+    ]
+
+
+def _dense(matrix):
+    return np.asarray(matrix.toarray() if hasattr(matrix, "toarray") else matrix, dtype=np.float64)
+
+
+def fit_preprocessing(X, y, X_other=()):
+    """
+    Fit the preprocessing steps on (X, y). Returns the fitted steps, the
+    resampled training matrix and labels (shuffled, so any prefix is a fair
+    sample) and the transformed X_other matrices.
+    """
+    steps = make_preprocessing()
+    (_, preprocessor), (_, smote), (_, selector) = steps
+    matrix = preprocessor.fit_transform(X)
+    matrix, labels = smote.fit_resample(matrix, y)
+    matrix = selector.fit_transform(matrix, labels)
+    order = np.random.default_rng(42).permutation(len(labels))
+    others = [_dense(selector.transform(preprocessor.transform(other))) for other in X_other]
+    return steps, _dense(matrix)[order], np.asarray(labels)[order], others
+
+
+def prepare(data_path, folds=3, cache_dir=CACHE_DIR):
+    """
+    Train/test split, label encoder, fitted preprocessing and the cached
+    matrices: one (train, train labels, validation, validation labels) per
+    fold and the full training matrix. Returns (prepared, cache file).
+    """
+    from sklearn.model_selection import StratifiedKFold, train_test_split
+    from sklearn.preprocessing import LabelEncoder
+
+    with open(data_path, "rb") as file:
+        key = content_hash(file.read())[:16]
+    cache_path = os.path.join(cache_dir, f"{key}-f{folds}-v{PREPARE_VERSION}.joblib")
+    if os.path.exists(cache_path):
+        return joblib.load(cache_path), cache_path
+
+    data = read_training_data(data_path)
+    X, y = data.drop(columns=[TARGET]), data[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    label_encoder = LabelEncoder()
+    y_train = label_encoder.fit_transform(y_train)
+    y_test = label_encoder.transform(y_test)
+
+    fold_matrices = []
+    for train_rows, val_rows in StratifiedKFold(folds, shuffle=True, random_state=42).split(X_train, y_train):
+        _, matrix, labels, (val_matrix,) = fit_preprocessing(
+            X_train.iloc[train_rows], y_train[train_rows], [X_train.iloc[val_rows]]
+        )
+        fold_matrices.append((matrix, labels, val_matrix, y_train[val_rows]))
+    steps, matrix, labels, _ = fit_preprocessing(X_train, y_train)
+
+    prepared = {
+        "folds": fold_matrices,
+        "full": (matrix, labels),
+        "steps": steps,
+        "label_encoder": label_encoder,
+        "test": (X_test, y_test),
+        "data_key": key,
+        "rows": len(data),
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    joblib.dump(prepared, cache_path)
+    return prepared, cache_path
+
+
+def _init_worker(cache_path):
+    """Worker initializer: map the cached matrices once per process"""
+    global _folds
+    prepared = joblib.load(cache_path, mmap_mode="r")
+    _folds = prepared["folds"], prepared["full"]
+
+
+def _score_candidate(model_name, params, fold, resources):
+    """Worker: weighted F1 of one candidate fitted on the first rows of a fold's training matrix"""
+    from sklearn.metrics import f1_score
+
+    warnings.filterwarnings("ignore")
+    matrix, labels, val_matrix, val_labels = _folds[0][fold]
+    start = time.perf_counter()
+    classifier = make_classifier(model_name).set_params(**params)
+    classifier.fit(matrix[:resources], labels[:resources])
+    score = f1_score(val_labels, classifier.predict(val_matrix), average="weighted")
+    return score, time.perf_counter() - start
+
+
+def _refit(model_name, params):
+    """Worker: the candidate fitted on the full training matrix"""
+    warnings.filterwarnings("ignore")
+    matrix, labels = _folds[1]
+    start = time.perf_counter()
+    classifier = make_classifier(model_name).set_params(**params)
+    classifier.fit(matrix, labels)
+    return classifier, time.perf_counter() - start
+
+
+class HalvingSearch:
+    """Successive-halving state of one model family"""
+
+    def __init__(self, model_name, candidates, folds, train_rows):
+        from sklearn.model_selection import ParameterSampler
+
+        self.model_name = model_name
+        with warnings.catch_warnings():
+            # Small discrete spaces yield fewer candidates than asked for
+            warnings.simplefilter("ignore", UserWarning)
+            self.candidates = list(ParameterSampler(search_space(model_name), candidates, random_state=42))
+        self.alive = list(range(len(self.candidates)))
+        self.folds = folds
+        # Enough rungs to narrow the candidates down to one, the last on every row
+        rungs = max(1, math.ceil(math.log(len(self.candidates), HALVING_FACTOR)))
+        self.resources = [
+            min(train_rows, max(MIN_RESOURCES, train_rows // HALVING_FACTOR ** (rungs - 1 - rung)))
+            for rung in range(rungs)
+        ]
+        self.rung = 0
+        self.scores = {}
+        self.fit_seconds = 0.0
+
+    def tasks(self):
+        """(candidate, fold, rows) evaluations of the current rung"""
+        return [(candidate, fold, self.resources[self.rung]) for candidate in self.alive for fold in range(self.folds)]
+
+    def advance(self, results):
+        """Record a rung's results {(candidate, fold): (score, seconds)}; True when the search is over"""
+        means = {}
+        for (candidate, _), (score, seconds) in results.items():
+            means.setdefault(candidate, []).append(score)
+            self.fit_seconds += seconds
+        means = {candidate: float(np.mean(scores)) for candidate, scores in means.items()}
+        self.scores.update(means)
+        ranked = sorted(self.alive, key=lambda candidate: -means[candidate])
+        self.rung += 1
+        self.alive = ranked[:max(1, math.ceil(len(ranked) / HALVING_FACTOR))]
+        if self.rung >= len(self.resources) or len(self.alive) == 1:
+            self.alive = ranked[:1]
+            return True
+        return False
+
+    @property
+    def best(self):
+        return self.candidates[self.alive[0]]
+
+
+def tune_models(model_names, cache_path, prepared, candidates=16, workers=None, progress=print):
+    """
+    Tune every model family concurrently and refit the winners. Returns
+    {model name: (fitted classifier, best params, CV F1, fit seconds, finished after seconds)}:
+    fit seconds add up the family's own fits across the workers, finished
+    after is the time since tuning started at which its refit came back.
+    """
+    folds = len(prepared["folds"])
+    train_rows = min(len(fold[1]) for fold in prepared["folds"])
+    searches = {name: HalvingSearch(name, candidates, folds, train_rows) for name in model_names}
+    results = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                             initargs=(cache_path,)) as pool:
+        pending = {}
+        rung_results = {name: {} for name in searches}
+
+        def submit_rung(name):
+            search = searches[name]
+            for candidate, fold, rows in search.tasks():
+                future = pool.submit(_score_candidate, name, search.candidates[candidate], fold, rows)
+                pending[future] = (name, (candidate, fold))
+            progress(f"{name}: {len(search.alive)} candidate(s) on {search.resources[search.rung]:,} rows")
+
+        for name in searches:
+            submit_rung(name)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, task = pending.pop(future)
+                if task == "refit":
+                    classifier, seconds = future.result()
+                    search = searches[name]
+                    finished_after = time.perf_counter() - start
+                    results[name] = (classifier, search.best, search.scores[search.alive[0]],
+                                     search.fit_seconds + seconds, finished_after)
+                    progress(f"{name}: done after {finished_after:.1f} s "
+                             f"(CV F1 {search.scores[search.alive[0]]:.4f})")
+                    continue
+                rung_results[name][task] = future.result()
+                search = searches[name]
+                if len(rung_results[name]) < len(search.alive) * folds:
+                    continue
+                # The whole rung is in: promote the best or refit the winner
+                finished = search.advance(rung_results[name])
+                rung_results[name] = {}
+                if finished:
+                    pending[pool.submit(_refit, name, search.best)] = (name, "refit")
+                else:
+                    submit_rung(name)
+    return results
+
+
+def evaluate(pipeline, X_test, y_test):
+    """Weighted metrics on the held-out test set, as reported by the notebook, plus AUC"""
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    predicted = pipeline.predict(X_test)
+    if hasattr(pipeline, "predict_proba"):
+        scores = pipeline.predict_proba(X_test)[:, 1]
+    else:
+        scores = pipeline.decision_function(X_test)
+    return {
+        "Precision": precision_score(y_test, predicted, average="weighted"),
+        "Recall": recall_score(y_test, predicted, average="weighted"),
+        "Accuracy": accuracy_score(y_test, predicted),
+        "F1_Score": f1_score(y_test, predicted, average="weighted"),
+        "AUC": roc_auc_score(y_test, scores),
+    }
+
+
+def write_artifacts(output, prepared, tuned, total_seconds):
+    """Write a versioned artifact folder; returns its path and the results table"""
+    import sklearn
+    from imblearn.pipeline import Pipeline
+
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{prepared['data_key'][:8]}"
+    folder = os.path.join(output, version)
+    os.makedirs(folder, exist_ok=True)
+    X_test, y_test = prepared["test"]
+
+    rows, models = [], {}
+    for name, (classifier, params, cv_f1, fit_seconds, finished_after) in tuned.items():
+        pipeline = Pipeline(steps=[*prepared["steps"], ("classifier", classifier)])
+        joblib.dump(pipeline, pipeline_path(name, folder))
+        metrics = evaluate(pipeline, X_test, y_test)
+        rows.append({"Model Name": name, **metrics, "CV_F1": cv_f1,
+                     "Fit_Seconds": fit_seconds, "Finished_After_Seconds": finished_after})
+        models[name] = {"params": params, "file": os.path.basename(pipeline_path(name, folder))}
+    joblib.dump(prepared["label_encoder"], os.path.join(folder, "label_encoder.pkl"))
+
+    results = pd.DataFrame(rows).sort_values("F1_Score", ascending=False)
+    results.to_csv(os.path.join(folder, "all_model_tuning_results.csv"), index=False)
+    manifest = {
+        "version": version,
+        "data_key": prepared["data_key"],
+        "rows": prepared["rows"],
+        "sklearn": sklearn.__version__,
+        "total_seconds": total_seconds,
+        "models": models,
+    }
+    with open(os.path.join(folder, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, default=str)
+    return folder, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and tune the bank-marketing pipelines")
+    parser.add_argument("--data", default=TRAINING_DATA, help=f"Training CSV (default {TRAINING_DATA})")
+    parser.add_argument("--models", nargs="*", default=list(MODEL_NAMES),
+                        help=f"Model families to train (default: all of {', '.join(MODEL_NAMES)})")
+    parser.add_argument("--candidates", type=int, default=16, help="Sampled candidates per model family")
+    parser.add_argument("--folds", type=int, default=3, help="Cross-validation folds")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--output", default="./Models", help="Folder of the versioned artifact folders")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.models if name not in MODEL_NAMES]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+    if not os.path.exists(args.data):
+        parser.error(f"training data not found: {args.data}")
+    if args.candidates < 1 or args.folds < 2:
+        parser.error("--candidates must be at least 1 and --folds at least 2")
+
+    start = time.perf_counter()
+    prepared, cache_path = prepare(args.data, args.folds)
+    print(f"Prepared {prepared['rows']:,} rows in {time.perf_counter() - start:.1f} s ({cache_path})")
+    tuned = tune_models(args.models, cache_path, prepared, args.candidates, args.workers)
+    total = time.perf_counter() - start
+    folder, results = write_artifacts(args.output, prepared, tuned, total)
+
+    print(results[["Model Name", "F1_Score", "AUC", "CV_F1", "Fit_Seconds", "Finished_After_Seconds"]].to_string(index=False))
+    print(f"Wrote {folder} in {total:.1f} s")
+
+
+if __name__ == "__main__":
+    main()